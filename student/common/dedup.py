@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+청크 중복 제거 (Day2 / Day5 / new 인덱스 빌드 공용)
+- content_hash: 정규화 텍스트 해시 → 청크 meta.hash, 패킹/필드 벡터 재사용 키
+- group_duplicates: 같은 해시 청크를 묶어 고유 텍스트만 임베딩 → 벡터를 원래 순서로 fan-out
+"""
+
+from __future__ import annotations
+import re, hashlib, unicodedata
+from typing import List, Dict, Any, Tuple
+
+
+def content_hash(text: str) -> str:
+    """
+    중복 판정용 정규화 해시(sha1)
+    - NFKC 정규화 → 공백 축약 → 소문자화 후 해시하므로 공백/전각 차이는 같은 텍스트로 본다
+    """
+    s = unicodedata.normalize("NFKC", text or "")
+    s = re.sub(r"\s+", " ", s).strip().lower()
+    return hashlib.sha1(s.encode("utf-8")).hexdigest()
+
+
+def group_duplicates(items: List[Dict[str, Any]]) -> Tuple[List[str], List[int]]:
+    """
+    meta.hash 기준으로 동일 텍스트를 묶어 고유 텍스트만 임베딩하도록 준비
+    반환: (unique_texts, inverse)
+      - inverse[i] = items[i]의 텍스트가 들어 있는 unique_texts 인덱스
+      - vecs_unique[inverse] 로 원래 순서의 (N, D) 벡터를 복원(fan-out)
+    """
+    first: Dict[str, int] = {}
+    unique_texts: List[str] = []
+    inverse: List[int] = []
+    for it in items:
+        h = (it.get("meta") or {}).get("hash") or content_hash(it["text"])
+        j = first.get(h)
+        if j is None:
+            j = first[h] = len(unique_texts)
+            unique_texts.append(it["text"])
+        inverse.append(j)
+    return unique_texts, inverse
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+디스크 캐시 (SQLite 한 파일, 프로세스/스레드 공용)
+- 키: 요청 payload를 정렬된 JSON으로 직렬화한 sha1 (make_key) — 같은 요청은 호출 위치와 무관하게 같은 키
+- TTL은 저장 시가 아니라 조회 시 호출 위치별로 지정 (같은 응답을 Day1은 짧게, Day3는 길게 재사용 가능)
+- stale-while-revalidate: TTL이 지나도 ttl + stale_ttl 안이면 캐시값을 바로 반환하고 공용 실행기(호출 측 목적지)에서 갱신
+- 크기 상한(max_bytes)을 넘으면 마지막 접근이 오래된 항목부터 삭제(LRU)
+- 예외(네트워크 오류 등)는 캐시하지 않음, stats()로 적중률 확인
+"""
+
+from __future__ import annotations
+import os, json, time, sqlite3, hashlib, threading
+from typing import Any, Callable, Dict, Optional, Tuple
+from student.common.executor import submit
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key      TEXT PRIMARY KEY,
+    value    TEXT NOT NULL,
+    created  REAL NOT NULL,
+    accessed REAL NOT NULL,
+    size     INTEGER NOT NULL
+)
+"""
+
+
+def make_key(namespace: str, payload: Dict[str, Any]) -> str:
+    """namespace + 정렬된 JSON payload → sha1 키"""
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return f"{namespace}:{hashlib.sha1(blob.encode('utf-8')).hexdigest()}"
+
+
+class DiskCache:
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._refreshing: set = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0, "evictions": 0}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+
+    # ---------- 저수준 ----------
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """(값, 경과 초) 또는 None — 만료 판단은 호출 측"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM entries WHERE key=?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE entries SET accessed=? WHERE key=?", (now, key))
+        return json.loads(row[0]), now - row[1]
+
+    def set(self, key: str, value: Any) -> None:
+        blob = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries(key, value, created, accessed, size) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, now, now, len(blob.encode("utf-8"))),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # 상한의 90%까지 오래된 접근 순으로 삭제
+        target = total - int(self.max_bytes * 0.9)
+        freed, keys = 0, []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed ASC"):
+            keys.append(key)
+            freed += size
+            if freed >= target:
+                break
+        self._conn.executemany("DELETE FROM entries WHERE key=?", [(k,) for k in keys])
+        self._stats["evictions"] += len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+
+    # ---------- 캐시 경유 호출 ----------
+    def _release(self, key: str) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def _refresh(self, key: str, fn: Callable[[], Any]) -> None:
+        try:
+            self.set(key, fn())
+        except Exception:
+            with self._lock:
+                self._stats["errors"] += 1
+        finally:
+            self._release(key)
+
+    def call(self, key: str, fn: Callable[[], Any], ttl: float, stale_ttl: float = 0.0,
+             dest: str = "fanout") -> Any:
+        """
+        key가 ttl 안이면 캐시값, ttl ~ ttl+stale_ttl 이면 캐시값 + 백그라운드 fn() 갱신, 아니면 fn() 결과 저장 후 반환
+        - ttl <= 0 이면 캐시 미사용(fn() 그대로)
+        - 백그라운드 갱신은 공용 실행기의 dest 목적지로 제출 (fn이 외부 호출이면 그 목적지, 예: "tavily")
+          → 목적지별 동시 실행 상한/지표가 그대로 적용됨
+        """
+        if ttl <= 0:
+            return fn()
+        found = self.get(key)
+        if found is not None:
+            value, age = found
+            if age < ttl:
+                with self._lock:
+                    self._stats["hits"] += 1
+                return value
+            if age < ttl + stale_ttl:
+                with self._lock:
+                    self._stats["stale_hits"] += 1
+                    start = key not in self._refreshing
+                    if start:
+                        self._refreshing.add(key)
+                        self._stats["refreshes"] += 1
+                if start:
+                    try:
+                        fut = submit(dest, self._refresh, key, fn)
+                    except RuntimeError:  # 실행기 종료 중: 갱신 생략
+                        self._release(key)
+                    else:
+                        fut.add_done_callback(lambda f: f.cancelled() and self._release(key))
+                return value
+        with self._lock:
+            self._stats["misses"] += 1
+        value = fn()
+        self.set(key, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/미적중 카운터 + hit_rate(stale 포함) + 현재 항목 수/바이트"""
+        with self._lock:
+            s = dict(self._stats)
+            s["entries"], s["bytes"] = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        served = s["hits"] + s["stale_hits"]
+        total = served + s["misses"]
+        s["hit_rate"] = round(served / total, 4) if total else 0.0
+        return s
+
+
+_CACHES: Dict[str, DiskCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_cache(path: str, max_bytes: int = DEFAULT_MAX_BYTES) -> DiskCache:
+    """경로별 프로세스 공용 DiskCache"""
+    with _CACHES_LOCK:
+        cache = _CACHES.get(path)
+        if cache is None:
+            cache = _CACHES[path] = DiskCache(path, max_bytes)
+        return cache
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+프로세스 공용 실행기 (Day1/Day3 fan-out 공용)
+- 요청마다 ThreadPoolExecutor를 만들고 버리지 않고, 스레드 풀 하나를 프로세스 수명 동안 재사용
+- 목적지(destination)별 동시 실행 상한: 상한에 걸린 작업은 목적지 대기열에서 기다리며 워커 스레드를 점유하지 않음
+- 목적지별 대기열 깊이/실행 중/대기 시간(ms) 지표 → stats()
+- 종료 시(atexit) 대기 작업 취소 후 실행 중 작업 마무리
+
+목적지 규칙
+- "tavily" / "yfinance" / "pps" / "llm": 실제 외부 호출(말단 작업)
+- "fanout": 내부에서 다시 말단 작업을 submit 하고 기다리는 조합 작업 — 상한을 MAX_WORKERS보다 작게 두어
+  조합 작업이 워커를 모두 점유해 말단 작업이 못 도는 교착을 막음
+"""
+
+from __future__ import annotations
+import atexit, threading, time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+MAX_WORKERS = 16
+LIMITS: Dict[str, int] = {
+    "tavily": 4,
+    "yfinance": 4,
+    "pps": 2,
+    "llm": 4,
+    "fanout": 8,
+}
+DEFAULT_LIMIT = 4   # LIMITS에 없는 목적지
+
+
+class _Dest:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.running = 0
+        self.queue: Deque[Tuple[Future, Callable[..., Any], tuple, dict, float]] = deque()
+        self.submitted = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.max_queued = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class SharedExecutor:
+    def __init__(self, max_workers: int = MAX_WORKERS, limits: Optional[Dict[str, int]] = None):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="shared")
+        self._limits = dict(LIMITS if limits is None else limits)
+        self._dests: Dict[str, _Dest] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _dest(self, name: str) -> _Dest:
+        d = self._dests.get(name)
+        if d is None:
+            d = self._dests[name] = _Dest(self._limits.get(name, DEFAULT_LIMIT))
+        return d
+
+    def submit(self, dest: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """목적지 dest 상한 안에서 fn(*args, **kwargs) 실행 → Future (cancel()은 시작 전까지만 유효)"""
+        fut: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("shared executor is shut down")
+            d = self._dest(dest)
+            d.submitted += 1
+            d.queue.append((fut, fn, args, kwargs, time.monotonic()))
+            d.max_queued = max(d.max_queued, len(d.queue))
+            self._dispatch(d)
+        return fut
+
+    def _dispatch(self, d: _Dest) -> None:
+        """(lock 보유 상태) 상한이 남는 만큼 대기열에서 꺼내 풀에 제출"""
+        while d.queue and d.running < d.limit:
+            fut, fn, args, kwargs, queued_at = d.queue.popleft()
+            if fut.cancelled():
+                d.cancelled += 1
+                continue
+            d.running += 1
+            self._pool.submit(self._run, d, fut, fn, args, kwargs, queued_at)
+
+    def _run(self, d: _Dest, fut: Future, fn, args, kwargs, queued_at: float) -> None:
+        wait = time.monotonic() - queued_at
+        try:
+            if fut.set_running_or_notify_cancel():
+                try:
+                    fut.set_result(fn(*args, **kwargs))
+                except BaseException as e:
+                    fut.set_exception(e)
+        finally:
+            with self._lock:
+                d.running -= 1
+                d.completed += 1
+                d.wait_total += wait
+                d.wait_max = max(d.wait_max, wait)
+                self._dispatch(d)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """목적지별 {"limit","running","queued","max_queued","submitted","completed","cancelled","wait_ms_avg","wait_ms_max"}"""
+        with self._lock:
+            out = {}
+            for name, d in self._dests.items():
+                out[name] = {
+                    "limit": d.limit, "running": d.running, "queued": len(d.queue), "max_queued": d.max_queued,
+                    "submitted": d.submitted, "completed": d.completed, "cancelled": d.cancelled,
+                    "wait_ms_avg": round(d.wait_total / d.completed * 1000, 2) if d.completed else 0.0,
+                    "wait_ms_max": round(d.wait_max * 1000, 2),
+                }
+            return out
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = True) -> None:
+        """새 작업 거부 → (cancel_futures) 대기열 취소 → 실행 중 작업 완료 대기(wait)"""
+        with self._lock:
+            self._closed = True
+            if cancel_futures:
+                for d in self._dests.values():
+                    while d.queue:
+                        d.queue.popleft()[0].cancel()
+                        d.cancelled += 1
+        self._pool.shutdown(wait=wait)
+
+
+_EXECUTOR: Optional[SharedExecutor] = None
+_LOCK = threading.Lock()
+
+
+def get_executor() -> SharedExecutor:
+    """프로세스 공용 실행기 (최초 호출 시 생성, 종료 시 atexit로 정리)"""
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = SharedExecutor()
+                atexit.register(_EXECUTOR.shutdown, True, True)
+    return _EXECUTOR
+
+
+def submit(dest: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    return get_executor().submit(dest, fn, *args, **kwargs)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Day5 공모전 렌더 조각(fragment) 사전 계산
+- 인덱싱 시 공모전 1건당 표시용 필드 정규화(NaN/개행/길이 제한)와 마크다운 조각을 한 번만 만들어 meta에 저장
+- 질의 시 render_day5 / _draft_answer 는 저장된 문자열을 이어붙이기만 함
+- 조각이 없는(레거시) 인덱스는 각 렌더러의 기존 경로로 처리
+
+meta 키 (docs/ 에서 문자열 컬럼으로 저장):
+  render_cols    # 표 컬럼 순서 (탭 구분) — 질의 결과 전체가 같을 때만 조각 표 사용
+  render_row     # 표 한 행의 필드 셀들 ("순위 | 매칭도 |" 이후 부분)
+  render_title   # 하이퍼링크 적용 제목
+  render_detail  # 상세 표 (| 항목 | 내용 | ...)
+  render_draft   # 초안 블록 ("{순번}. " 이후 부분)
+"""
+
+from typing import Dict, Any, List, Iterable
+
+DAY5_FIELD_ORDER = ["공모전명", "주최", "분야", "상금(단위: 만 원)", "마감일", "참가 자격", "팀 규모", "전공 우대", "상세 내용", "링크"]
+RENDER_KEYS = ("render_cols", "render_row", "render_title", "render_detail", "render_draft")
+
+
+def order_fields(keys: Iterable[str]) -> List[str]:
+    """보기 좋은 우선순위 정렬 (우선순위 밖 컬럼은 원래 순서대로 뒤에)"""
+    keys = list(keys)
+    return [f for f in DAY5_FIELD_ORDER if f in keys] + [f for f in keys if f not in DAY5_FIELD_ORDER]
+
+
+def display_value(v: Any, limit: int = 0, missing: str = "-") -> str:
+    """NaN/None → missing, 개행 제거, limit자 초과 시 '…'"""
+    if v is None or (isinstance(v, float) and v != v):
+        return missing
+    s = str(v).strip().replace("\n", " ")
+    if limit and len(s) > limit:
+        s = s[:limit] + "…"
+    return s
+
+
+def title_markdown(fields: Dict[str, Any]) -> str:
+    title = display_value(fields.get("공모전명"), missing="")
+    link = display_value(fields.get("링크"), missing="")
+    return f"[{title}]({link})" if link else title
+
+
+def day5_fragments(fields: Dict[str, Any]) -> Dict[str, str]:
+    """
+    공모전 레코드(meta.fields) → 렌더 조각 dict (RENDER_KEYS)
+    - 공모전명이 없으면 순번 기반 기본 제목이 필요하므로 빈 dict (렌더러가 기존 경로 사용)
+    """
+    if not display_value(fields.get("공모전명"), missing=""):
+        return {}
+    columns = order_fields(fields.keys())
+    title_md = title_markdown(fields)
+
+    cells = []
+    for key in columns:
+        text_val = title_md if key == "공모전명" else display_value(fields.get(key, "-"))
+        if len(text_val) > 80:  # 표 셀은 80자 제한
+            text_val = text_val[:80] + "…"
+        cells.append(text_val)
+
+    detail = ["| 항목 | 내용 |", "|------|------|"]
+    for k, v in fields.items():
+        text_val = display_value(v, limit=200)
+        if k == "링크" and text_val and text_val != "-":
+            text_val = f"[{text_val}]({text_val})"
+        detail.append(f"| {k} | {text_val} |")
+
+    g = lambda k, d: display_value(fields.get(k), missing=d)
+    desc = display_value(fields.get("상세 내용"), limit=200, missing="")
+    draft = [
+        f"**{g('공모전명', '')}** ({g('분야', '-')}) — {g('주최', '주최 미상')}",
+        f"   🏆 **상금:** {g('상금(단위: 만 원)', '미정')}만 원 | 🗓 **마감:** {g('마감일', '-')}",
+        f"   👥 **참가 자격:** {g('참가 자격', '-')} | 👤 **팀 규모:** {g('팀 규모', '-')}",
+        f"   🎓 **전공 우대:** {g('전공 우대', '-')}",
+        f"   💬 **상세 내용:** {desc}",
+        f"   🔗 **링크:** {g('링크', '')}",
+    ]
+
+    return {
+        "render_cols": "\t".join(columns),
+        "render_row": " | ".join(cells),
+        "render_title": title_md,
+        "render_detail": "\n".join(detail),
+        "render_draft": "\n".join(draft),
+    }
+
+
+def cached_fragments(contexts: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """검색 결과 → 각 context의 저장된 조각 (하나라도 없으면 빈 리스트 → 기존 경로)"""
+    out = []
+    for c in contexts:
+        meta = c.get("meta") or {}
+        if not all(meta.get(k) for k in RENDER_KEYS):
+            return []
+        out.append({k: meta[k] for k in RENDER_KEYS})
+    return out
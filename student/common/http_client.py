@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+공용 HTTP 클라이언트 (Tavily / 조달청 등 외부 호출 공용)
+- 프로세스 전체에서 requests.Session 하나를 공유 → 호스트별 커넥션 풀 + keep-alive로 TCP/TLS 핸드셰이크 재사용
+- urllib3 커넥션 풀은 스레드 안전, 세션 쿠키는 저장하지 않음(공유 가변 상태 없음) → ThreadPoolExecutor에서 그대로 사용
+- timeout: (connect, read) 튜플 또는 숫자(read 타임아웃으로 사용, connect는 CONNECT_TIMEOUT)
+- gzip: 응답 압축 요청(Accept-Encoding) on/off
+"""
+
+from __future__ import annotations
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 20.0
+POOL_HOSTS = 16      # 풀을 유지할 호스트 수
+POOL_SIZE = 16       # 호스트당 동시 커넥션 수 (Day1/Day3 스레드 수 이상)
+
+Timeout = Union[None, float, Tuple[float, float]]
+
+_SESSION: Optional[requests.Session] = None
+_LOCK = threading.Lock()
+
+
+def _new_session() -> requests.Session:
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE, pool_block=False)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))  # 쿠키 미저장
+    s.headers.update({"Connection": "keep-alive"})
+    return s
+
+
+def session() -> requests.Session:
+    """프로세스 공용 세션 (최초 호출 시 생성)"""
+    global _SESSION
+    if _SESSION is None:
+        with _LOCK:
+            if _SESSION is None:
+                _SESSION = _new_session()
+    return _SESSION
+
+
+def _timeout(timeout: Timeout) -> Tuple[float, float]:
+    if timeout is None:
+        return (CONNECT_TIMEOUT, READ_TIMEOUT)
+    if isinstance(timeout, tuple):
+        return timeout
+    return (min(CONNECT_TIMEOUT, float(timeout)), float(timeout))
+
+
+def request(method: str, url: str, *, timeout: Timeout = None, gzip: bool = True, **kwargs: Any) -> requests.Response:
+    headers = dict(kwargs.pop("headers", None) or {})
+    headers.setdefault("Accept-Encoding", "gzip, deflate" if gzip else "identity")
+    return session().request(method, url, headers=headers, timeout=_timeout(timeout), **kwargs)
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def close() -> None:
+    """공용 세션 종료 (테스트/종료 시)"""
+    global _SESSION
+    with _LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+            _SESSION = None
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from dataclasses import dataclass, field
-from typing import List, Optional, Literal
+from typing import List, Dict, Optional, Literal
 from pydantic import BaseModel, Field, HttpUrl
 
 # -------------------------
@@ -14,6 +14,8 @@ class Day1Plan:
     web_keywords: List[str] = field(default_factory=list)
     tickers: List[str] = field(default_factory=list)
     output_style: str = "report"  # "report" | "summary"
+    do_history: bool = False      # 로컬 일봉 저장소(history.py) 기반 가격 추이 (do_stocks와 함께)
+    latency_budget: float = 8.0   # 요청 전체 지연 예산(초), 0이면 모든 작업 완료까지 대기, 기업 개요는 초과해도 오류 아님
 
 # (선택) 웹 결과 아이템이 dataclass라면, "기본값 없는 필드 먼저" 규칙 엄수
 @dataclass
@@ -38,6 +40,11 @@ class Day2Plan:
     return_draft_when_enough: bool = True
     max_context: int = 1200
     embedding_model: str = "text-embedding-3-small"
+    # 관련 구절 확장 (빌드 시 만든 그래프 조회, 추가 임베딩/검색 없음) — 0이면 사용 안 함
+    expand_adjacent: int = 0   # 검색된 청크의 앞뒤로 따라갈 청크 수
+    expand_semantic: int = 0   # 검색된 청크당 의미 이웃 수
+    # 부모-자식 인덱스: 자식 청크를 top_k * parent_fanout 개 검색해 부모 창 top_k 개로 묶음
+    parent_fanout: int = 4
 
 # (선택) RAG Context 아이템도 dataclass를 쓸 경우 예시
 @dataclass
@@ -108,6 +115,25 @@ class Day5Plan:
     top_k: int = 10
     max_context: int = 2000
     embedding_model: str = "text-embedding-3-small"
+    # 구조화 재랭킹: 코사인 상위 rerank_pool개 후보를 속성 점수와 가중합해 top_k 선택
+    rerank: bool = True
+    rerank_pool: int = 50
+    rerank_deadline_days: int = 14   # 남은 기간이 이보다 짧으면 마감 점수 선형 감점
+    rerank_weights: Dict[str, float] = field(default_factory=lambda: {
+        "similarity": 1.0,   # 코사인 점수
+        "deadline": 0.10,    # 준비 기간 여유
+        "prize": 0.10,       # 상금 규모(log, 후보 내 정규화)
+        "team": 0.05,        # 질의의 팀 인원 수용 여부
+        "eligibility": 0.10, # 질의의 참가 자격(대학생/일반인 등) 일치
+        "major": 0.10,       # 질의 전공과 전공 우대 일치(전공무관 포함)
+    })
+    # 필드별 벡터 검색(fields/): 공모전명/상세 내용/자격 조건 코사인 가중 평균 — 필드 인덱스가 없으면 본 인덱스 검색
+    field_search: bool = True
+    field_weights: Dict[str, float] = field(default_factory=lambda: {
+        "title": 0.40,       # 공모전명
+        "desc": 0.35,        # 상세 내용
+        "elig": 0.25,        # 참가 자격 + 팀 규모 + 전공 우대
+    })
 
 # (선택) RAG Context 아이템도 dataclass를 쓸 경우 예시
 @dataclass
@@ -2,6 +2,8 @@
 from typing import Dict, Any
 from textwrap import dedent
 
+from student.common.fragments import cached_fragments, order_fields
+
 # --------- 본문 렌더러들 ---------
 def render_day1(query: str, payload: Dict[str, Any]) -> str:
     web = payload.get("web_top", []) or []
@@ -23,6 +25,27 @@ def render_day1(query: str, payload: Dict[str, Any]) -> str:
                 lines.append(f"- **{sym}**: (가져오기 실패) — {p.get('error','')}")
         lines.append("")
 
+    # 1-1) 가격 추이 (로컬 일봉 저장소)
+    history = [h for h in (payload.get("history") or []) if "error" not in h]
+    if history:
+        def pct(v):
+            return f"{v * 100:+.1f}%" if v is not None else "-"
+
+        def num(v):
+            return f"{v:,.2f}" if v is not None else "-"
+
+        lines.append("## 가격 추이")
+        lines.append("| 종목 | 기준일 | 종가 | 1일 | 1주 | 1개월 | 3개월 | 1년 | MA20 | MA60 | 52주 고/저 |")
+        lines.append("|---|---|---|---|---|---|---|---|---|---|---|")
+        for h in history:
+            d = str(h["date"])
+            lines.append(
+                f"| {h['symbol']} | {d[:4]}-{d[4:6]}-{d[6:]} | {num(h['close'])} | {pct(h.get('ret_1d'))} | "
+                f"{pct(h.get('ret_1w'))} | {pct(h.get('ret_1m'))} | {pct(h.get('ret_3m'))} | {pct(h.get('ret_1y'))} | "
+                f"{num(h.get('ma20'))} | {num(h.get('ma60'))} | {num(h.get('high_52w'))} / {num(h.get('low_52w'))} |"
+            )
+        lines.append("")
+
     # 2) 기업 정보 요약(발췌 + 출처)
     if profile:
         # 500자 정도로 길이 제한(가독)
@@ -176,7 +199,18 @@ def render_day5(query: str, payload: dict) -> str:
 
     # ── 추천 공모전 목록
     contexts = (payload or {}).get("contexts") or []
-    if contexts:
+    # 인덱싱 때 만든 렌더 조각(meta.render_*)이 있으면 문자열 join만 수행
+    frags = cached_fragments(contexts[:10])
+    if frags and len({f["render_cols"] for f in frags}) == 1:
+        lines.append("## 📋 추천 공모전 목록 (최대 10개)")
+        lines.append("")
+        headers = ["순위", "매칭도"] + frags[0]["render_cols"].split("\t")
+        lines.append("| " + " | ".join(headers) + " |")
+        lines.append("|" + "|".join([":---:"] * len(headers)) + "|")
+        for i, (c, f) in enumerate(zip(contexts, frags), 1):
+            lines.append(f"| {i} | {float(c.get('score', 0.0))*100:.1f}% | {f['render_row']} |")
+        lines.append("")
+    elif contexts:
         lines.append("## 📋 추천 공모전 목록 (최대 10개)")
         lines.append("")
 
@@ -185,11 +219,9 @@ def render_day5(query: str, payload: dict) -> str:
         for c in contexts:
             fields = (c.get("meta", {}) or {}).get("fields", {}) or {}
             all_fields.update(fields.keys())
-        all_fields = list(all_fields)
 
         # 보기 좋은 우선순위 정렬
-        priority = ["공모전명", "주최", "분야", "상금(단위: 만 원)", "마감일", "참가 자격", "팀 규모", "전공 우대", "상세 내용", "링크"]
-        ordered_fields = [f for f in priority if f in all_fields] + [f for f in all_fields if f not in priority]
+        ordered_fields = order_fields(all_fields)
 
         # 표 헤더
         headers = ["순위", "매칭도"] + ordered_fields
@@ -229,7 +261,18 @@ def render_day5(query: str, payload: dict) -> str:
         lines.append("")
 
     # ── 상위 3개 상세
-    if contexts:
+    if frags:
+        lines.append("## 📌 상위 추천 공모전 상세 (Top 3)")
+        lines.append("")
+        for i, (c, f) in enumerate(zip(contexts[:3], frags), 1):
+            lines.append(f"### {i}. {f['render_title']}")
+            lines.append(f"**매칭도:** {float(c.get('score', 0.0))*100:.1f}%")
+            lines.append("")
+            lines.append(f["render_detail"])
+            lines.append("")
+            lines.append("---")
+            lines.append("")
+    elif contexts:
         lines.append("## 📌 상위 추천 공모전 상세 (Top 3)")
         lines.append("")
         for i, c in enumerate(contexts[:3], 1):
@@ -21,6 +21,7 @@ from student.common.schemas import Day1Plan
 from student.common.writer import render_day1, render_enveloped
 from student.common.fs_utils import save_markdown
 from student.day1.impl.agent import Day1Agent
+from student.day1.impl.symbols import resolve_tickers
 
 
 # ------------------------------------------------------------------------------
@@ -40,8 +41,9 @@ def _extract_tickers_from_query(query: str) -> List[str]:
     사용자 질의에서 '티커 후보'를 추출합니다.
     예시:
       - "AAPL 주가 알려줘"      → ["AAPL"]
-      - "삼성전자 005930 분석"  → ["005930"]
+      - "삼성전자 005930 분석"  → ["005930.KS"]
       - "NVDA/TSLA 비교"       → ["NVDA", "TSLA"]
+      - "AI 기반 RFP 작성"     → []
     구현 포인트:
       1) 두 타입 모두 잡아야 함
          - 영문 대문자 1~5자 (미국 티커 일반형) + 선택적 .XX (예: BRK.B 처럼 도메인 일부가 있을 수 있으나, 여기선 단순히 대문자 1~5자를 1차 타깃)
@@ -56,10 +58,9 @@ def _extract_tickers_from_query(query: str) -> List[str]:
     #  - 숫자 패턴 예: r"\b\d{6}\b"
     #  - 반환: ['AAPL', '005930'] 형태의 리스트
     # ----------------------------------------------------------------------------
-    tickers = re.findall(r"\b[A-Z]{1,5}\b", query)
-    tickers += re.findall(r"\b\d{6}\b", query)
-    tickers = list(set(tickers))
-    return tickers
+    # 오프라인 종목 사전(Aho-Corasick)으로 코드/회사명을 한 번에 해석 → yfinance 심볼
+    #  - "삼성전자" → 005930.KS, "AI"/"RFP"/"PDF" 같은 사전 밖 대문자 약어는 제외 (impl/symbols.py)
+    return resolve_tickers(query)
 
 
 def _normalize_kr_tickers(tickers: List[str]) -> List[str]:
@@ -89,6 +90,7 @@ def _handle(query: str) -> Dict[str, Any]:
       3) Day1Plan 구성
          - do_web=True (웹 검색은 기본 수행)
          - do_stocks=True/False (티커가 존재하면 True)
+         - do_history=True/False (티커가 존재하면 True, 가격 추이 표)
          - web_keywords: [query] (필요시 키워드 가공 가능)
          - tickers: 보정된 티커 리스트
       4) Day1Agent(tavily_api_key=...) 인스턴스 생성
@@ -103,6 +105,7 @@ def _handle(query: str) -> Dict[str, Any]:
     #  - 3) plan = Day1Plan(
     #         do_web=True,
     #         do_stocks=bool(tickers),
+    #         do_history=bool(tickers),
     #         web_keywords=[query],
     #         tickers=tickers
     #       )
@@ -114,6 +117,7 @@ def _handle(query: str) -> Dict[str, Any]:
     plan = Day1Plan(
         do_web=True,
         do_stocks=bool(tickers),
+        do_history=bool(tickers),
         web_keywords=[query],
         tickers=tickers
     )
@@ -7,14 +7,16 @@ Day1 본체
 from __future__ import annotations
 from dataclasses import asdict
 from typing import Optional, Dict, Any, List, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 
 from google.adk.models.lite_llm import LiteLlm
 from student.common.schemas import Day1Plan
+from student.common.executor import submit
 from student.day1.impl.merge import merge_day1_payload
 # 외부 I/O
 from student.day1.impl.tavily_client import search_tavily, extract_url
 from student.day1.impl.finance_client import get_quotes
+from student.day1.impl.history import price_trends
 from student.day1.impl.web_search import (
     looks_like_ticker,
     search_company_profile,
@@ -22,8 +24,11 @@ from student.day1.impl.web_search import (
 )
 
 DEFAULT_WEB_TOPK = 6
-MAX_WORKERS = 4
 DEFAULT_TIMEOUT = 20
+WEB_CACHE_TTL = 900.0   # 일반 웹 검색(뉴스성) 캐시 신선도(초)
+# 지연 예산을 넘겨도 오류로 보고하지 않는 작업 — 기업 개요(검색 + extract + 요약)는 첫 요청에 예산을
+# 자주 넘기지만, 백그라운드에서 끝나 검색/요약 캐시에 남으므로 다음 요청에 바로 채워짐
+BEST_EFFORT = {"profile"}
 
 _SUM: Optional[LiteLlm] = LiteLlm(model="openai/gpt-4o-mini")
 
@@ -98,9 +103,21 @@ class Day1Agent:
         #  self.request_timeout = request_timeout
         # ----------------------------------------------------------------------------
 
+    def _handle_profile(self, query: str) -> Tuple[str, List[str]]:
+        """
+        기업 개요: 검색 1회(raw_content 포함) → 본문이 부족한 URL만 /extract 배치 1회 → 요약
+        반환: (요약 텍스트, 근거 URL 리스트)
+        """
+        results = search_company_profile(query, self.tavily_api_key, timeout=self.request_timeout)
+        urls = [r.get("url", "") for r in results if r.get("url")]
+        text = extract_and_summarize_profile(urls, self.tavily_api_key, _summarize,
+                                             results=results, timeout=self.request_timeout)
+        return text, urls[:2]
+
     def handle(self, query: str, plan: Day1Plan) -> Dict[str, Any]:
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from concurrent.futures import TimeoutError as FuturesTimeout
         from dataclasses import asdict
+        import time
 
         # 1) 결과 스켈레톤 초기화
         results = {
@@ -109,59 +126,90 @@ class Day1Agent:
             "analysis": asdict(plan),
             "items": [],
             "tickers": [],
+            "history": [],
             "errors": [],
             "company_profile": "",
             "profile_sources": [],
         }
 
         futures = {}
+        # 요청 전체 지연 예산(초): 지나면 준비된 결과만 반환, 나머지 작업은 백그라운드에서 끝나 캐시에 남음
+        budget = plan.latency_budget if plan.latency_budget and plan.latency_budget > 0 else None
+        started = time.monotonic()
 
-        # 2) 병렬 작업 제출
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # 2) 병렬 작업 제출 (프로세스 공용 실행기, 목적지별 동시 실행 상한)
+        try:
             # (1) 웹 검색
             if plan.do_web:
-                futures[executor.submit(
+                futures[submit(
+                    "tavily",
                     search_tavily,
                     query,
                     self.tavily_api_key,
                     self.web_topk,
-                    self.request_timeout
+                    self.request_timeout,
+                    cache_ttl=WEB_CACHE_TTL,
                 )] = "web"
 
             # (2) 주가 조회
             if plan.do_stocks:
-                futures[executor.submit(
+                futures[submit(
+                    "fanout",       # 내부에서 심볼별 yfinance 작업으로 다시 나뉨
                     get_quotes,
                     plan.tickers,
                     self.request_timeout
                 )] = "stock"
+                # (2-1) 가격 추이: 하루 1회 증분 동기화 후 로컬 일봉으로 계산
+                if plan.do_history:
+                    futures[submit(
+                        "yfinance",
+                        price_trends,
+                        plan.tickers,
+                        self.request_timeout
+                    )] = "history"
 
             # (3) 기업 개요
             if plan.tickers or looks_like_ticker(query):
-                futures[executor.submit(
+                futures[submit(
+                    "fanout",       # 검색 + extract + 요약
                     self._handle_profile,  # 별도 헬퍼 함수
                     query
                 )] = "profile"
 
-            # 3) 완료된 결과 수집
-            for future in as_completed(futures):
-                kind = futures[future]
-                try:
-                    data = future.result()
-
-                    if kind == "web":
-                        results["items"] = data or []
-                    elif kind == "stock":
-                        results["tickers"] = data or []
-                    elif kind == "profile":
-                        if isinstance(data, tuple):
-                            text, urls = data
-                            results["company_profile"] = text
-                            results["profile_sources"] = urls
-                        else:
-                            results["company_profile"] = data
-                except Exception as e:
-                    results["errors"].append(f"{kind}: {type(e).__name__}: {e}")
+            # 3) 완료된 결과 수집 (예산 안에서)
+            pending = set(futures)
+            try:
+                for future in as_completed(futures, timeout=budget):
+                    pending.discard(future)
+                    kind = futures[future]
+                    try:
+                        data = future.result()
+
+                        if kind == "web":
+                            results["items"] = data or []
+                        elif kind == "stock":
+                            results["tickers"] = data or []
+                        elif kind == "history":
+                            results["history"] = data or []
+                        elif kind == "profile":
+                            if isinstance(data, tuple):
+                                text, urls = data
+                                results["company_profile"] = text
+                                results["profile_sources"] = urls
+                            else:
+                                results["company_profile"] = data
+                    except Exception as e:
+                        results["errors"].append(f"{kind}: {type(e).__name__}: {e}")
+            except FuturesTimeout:
+                elapsed = time.monotonic() - started
+                for future in [f for f in futures if f in pending]:  # 제출 순서대로
+                    if futures[future] in BEST_EFFORT:
+                        continue
+                    results["errors"].append(f"{futures[future]}: timeout: 지연 예산 {budget:g}s 초과 ({elapsed:.1f}s), 부분 결과 반환")
+        finally:
+            # 아직 시작 안 한 작업은 취소, 실행 중인 작업은 기다리지 않음(완료되면 캐시에 반영)
+            for future in futures:
+                future.cancel()
 
         # 4) 결과 병합
         return merge_day1_payload(results)
\ No newline at end of file
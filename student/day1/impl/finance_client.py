@@ -4,8 +4,12 @@ yfinance 가격 조회
 - 목표: 티커 리스트에 대해 현재가/통화를 가져와 표준 형태로 반환
 """
 from yfinance import Ticker
-from typing import List, Dict, Any
-import re
+from typing import List, Dict, Any, Optional
+from concurrent.futures import wait
+import math, re, time
+
+from student.common.executor import submit
+from student.day1.impl.quote_cache import QuoteCache, US_TICKER
 
 # (강의 안내) yfinance는 외부 네트워크 환경에서 동작. 인터넷 불가 환경에선 모킹이 필요할 수 있음.
 
@@ -28,35 +32,93 @@ def _normalize_symbol(s: str) -> str:
         return s
 
 
-def get_quotes(symbols: List[str], timeout: int = 20) -> List[Dict[str, Any]]:
+# 일괄 조회(yf.download)로 가격만 받아도 통화를 알 수 있는 심볼: 접미사 → 통화
+# (접미사 없는 영문 티커는 미국 상장으로 보고 USD, 그 외는 개별 조회로 fast_info 통화 확인)
+_CURRENCY_BY_SUFFIX = {".KS": "KRW", ".KQ": "KRW", ".T": "JPY", ".HK": "HKD", ".L": "GBp", "": "USD"}
+
+
+def _known_currency(symbol: str) -> Optional[str]:
+    for suffix, currency in _CURRENCY_BY_SUFFIX.items():
+        if suffix and symbol.endswith(suffix):
+            return currency
+    return _CURRENCY_BY_SUFFIX[""] if US_TICKER.fullmatch(symbol) else None
+
+
+def _fetch_one(symbol: str) -> Dict[str, Any]:
+    """심볼 1개 fast_info 조회 (기존 get_quotes 본문)"""
+    try:
+        t = Ticker(symbol)
+        price = t.fast_info.get("last_price")
+        currency = t.fast_info.get("currency")
+        return {"symbol": symbol, "price": price, "currency": currency}
+    except Exception as e:
+        return {"symbol": symbol, "error": str(e)}
+
+
+def _fetch_batch(symbols: List[str], timeout: int) -> Dict[str, Dict[str, Any]]:
+    """
+    여러 심볼을 yf.download 한 번으로 조회 → {symbol: quote} (가격을 못 받은 심볼은 빠짐)
+    - 최근 5거래일 일봉의 마지막 종가 = 장중에는 현재가
+    """
+    if not symbols:
+        return {}
+    from yfinance import download
+    try:
+        df = download(symbols, period="5d", interval="1d", group_by="ticker", auto_adjust=False,
+                      progress=False, threads=True, timeout=timeout)
+    except Exception:
+        return {}
+    out: Dict[str, Dict[str, Any]] = {}
+    if df is None or df.empty:
+        return out
+    for sym in symbols:
+        try:
+            close = df[sym]["Close"].dropna()
+        except KeyError:
+            continue
+        if len(close) and not math.isnan(float(close.iloc[-1])):
+            out[sym] = {"symbol": sym, "price": float(close.iloc[-1]), "currency": _known_currency(sym)}
+    return out
+
+
+def fetch_quotes(symbols: List[str], timeout: int = 20) -> List[Dict[str, Any]]:
     """
-    yfinance로 심볼별 시세를 조회해 리스트로 반환합니다.
+    yfinance로 심볼별 시세를 조회해 리스트로 반환합니다. (캐시 없이 항상 네트워크 조회)
     반환 예:
       [{"symbol":"AAPL","price":123.45,"currency":"USD"},
        {"symbol":"005930.KS","price":...,"currency":"KRW"}]
     실패시 해당 심볼은 {"symbol":sym, "error":"..."} 형태로 표기.
+    - 통화를 접미사로 알 수 있는 심볼은 yf.download 일괄 요청 1회
+    - 나머지는 일괄 요청 전에 공용 실행기 "yfinance" 목적지로 먼저 제출(동시 진행), 일괄 실패분도 이어서 개별 조회
+    - timeout(초)은 호출 전체 예산: 그 안에 끝나지 않은 심볼은 {"error": "timeout"} (기다리지 않고 반환)
+    - 입력 순서/중복을 그대로 유지
     """
-    # ----------------------------------------------------------------------------
-    # TODO[DAY1-F-02] 구현 지침
-    #  1) from yfinance import Ticker 임포트(파일 상단 대신 함수 내부 임포트도 OK)
-    #  2) 결과 리스트 out=[]
-    #  3) 입력 심볼들을 _normalize_symbol로 보정
-    #  4) 각 심볼에 대해:
-    #       - t = Ticker(sym)
-    #       - 가격: getattr(t.fast_info, "last_price", None) 또는 t.fast_info.get("last_price")
-    #       - 통화: getattr(t.fast_info, "currency", None)
-    #       - 둘 다 숫자/문자 정상 추출 시 out.append({...})
-    #       - 예외/누락 시 out.append({"symbol": sym, "error": "설명"})
-    #  5) return out
-    # ----------------------------------------------------------------------------
-    out = []
-    for symbol in symbols:
-        symbol = _normalize_symbol(symbol)
-        try:
-            t = Ticker(symbol)
-            price = t.fast_info.get("last_price")
-            currency = t.fast_info.get("currency")
-            out.append({"symbol": symbol, "price": price, "currency": currency})
-        except Exception as e:
-            out.append({"symbol": symbol, "error": str(e)})
-    return out
+    deadline = time.monotonic() + timeout
+    normalized = [_normalize_symbol(s) for s in symbols]
+    unique = list(dict.fromkeys(normalized))
+    batchable = [s for s in unique if _known_currency(s)]
+    batch = batchable if len(batchable) > 1 else []
+    futures = {submit("yfinance", _fetch_one, s): s for s in unique if s not in batch}
+    quotes = _fetch_batch(batch, timeout)
+
+    futures.update({submit("yfinance", _fetch_one, s): s for s in batch if s not in quotes})
+    if futures:
+        done, _ = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+        for f, s in futures.items():
+            quotes[s] = f.result() if f in done else {"symbol": s, "error": f"timeout after {timeout}s"}
+            f.cancel()  # 아직 대기열에 있던 조회는 취소, 실행 중인 요청은 백그라운드에서 정리
+    return [dict(quotes[s]) for s in normalized]
+
+
+_QUOTE_CACHE = QuoteCache(fetch_quotes)
+
+
+def get_quotes(symbols: List[str], timeout: int = 20, use_cache: bool = True) -> List[Dict[str, Any]]:
+    """
+    fetch_quotes 앞단 캐시(quote_cache.py) — 반환 형식은 fetch_quotes와 같음
+    - 장중에는 OPEN_TTL 초, 장 마감 후에는 다음 개장까지 메모리 값 재사용
+    - TTL 직후(STALE_GRACE)에는 직전 값을 바로 주고 백그라운드에서 갱신 (항목에 "cached": "stale")
+    """
+    if not use_cache:
+        return fetch_quotes(symbols, timeout)
+    return _QUOTE_CACHE.get([_normalize_symbol(s) for s in symbols], timeout)
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Day1 로컬 일봉(OHLCV) 저장소
+- 관심 종목별로 <root>/<symbol>.npz 한 파일 (컬럼 배열: date(YYYYMMDD) / open / high / low / close / volume)
+- sync: 마지막 저장일부터만 yfinance에서 받아 이어붙임 (같은 시작일끼리 yf.download 1회)
+  마지막 동기화가 가장 최근 정규장 마감 이후면 건너뜀 → 장중에 받은 당일 값은 마감 후 첫 조회에서 확정값으로 교체
+  데이터가 없는 심볼(상장폐지/오타)은 EMPTY_TTL 동안 다시 받지 않음
+- 조회: 날짜 구간 이진 탐색 슬라이스 + 벡터화 지표(수익률, 이동평균, 52주 고저) → render_day1 "가격 추이"
+"""
+
+from __future__ import annotations
+import os, time, argparse, threading
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from student.day1.impl.finance_client import _normalize_symbol
+from student.day1.impl.quote_cache import SESSIONS, exchange_of
+
+DEFAULT_ROOT = "data/day1/history"
+INITIAL_DAYS = 2 * 365        # 처음 동기화 시 받아올 기간
+COLUMNS = ("open", "high", "low", "close", "volume")
+TREND_WINDOWS = (5, 20, 60)   # 이동평균 기간(거래일)
+RETURN_PERIODS = {"1d": 1, "1w": 5, "1m": 21, "3m": 63, "1y": 252}
+SETTLE = timedelta(minutes=30)   # 장 마감 후 일봉이 확정돼 내려올 때까지의 여유
+EMPTY_TTL = 600.0             # "no data" 심볼 재조회 간격(초)
+
+
+def _int_to_date(d: int) -> date:
+    return date(d // 10000, d // 100 % 100, d % 100)
+
+
+def last_session_close(symbol: str, now_ts: Optional[float] = None) -> Optional[float]:
+    """
+    가장 최근에 끝난 정규장의 마감 시각(epoch, SETTLE 포함) — 주말만 건너뜀(휴장일은 고려하지 않음)
+    세션을 모르는 거래소(.T 등)면 None
+    """
+    ex = exchange_of(symbol)
+    if ex is None:
+        return None
+    tz, _, close_t = SESSIONS[ex]
+    now = datetime.fromtimestamp(now_ts if now_ts is not None else time.time(), tz)
+    d = now.date()
+    for _ in range(8):
+        cand = datetime.combine(d, close_t, tzinfo=tz) + SETTLE
+        if cand <= now and cand.weekday() < 5:
+            return cand.timestamp()
+        d -= timedelta(days=1)
+    return None
+
+
+# ---------- 벡터화 지표 ----------
+def moving_average(close: np.ndarray, window: int) -> np.ndarray:
+    """단순 이동평균 (cumsum), 앞쪽 window-1개는 NaN"""
+    close = np.asarray(close, dtype="float64")
+    out = np.full(len(close), np.nan)
+    if window <= 0 or len(close) < window:
+        return out
+    c = np.cumsum(np.insert(close, 0, 0.0))
+    out[window - 1:] = (c[window:] - c[:-window]) / window
+    return out
+
+
+def returns(close: np.ndarray, period: int = 1) -> np.ndarray:
+    """period 거래일 수익률, 앞쪽 period개는 NaN"""
+    close = np.asarray(close, dtype="float64")
+    out = np.full(len(close), np.nan)
+    if 0 < period < len(close):
+        out[period:] = close[period:] / close[:-period] - 1.0
+    return out
+
+
+class PriceHistory:
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = root
+        self._cache: Dict[str, Tuple[float, Dict[str, np.ndarray]]] = {}   # symbol → (mtime, 배열들)
+        self._empty: Dict[str, float] = {}   # symbol → "no data" 받은 시각(monotonic)
+        self._lock = threading.Lock()
+
+    def path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol}.npz")
+
+    # ---------- 저장/로드 ----------
+    def load(self, symbol: str) -> Dict[str, np.ndarray]:
+        """저장된 전체 일봉 (없으면 길이 0 배열들) — 파일이 바뀌지 않았으면 메모리 재사용"""
+        p = self.path(symbol)
+        try:
+            mtime = os.path.getmtime(p)
+        except OSError:
+            return {"date": np.zeros(0, dtype="int32"), **{c: np.zeros(0) for c in COLUMNS}}
+        with self._lock:
+            cached = self._cache.get(symbol)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        with np.load(p) as z:
+            data = {k: z[k] for k in z.files}
+        with self._lock:
+            self._cache[symbol] = (mtime, data)
+        return data
+
+    def _save(self, symbol: str, data: Dict[str, np.ndarray]) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.path(symbol) + ".tmp.npz"
+        np.savez(tmp, **data)
+        os.replace(tmp, self.path(symbol))
+
+    def last_date(self, symbol: str) -> Optional[int]:
+        d = self.load(symbol)["date"]
+        return int(d[-1]) if len(d) else None
+
+    # ---------- 증분 동기화 ----------
+    def _download(self, symbols: List[str], start: date, timeout: int) -> Dict[str, Dict[str, np.ndarray]]:
+        from yfinance import download
+        df = download(symbols, start=start.isoformat(), interval="1d", group_by="ticker", auto_adjust=False,
+                      progress=False, threads=True, timeout=timeout)
+        out: Dict[str, Dict[str, np.ndarray]] = {}
+        if df is None or df.empty:
+            return out
+        for sym in symbols:
+            try:
+                sub = df[sym].dropna(subset=["Close"])
+            except KeyError:
+                continue
+            out[sym] = {
+                "date": np.array([int(ts.strftime("%Y%m%d")) for ts in sub.index], dtype="int32"),
+                **{c: sub[c.capitalize()].to_numpy(dtype="float64") for c in COLUMNS},
+            }
+        return out
+
+    def sync(self, symbols: List[str], timeout: int = 20) -> Dict[str, Any]:
+        """
+        마지막 저장일 이후 일봉만 받아 append → {"updated": {symbol: 추가 행 수}, "errors": {symbol: 메시지}}
+        - 가장 최근 정규장 마감(last_session_close) 이후에 이미 동기화한 심볼은 건너뜀
+          (세션을 모르는 거래소는 파일 수정일 = 오늘이면 건너뜀)
+        - 마지막 행(당일 장중 값일 수 있음)은 새로 받은 값으로 덮어씀
+        - EMPTY_TTL 안에 "no data"였던 심볼은 다시 받지 않고 같은 오류로 보고
+        """
+        today = date.today()
+        now = time.monotonic()
+        groups: Dict[date, List[str]] = {}
+        updated: Dict[str, int] = {}
+        errors: Dict[str, str] = {}
+        for s in dict.fromkeys(symbols):
+            if now - self._empty.get(s, -EMPTY_TTL) < EMPTY_TTL:
+                errors[s] = "no data"
+                continue
+            p = self.path(s)
+            if os.path.exists(p):
+                mtime = os.path.getmtime(p)
+                closed = last_session_close(s)
+                if (mtime >= closed) if closed is not None else (date.fromtimestamp(mtime) == today):
+                    continue
+            last = self.last_date(s)
+            start = _int_to_date(last) if last else today - timedelta(days=INITIAL_DAYS)
+            groups.setdefault(start, []).append(s)
+
+        for start, syms in groups.items():
+            try:
+                fetched = self._download(syms, start, timeout)
+            except Exception as e:
+                errors.update({s: str(e) for s in syms})
+                continue
+            for s in syms:
+                new = fetched.get(s)
+                if new is None or not len(new["date"]):
+                    errors[s] = "no data"
+                    self._empty[s] = time.monotonic()
+                    continue
+                self._empty.pop(s, None)
+                old = self.load(s)
+                keep = old["date"] < new["date"][0]
+                merged = {k: np.concatenate([old[k][keep], new[k]]) for k in ("date",) + COLUMNS}
+                self._save(s, merged)
+                updated[s] = int(len(merged["date"]) - keep.sum())
+        return {"updated": updated, "errors": errors}
+
+    # ---------- 조회 ----------
+    def range(self, symbol: str, start: Optional[int] = None, end: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """[start, end] (YYYYMMDD, 포함) 구간 슬라이스"""
+        data = self.load(symbol)
+        d = data["date"]
+        i = np.searchsorted(d, start, side="left") if start else 0
+        j = np.searchsorted(d, end, side="right") if end else len(d)
+        return {k: v[i:j] for k, v in data.items()}
+
+    def trend(self, symbol: str) -> Dict[str, Any]:
+        """render_day1 "가격 추이"용 요약: 최근 종가, 기간 수익률, 이동평균, 52주 고저"""
+        data = self.load(symbol)
+        close = data["close"]
+        if not len(close):
+            return {"symbol": symbol, "error": "no history"}
+        year = self.range(symbol, start=int((_int_to_date(int(data["date"][-1])) - timedelta(days=365)).strftime("%Y%m%d")))
+        out: Dict[str, Any] = {"symbol": symbol, "date": int(data["date"][-1]), "close": float(close[-1])}
+        for name, n in RETURN_PERIODS.items():
+            r = returns(close[-(n + 1):], n)
+            out[f"ret_{name}"] = float(r[-1]) if len(r) and not np.isnan(r[-1]) else None
+        for w in TREND_WINDOWS:
+            ma = moving_average(close[-w:], w)
+            out[f"ma{w}"] = float(ma[-1]) if len(ma) and not np.isnan(ma[-1]) else None
+        out["high_52w"] = float(np.max(year["high"]))
+        out["low_52w"] = float(np.min(year["low"]))
+        return out
+
+
+_DEFAULT = PriceHistory()
+
+
+def price_trends(symbols: List[str], timeout: int = 20, root: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    심볼 리스트 → trend 리스트 (입력 순서, 심볼은 _normalize_symbol 적용)
+    - 필요한 심볼만 증분 동기화(하루 1회) 후 로컬 배열로 계산
+    """
+    symbols = [_normalize_symbol(s) for s in symbols]
+    store = PriceHistory(root) if root else _DEFAULT
+    store.sync(symbols, timeout)
+    return [store.trend(s) for s in symbols]
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--symbols", nargs="+", required=True)
+    ap.add_argument("--root", default=DEFAULT_ROOT)
+    ap.add_argument("--timeout", type=int, default=20)
+    args = ap.parse_args()
+
+    syms = [_normalize_symbol(s) for s in args.symbols]
+    res = PriceHistory(args.root).sync(syms, args.timeout)
+    for s, n in res["updated"].items():
+        print(f"  📈 {s}: +{n}행")
+    for s, e in res["errors"].items():
+        print(f"  ❌ {s}: {e}")
+    print(f"✅ 동기화 완료! 저장 경로: {args.root}")
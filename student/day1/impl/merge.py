@@ -32,6 +32,7 @@ def merge_day1_payload(results: Dict[str, Any]) -> Dict[str, Any]:
         "analysis": {... Day1Plan asdict ...},
         "items":[{title,url,snippet,...}, ...],
         "tickers":[{symbol,price,currency}|{symbol,error}, ...],
+        "history":[{symbol,date,close,ret_*,ma*,high_52w,low_52w}|{symbol,error}, ...],
         "company_profile":"요약 텍스트",
         "profile_sources":[url1,url2,...],
         "errors":[...]
@@ -43,6 +44,7 @@ def merge_day1_payload(results: Dict[str, Any]) -> Dict[str, Any]:
         "query": "...",
         "web_top":[... 상위 N개 ...],
         "prices":[...],
+        "history":[...],
         "company_profile":"...",
         "profile_sources":[...],
         "errors":[...]
@@ -60,8 +62,9 @@ def merge_day1_payload(results: Dict[str, Any]) -> Dict[str, Any]:
     # ----------------------------------------------------------------------------
     web_top = _top_results(results.get("items"), k=5) # 상위 5개 웹 검색 결과
     prices = results.get("tickers", [])
+    history = results.get("history") or [] # 가격 추이(로컬 일봉)
     company_profile = results.get("company_profile") or ""
     profile_sources = results.get("profile_sources") or [] # 기업 정보 출처
     errors = results.get("errors") or [] # 에러 메시지
     query = results.get("query", "") # 질의
-    return {"type": "day1", "query": query, "web_top": web_top, "prices": prices, "company_profile": company_profile, "profile_sources": profile_sources, "errors": errors}
+    return {"type": "day1", "query": query, "web_top": web_top, "prices": prices, "history": history, "company_profile": company_profile, "profile_sources": profile_sources, "errors": errors}
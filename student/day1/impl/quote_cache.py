@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+시세 메모리 캐시 (get_quotes 앞단)
+- 키: _normalize_symbol 이후 심볼 (005930 → 005930.KS)
+- TTL: 거래소 정규장 중에는 짧게(OPEN_TTL), 장 마감 후에는 다음 개장까지(최대 CLOSED_TTL_MAX) — 마감 후 가격은 바뀌지 않음
+- stale-while-revalidate: TTL이 지나도 STALE_GRACE 안이면 캐시값을 바로 반환하고 공용 실행기에서 갱신
+- 오류 항목은 캐시하지 않음
+- 휴장일은 고려하지 않음(평일 정규장 시간만) → 휴장일에는 장중 TTL로 동작할 뿐 값은 그대로
+"""
+
+from __future__ import annotations
+import re, threading, time
+from datetime import datetime, timedelta, timezone, time as dtime
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+from student.common.executor import submit
+
+try:
+    from zoneinfo import ZoneInfo
+    _KST = ZoneInfo("Asia/Seoul")
+    _NY = ZoneInfo("America/New_York")
+except Exception:  # tzdata 없는 환경: 고정 오프셋(뉴욕은 서머타임 미반영)
+    _KST = timezone(timedelta(hours=9))
+    _NY = timezone(timedelta(hours=-5))
+
+OPEN_TTL = 15.0               # 장중 신선도(초)
+STALE_GRACE = 60.0            # TTL 경과 후 이 시간 안이면 stale 값 반환 + 백그라운드 갱신
+CLOSED_TTL_MAX = 6 * 3600.0   # 장 마감 후 TTL 상한
+UNKNOWN_TTL = OPEN_TTL        # 세션을 모르는 거래소(.T 등)는 항상 장중으로 취급
+
+US_TICKER = re.compile(r"[A-Z]{1,5}(-[A-Z])?")   # 접미사 없는 미국 주식 티커 (BRK-B 포함)
+
+# 거래소: (시간대, 개장, 마감)
+SESSIONS = {
+    "KRX": (_KST, dtime(9, 0), dtime(15, 30)),
+    "NYSE": (_NY, dtime(9, 30), dtime(16, 0)),
+}
+
+
+def exchange_of(symbol: str) -> Optional[str]:
+    if symbol.endswith((".KS", ".KQ")):
+        return "KRX"
+    if US_TICKER.fullmatch(symbol):
+        return "NYSE"
+    return None
+
+
+def _next_open(now: datetime, open_t: dtime) -> datetime:
+    d = now.date()
+    for _ in range(8):
+        cand = datetime.combine(d, open_t, tzinfo=now.tzinfo)
+        if cand > now and cand.weekday() < 5:
+            return cand
+        d += timedelta(days=1)
+    return now + timedelta(seconds=CLOSED_TTL_MAX)
+
+
+def ttl_for(symbol: str, now_ts: Optional[float] = None) -> float:
+    """심볼의 현재 TTL(초): 정규장 중 OPEN_TTL, 마감 후 다음 개장까지(상한 CLOSED_TTL_MAX)"""
+    ex = exchange_of(symbol)
+    if ex is None:
+        return UNKNOWN_TTL
+    tz, open_t, close_t = SESSIONS[ex]
+    now = datetime.fromtimestamp(now_ts if now_ts is not None else time.time(), tz)
+    if now.weekday() < 5 and open_t <= now.time() < close_t:
+        return OPEN_TTL
+    return max(OPEN_TTL, min(CLOSED_TTL_MAX, (_next_open(now, open_t) - now).total_seconds()))
+
+
+class QuoteCache:
+    """fetch(symbols, timeout) -> [quote] 앞에 두는 심볼 단위 캐시 (스레드 안전)"""
+
+    def __init__(self, fetch: Callable[[List[str], int], List[Dict[str, Any]]],
+                 clock: Callable[[], float] = time.time):
+        self.fetch = fetch
+        self.clock = clock
+        self._entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}   # symbol → (fresh_until, quote)
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+
+    def _store(self, quotes: List[Dict[str, Any]]) -> None:
+        now = self.clock()
+        with self._lock:
+            for q in quotes:
+                if "error" not in q:
+                    self._entries[q["symbol"]] = (now + ttl_for(q["symbol"], now), dict(q))
+
+    def _release(self, symbols: List[str]) -> None:
+        with self._lock:
+            self._refreshing.difference_update(symbols)
+
+    def _refresh(self, symbols: List[str], timeout: int) -> None:
+        try:
+            self._store(self.fetch(symbols, timeout))
+        except Exception:
+            pass
+        finally:
+            self._release(symbols)
+
+    def get(self, symbols: List[str], timeout: int = 20) -> List[Dict[str, Any]]:
+        """정규화된 심볼 리스트 → quote 리스트(입력 순서), 캐시 적중 항목에는 "cached": "fresh"|"stale" """
+        now = self.clock()
+        hits: Dict[str, Dict[str, Any]] = {}
+        stale: List[str] = []
+        with self._lock:
+            for s in dict.fromkeys(symbols):
+                entry = self._entries.get(s)
+                if entry is None:
+                    continue
+                fresh_until, q = entry
+                if now < fresh_until:
+                    hits[s] = dict(q, cached="fresh")
+                elif now < fresh_until + STALE_GRACE:
+                    hits[s] = dict(q, cached="stale")
+                    if s not in self._refreshing:
+                        self._refreshing.add(s)
+                        stale.append(s)
+        if stale:
+            # fetch가 안에서 다시 "yfinance"로 submit 하고 기다리는 조합 작업 → "fanout"
+            try:
+                fut = submit("fanout", self._refresh, stale, timeout)
+            except RuntimeError:  # 실행기 종료 중: 갱신 생략
+                self._release(stale)
+            else:
+                fut.add_done_callback(lambda f: f.cancelled() and self._release(stale))
+
+        missing = [s for s in dict.fromkeys(symbols) if s not in hits]
+        if missing:
+            fetched = self.fetch(missing, timeout)
+            self._store(fetched)
+            hits.update({q["symbol"]: q for q in fetched})
+        return [dict(hits[s]) for s in symbols]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+오프라인 종목 해석기 (질의 → yfinance 심볼)
+- 사전: 내장 목록(KRX/NASDAQ/NYSE 주요 종목의 코드·회사명·별칭) + 선택적 CSV(SYMBOLS_PATH)
+- 매칭: 사전 전체를 Aho-Corasick 오토마톤 하나로 만들어 질의를 한 번만 훑음 → 겹치면 가장 왼쪽·가장 긴 것
+- 사전에 없는 영문 대문자 토큰(AI, RFP, PDF 등)은 티커로 보지 않음
+  (예외: 거래소 접미사가 붙은 형태 7203.T / 0700.HK, 사전에 없는 6자리 숫자 코드 → .KS)
+- 대문자 ASCII 코드/이름(AAPL, KT, LG)은 대소문자까지 일치해야 함, 나머지 이름은 대소문자 무시
+- 경계: 이름 앞뒤가 같은 종류의 글자(영문/숫자, 한글)로 이어지면 안 됨 — 파인애플, 구글링, 메타버스 제외
+  한글 끝 뒤에는 조사(삼성전자의, 애플은)나 주가/시세 같은 종목 문맥어(삼성전자주가)만 붙을 수 있음
+- 일반 단어와 같은 이름(기아, 메타, 아마존 등)은 질의에 종목 문맥어나 다른 종목이 함께 있을 때만 인정
+- 점 표기 클래스주(BRK.B)는 사전의 대시 표기(BRK-B)로 해석
+"""
+
+from __future__ import annotations
+import os, re, csv, argparse, threading
+from collections import deque
+from typing import List, Dict, Any, Optional, Tuple
+
+SYMBOLS_PATH = os.getenv("DAY1_SYMBOLS_PATH", "data/day1/symbols.csv")   # symbol,names("|" 구분)
+
+# (yfinance 심볼, [회사명/별칭]) — 코드(005930, AAPL)는 심볼에서 자동 등록
+# 일반 단어와 겹치는 코드(V, MA 등)는 넣지 않음
+_KRX: List[Tuple[str, List[str]]] = [
+    ("005930.KS", ["삼성전자", "Samsung Electronics"]),
+    ("000660.KS", ["SK하이닉스", "하이닉스", "SK hynix"]),
+    ("373220.KS", ["LG에너지솔루션", "LG엔솔"]),
+    ("207940.KS", ["삼성바이오로직스", "삼성바이오"]),
+    ("005380.KS", ["현대차", "현대자동차", "Hyundai Motor"]),
+    ("000270.KS", ["기아", "기아차", "Kia"]),
+    ("068270.KS", ["셀트리온", "Celltrion"]),
+    ("005490.KS", ["POSCO홀딩스", "포스코홀딩스", "포스코"]),
+    ("035420.KS", ["NAVER", "네이버"]),
+    ("035720.KS", ["카카오", "Kakao"]),
+    ("323410.KS", ["카카오뱅크"]),
+    ("051910.KS", ["LG화학"]),
+    ("006400.KS", ["삼성SDI"]),
+    ("012330.KS", ["현대모비스"]),
+    ("105560.KS", ["KB금융", "KB금융지주"]),
+    ("055550.KS", ["신한지주", "신한금융지주"]),
+    ("086790.KS", ["하나금융지주", "하나금융"]),
+    ("316140.KS", ["우리금융지주", "우리금융"]),
+    ("028260.KS", ["삼성물산"]),
+    ("066570.KS", ["LG전자", "LG Electronics"]),
+    ("003550.KS", ["LG"]),
+    ("034730.KS", ["SK"]),
+    ("096770.KS", ["SK이노베이션"]),
+    ("017670.KS", ["SK텔레콤", "SKT"]),
+    ("030200.KS", ["KT"]),
+    ("032830.KS", ["삼성생명"]),
+    ("000810.KS", ["삼성화재"]),
+    ("009150.KS", ["삼성전기"]),
+    ("018260.KS", ["삼성SDS", "삼성에스디에스"]),
+    ("010140.KS", ["삼성중공업"]),
+    ("015760.KS", ["한국전력", "한전"]),
+    ("259960.KS", ["크래프톤", "Krafton"]),
+    ("036570.KS", ["엔씨소프트", "NC소프트"]),
+    ("011200.KS", ["HMM"]),
+    ("012450.KS", ["한화에어로스페이스"]),
+    ("034020.KS", ["두산에너빌리티"]),
+    ("003490.KS", ["대한항공"]),
+    ("090430.KS", ["아모레퍼시픽"]),
+    ("051900.KS", ["LG생활건강"]),
+    ("010130.KS", ["고려아연"]),
+    ("352820.KS", ["하이브", "HYBE"]),
+    ("000720.KS", ["현대건설"]),
+    ("326030.KS", ["SK바이오팜"]),
+    ("247540.KQ", ["에코프로비엠"]),
+    ("086520.KQ", ["에코프로"]),
+    ("196170.KQ", ["알테오젠"]),
+    ("028300.KQ", ["HLB", "에이치엘비"]),
+    ("068760.KQ", ["셀트리온제약"]),
+    ("263750.KQ", ["펄어비스"]),
+    ("293490.KQ", ["카카오게임즈"]),
+    ("058470.KQ", ["리노공업"]),
+    ("277810.KQ", ["레인보우로보틱스"]),
+    ("035900.KQ", ["JYP Ent.", "JYP엔터테인먼트", "JYP"]),
+    ("041510.KQ", ["에스엠", "SM엔터테인먼트"]),
+]
+
+_US: List[Tuple[str, List[str]]] = [
+    ("AAPL", ["Apple", "애플"]),
+    ("MSFT", ["Microsoft", "마이크로소프트"]),
+    ("NVDA", ["Nvidia", "엔비디아"]),
+    ("AMZN", ["Amazon", "아마존"]),
+    ("GOOGL", ["Alphabet", "Google", "알파벳", "구글"]),
+    ("META", ["Meta Platforms", "Facebook", "메타", "페이스북"]),
+    ("TSLA", ["Tesla", "테슬라"]),
+    ("AVGO", ["Broadcom", "브로드컴"]),
+    ("NFLX", ["Netflix", "넷플릭스"]),
+    ("AMD", ["Advanced Micro Devices"]),
+    ("INTC", ["Intel", "인텔"]),
+    ("QCOM", ["Qualcomm", "퀄컴"]),
+    ("MU", ["Micron", "마이크론"]),
+    ("TSM", ["TSMC"]),
+    ("ASML", ["에이에스엠엘"]),
+    ("ARM", ["Arm Holdings", "암홀딩스"]),
+    ("SMCI", ["Super Micro Computer", "슈퍼마이크로"]),
+    ("ORCL", ["Oracle", "오라클"]),
+    ("CRM", ["Salesforce", "세일즈포스"]),
+    ("ADBE", ["Adobe", "어도비"]),
+    ("IBM", []),
+    ("CSCO", ["Cisco", "시스코"]),
+    ("PLTR", ["Palantir", "팔란티어"]),
+    ("UBER", ["우버"]),
+    ("COIN", ["Coinbase", "코인베이스"]),
+    ("JPM", ["JPMorgan", "JP모건", "제이피모건"]),
+    ("BRK-B", ["Berkshire Hathaway", "버크셔해서웨이", "버크셔"]),
+    ("LLY", ["Eli Lilly", "일라이릴리"]),
+    ("JNJ", ["Johnson & Johnson", "존슨앤존슨"]),
+    ("PFE", ["Pfizer", "화이자"]),
+    ("XOM", ["ExxonMobil", "Exxon Mobil", "엑슨모빌"]),
+    ("WMT", ["Walmart", "월마트"]),
+    ("COST", ["Costco", "코스트코"]),
+    ("KO", ["Coca-Cola", "코카콜라"]),
+    ("PEP", ["PepsiCo", "펩시코"]),
+    ("DIS", ["Disney", "디즈니"]),
+    ("NKE", ["Nike", "나이키"]),
+    ("SBUX", ["Starbucks", "스타벅스"]),
+    ("MCD", ["McDonald's", "맥도날드"]),
+    ("BA", ["Boeing", "보잉"]),
+    ("SPY", []),
+    ("QQQ", []),
+]
+
+# 사전 밖이어도 받아들이는 명시적 형태
+_SUFFIXED = re.compile(r"(?<![A-Za-z0-9])(\d{4,6}\.(?:KS|KQ|T|HK)|[A-Z]{1,5}\.(?:L|TO|DE|PA))(?![A-Za-z0-9])")
+_KR_CODE = re.compile(r"(?<![A-Za-z0-9])\d{6}(?![A-Za-z0-9]|\.[A-Z])")
+
+# 한글 이름 뒤에 붙어도 되는 조사
+_PARTICLES = frozenset("은 는 이 가 을 를 의 에 와 과 도 만 로 랑 에서 에게 으로 이랑 하고 까지 부터 보다 처럼 이나".split())
+# 종목 문맥어 — 한글 이름 바로 뒤(삼성전자주가)에 붙거나, 일반 단어 이름을 종목으로 인정하는 근거
+_CONTEXT_WORDS = ("주가", "주식", "시세", "종목", "시총", "시가총액", "매수", "매도", "실적", "배당",
+                  "차트", "증시", "상장", "목표가", "티커", "투자")
+# 일반 단어와 겹치는 한글 이름 (기아=굶주림, 메타버스의 메타 등) — 문맥어/다른 종목이 있어야 인정
+_AMBIGUOUS = frozenset(["기아", "메타", "아마존", "알파벳", "오라클", "하이브", "에스엠", "보잉", "암홀딩스"])
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+def _is_hangul(ch: str) -> bool:
+    return "가" <= ch <= "힣"
+
+
+def _case_sensitive(pattern: str) -> bool:
+    """대문자 ASCII(코드/약칭)나 3자 이하 ASCII는 원문 대소문자까지 일치해야 함"""
+    return pattern.isascii() and (pattern.upper() == pattern or len(pattern) <= 3)
+
+
+def _code_of(symbol: str) -> str:
+    """005930.KS → 005930, BRK-B → BRK-B, AAPL → AAPL"""
+    return symbol.split(".")[0]
+
+
+def _codes_of(symbol: str) -> List[str]:
+    """심볼에서 자동 등록할 코드 — 클래스주(BRK-B)는 점 표기(BRK.B)도 함께"""
+    code = _code_of(symbol)
+    return [code, code.replace("-", ".")] if "-" in code else [code]
+
+
+class AhoCorasick:
+    """문자 단위 Aho-Corasick: add()로 패턴 등록 → build() → iter()로 (시작, 끝, 값) 전부"""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]   # 노드 → [(패턴 길이, 값)]
+
+    def add(self, pattern: str, value: Any) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(pattern), value))
+
+    def build(self) -> None:
+        """BFS로 실패 링크 계산, 실패 노드의 출력을 합쳐 둠"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0   # 루트의 자식은 루트로
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter(self, text: str):
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, value in self._out[node]:
+                yield i - length + 1, i + 1, value
+
+
+class SymbolResolver:
+    def __init__(self, entries: List[Tuple[str, List[str]]]):
+        self.names: Dict[str, str] = {}   # symbol → 대표 이름
+        self._ac = AhoCorasick()
+        for symbol, names in entries:
+            self.add(symbol, names)
+        self._ac.build()
+
+    def add(self, symbol: str, names: List[str]) -> None:
+        """(build 전) 심볼 1개의 코드 + 이름들 등록 — 패턴은 소문자로 넣고 원문은 값에 보관"""
+        self.names.setdefault(symbol, names[0] if names else symbol)
+        for pattern in dict.fromkeys(_codes_of(symbol) + list(names)):
+            if pattern:
+                self._ac.add(pattern.lower(), (symbol, pattern))
+
+    def _accept(self, query: str, start: int, end: int, pattern: str) -> bool:
+        if _case_sensitive(pattern) and query[start:end] != pattern:
+            return False
+        if _is_word(pattern[0]) and start > 0 and _is_word(query[start - 1]):
+            return False
+        if _is_word(pattern[-1]) and end < len(query) and _is_word(query[end]):
+            return False
+        if _is_hangul(pattern[0]) and start > 0 and (_is_hangul(query[start - 1]) or _is_word(query[start - 1])):
+            return False
+        if _is_hangul(pattern[-1]) and end < len(query):
+            if _is_word(query[end]):
+                return False
+            tail = end
+            while tail < len(query) and _is_hangul(query[tail]):
+                tail += 1
+            rest = query[end:tail]
+            if rest and rest not in _PARTICLES and not rest.startswith(_CONTEXT_WORDS):
+                return False
+        return True
+
+    def resolve(self, query: str) -> List[Dict[str, Any]]:
+        """
+        질의 → [{"symbol","name","match","start","end"}] (등장 순서, 겹치면 가장 왼쪽·가장 긴 것)
+        - 질의는 소문자로 바꿔 오토마톤에 한 번만 통과 (len이 같은 lower만 쓰므로 위치 보존)
+        """
+        text = query.lower()
+        if len(text) != len(query):          # 드문 유니코드(İ 등): 위치가 어긋나면 원문 그대로
+            text = query
+        cands = [(s, e, sym, pat) for s, e, (sym, pat) in self._ac.iter(text) if self._accept(query, s, e, pat)]
+        for m in _SUFFIXED.finditer(query):
+            cands.append((m.start(), m.end(), m.group(0), m.group(0)))
+        for m in _KR_CODE.finditer(query):   # 사전에 없는 6자리 코드는 기존처럼 .KS
+            cands.append((m.start(), m.end(), f"{m.group(0)}.KS", m.group(0)))
+
+        out: List[Dict[str, Any]] = []
+        last_end = 0
+        for s, e, sym, pat in sorted(cands, key=lambda c: (c[0], -(c[1] - c[0]))):
+            if s < last_end:
+                continue
+            out.append({"symbol": sym, "name": self.names.get(sym, sym), "match": query[s:e], "start": s, "end": e})
+            last_end = e
+        # 일반 단어 이름만 있고 종목 문맥이 없으면(기아 대책, 아마존 열대우림) 종목으로 보지 않음
+        if not any(w in query for w in _CONTEXT_WORDS) and all(m["match"] in _AMBIGUOUS for m in out):
+            return []
+        return out
+
+    def tickers(self, query: str) -> List[str]:
+        """질의 속 종목 → yfinance 심볼 리스트 (순서 유지, 중복 제거)"""
+        return list(dict.fromkeys(m["symbol"] for m in self.resolve(query)))
+
+
+def load_entries(path: Optional[str] = SYMBOLS_PATH) -> List[Tuple[str, List[str]]]:
+    """내장 목록 + CSV(symbol,names) 추가분 — CSV가 없으면 내장 목록만"""
+    entries = list(_KRX) + list(_US)
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                symbol = (row.get("symbol") or "").strip()
+                if symbol:
+                    entries.append((symbol, [n.strip() for n in (row.get("names") or "").split("|") if n.strip()]))
+    return entries
+
+
+_RESOLVER: Optional[SymbolResolver] = None
+_LOCK = threading.Lock()
+
+
+def get_resolver() -> SymbolResolver:
+    """프로세스 공용 해석기 (최초 호출 시 사전 로드 + 오토마톤 생성)"""
+    global _RESOLVER
+    if _RESOLVER is None:
+        with _LOCK:
+            if _RESOLVER is None:
+                _RESOLVER = SymbolResolver(load_entries())
+    return _RESOLVER
+
+
+def resolve_tickers(query: str) -> List[str]:
+    return get_resolver().tickers(query)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("query", nargs="+")
+    args = ap.parse_args()
+
+    for m in get_resolver().resolve(" ".join(args.query)):
+        print(f"  🔎 {m['match']} → {m['symbol']} ({m['name']})")
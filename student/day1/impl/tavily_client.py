@@ -1,10 +1,23 @@
 # -*- coding: utf-8 -*-
-import os, requests
+import os
 from typing import List, Dict, Any, Optional
 from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
+from student.common import http_client as http
+from student.common.disk_cache import get_cache, make_key
+from student.common.executor import submit
+
 TAVILY_BASE = "https://api.tavily.com"
 
+# 검색 응답 디스크 캐시 (Day1 웹/기업 개요, Day3 공고 검색 공용) — 호출 위치별로 cache_ttl 지정
+CACHE_PATH = os.getenv("TAVILY_CACHE_PATH", "data/cache/tavily.sqlite")
+SEARCH_CACHE_TTL = 3600.0      # 기본 신선도(초), 0이면 캐시 미사용
+SEARCH_STALE_FACTOR = 1.0      # TTL 경과 후 ttl * factor 초까지는 캐시값 반환 + 백그라운드 갱신
+
+class _EmptyResults(Exception):
+    """결과 0건 — 일시적 누락일 수 있어 캐시에 남기지 않기 위해 예외로 전달"""
+
+
 def _headers(api_key: str) -> dict:
     return {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
 
@@ -19,8 +32,14 @@ def search_tavily(
     include_answer: bool = False,
     include_images: bool = False,
     include_raw_content: bool = False,
+    cache_ttl: float = SEARCH_CACHE_TTL,
     **kwargs: Any,
 ) -> List[Dict[str, Any]]:
+    """
+    Tavily /search → results 리스트
+    - 같은 payload(query/도메인/depth/max_results/raw_content 등)는 디스크 캐시 재사용 (cache_ttl 초, 0이면 미사용)
+    - 빈 결과는 캐시하지 않음 (다음 호출에서 다시 검색)
+    """
     if not api_key:
         raise RuntimeError("TAVILY_API_KEY is required for web search")
 
@@ -39,10 +58,31 @@ def search_tavily(
         payload["exclude_domains"] = exclude_domains
     payload.update({k: v for k, v in kwargs.items() if v is not None})
 
-    r = requests.post(f"{TAVILY_BASE}/search", headers=_headers(api_key), json=payload, timeout=timeout)
-    r.raise_for_status()
-    data = r.json()
-    return data.get("results", []) or []
+    def fetch() -> List[Dict[str, Any]]:
+        r = http.post(f"{TAVILY_BASE}/search", headers=_headers(api_key), json=payload, timeout=timeout)
+        r.raise_for_status()
+        return r.json().get("results", []) or []
+
+    if cache_ttl <= 0:
+        return fetch()
+
+    def fetch_nonempty() -> List[Dict[str, Any]]:
+        results = fetch()
+        if not results:
+            raise _EmptyResults()
+        return results
+
+    cache = get_cache(CACHE_PATH)
+    try:
+        return cache.call(make_key("tavily.search", payload), fetch_nonempty,
+                          ttl=cache_ttl, stale_ttl=cache_ttl * SEARCH_STALE_FACTOR, dest="tavily")
+    except _EmptyResults:
+        return []
+
+
+def cache_stats() -> Dict[str, Any]:
+    """검색 캐시 적중률/크기 (get_cache(CACHE_PATH).stats())"""
+    return get_cache(CACHE_PATH).stats()
 
 def extract_url(url: str) -> str:
     """URL을 정리(normalize)해서 반환 (추적 파라미터/fragment 제거)"""
@@ -69,7 +109,7 @@ def extract_text(url: str, api_key: Optional[str], timeout: int = 20) -> str:
         raise RuntimeError("TAVILY_API_KEY is required for extract")
     try:
         payload = {"url": url}
-        r = requests.post(f"{TAVILY_BASE}/extract", headers=_headers(api_key), json=payload, timeout=timeout)
+        r = http.post(f"{TAVILY_BASE}/extract", headers=_headers(api_key), json=payload, timeout=timeout)
         r.raise_for_status()
         data = r.json()
         # 다양한 응답 스키마를 방어적으로 지원
@@ -86,3 +126,43 @@ def extract_text(url: str, api_key: Optional[str], timeout: int = 20) -> str:
     except Exception:
         pass
     return ""
+
+
+def extract_texts(urls: List[str], api_key: Optional[str], timeout: int = 20) -> Dict[str, str]:
+    """
+    여러 URL 본문을 /extract 한 번(urls 배열)으로 추출 → {url: 본문}
+    - 응답 results[].url 기준으로 매칭, 받지 못한 URL은 빠짐 (실패 시 빈 dict)
+    - timeout: 요청 전체 기한(초) — 소켓 timeout은 읽기 간격마다 새로 적용되므로 본문을 조금씩 흘려보내는
+      느린 응답은 더 오래 걸릴 수 있음 → 공용 실행기("tavily")로 보내고 기한까지만 기다림 (초과 시 빈 dict)
+    """
+    if not api_key:
+        raise RuntimeError("TAVILY_API_KEY is required for extract")
+    urls = [u for u in dict.fromkeys(urls) if u]
+    if not urls:
+        return {}
+    def fetch() -> Any:
+        r = http.post(f"{TAVILY_BASE}/extract", headers=_headers(api_key), json={"urls": urls}, timeout=timeout)
+        r.raise_for_status()
+        return r.json()
+
+    future = submit("tavily", fetch)
+    try:
+        data = future.result(timeout=timeout)
+    except Exception:  # 기한 초과/네트워크 오류 → 본문 없이 진행 (늦게 끝난 응답은 버림)
+        future.cancel()
+        return {}
+    out: Dict[str, str] = {}
+    for item in (data.get("results") or []) if isinstance(data, dict) else []:
+        if not isinstance(item, dict):
+            continue
+        text = item.get("raw_content") or item.get("content") or ""
+        if isinstance(text, str) and text and item.get("url"):
+            out[item["url"]] = text
+    # 응답 URL이 정규화돼 돌아오는 경우 → 순서로 보정
+    if len(out) < len(urls) and len(data.get("results") or []) == len(urls):
+        for u, item in zip(urls, data["results"]):
+            if u not in out and isinstance(item, dict):
+                text = item.get("raw_content") or item.get("content") or ""
+                if isinstance(text, str) and text:
+                    out[u] = text
+    return out
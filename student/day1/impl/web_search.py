@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
-from typing import List, Dict, Any, Tuple, Callable
-import re, os
-from .tavily_client import search_tavily, extract_url, extract_text
+from typing import List, Dict, Any, Tuple, Callable, Optional
+import re, os, time, hashlib
+from student.common.disk_cache import get_cache, make_key
+from student.common.executor import submit
+from .tavily_client import search_tavily, extract_url, extract_texts
+from .symbols import resolve_tickers
 
 PROFILE_DOMAINS = [
     "wikipedia.org", "en.wikipedia.org", "ko.wikipedia.org",
@@ -11,13 +14,17 @@ PROFILE_DOMAINS = [
     "alphasquare.co.kr",
 ]
 
+PROFILE_CACHE_TTL = 7 * 86400.0   # 기업 개요 검색은 거의 바뀌지 않으므로 길게 캐시
+
 def looks_like_ticker(q: str) -> bool:
-    return bool(re.search(r"\b([A-Z]{1,5}(?:\.[A-Z]{2,4})?|\d{6}(?:\.[A-Z]{2,4})?)\b", q))
+    """질의에 종목 사전으로 해석되는 코드/회사명이 있는지 (AI, PDF 같은 약어로 기업 개요 검색을 띄우지 않음)"""
+    return bool(resolve_tickers(q))
 
 def search_company_profile(query: str, api_key: str, topk: int = 6, timeout: int = 20) -> List[Dict[str, Any]]:
     q = f"{query} company profile overview 기업 개요 회사 소개 무엇을 하는 회사"
     # ⬇ 원문 발췌를 렌더에서 쓰고 싶다면 include_raw_content=True를 켜도 좋음
-    results = search_tavily(q, api_key, top_k=topk, timeout=timeout, include_raw_content=True)
+    results = search_tavily(q, api_key, top_k=topk, timeout=timeout, include_raw_content=True,
+                            cache_ttl=PROFILE_CACHE_TTL)
     def score(r: Dict[str, Any]) -> Tuple[int, float]:
         dom = (r.get("source") or r.get("url") or "").lower()
         prio = 0
@@ -28,28 +35,143 @@ def search_company_profile(query: str, api_key: str, topk: int = 6, timeout: int
         return (-prio, -float(r.get("score", 0.0)))
     return sorted(results, key=score)
 
-def extract_and_summarize_profile(
+PROFILE_DOCS = 2          # 요약에 쓰는 상위 문서 수
+PROFILE_MIN_CHARS = 500   # 이보다 짧은 본문은 근거로 쓰지 않음
+PROFILE_MAX_CHARS = 6000  # 문서당 본문 상한
+
+def profile_texts(
     urls: List[str],
     api_key: str,
-    summarizer: Callable[[str], str],
-    max_chars: int = 6000
-) -> str:
-    texts: List[str] = []
-    for u in urls[:2]:
+    results: Optional[List[Dict[str, Any]]] = None,
+    max_chars: int = PROFILE_MAX_CHARS,
+    timeout: int = 20,
+) -> List[Tuple[str, str]]:
+    """
+    상위 PROFILE_DOCS개 URL → [(정리된 URL, 본문)]
+    - 검색 결과(results)의 raw_content가 충분히 길면 그대로 사용 (추가 호출 없음)
+    - 본문이 없거나 짧은 URL만 /extract 한 번(배치)으로 보충, timeout 안에 못 받으면 제외
+    """
+    raw = {extract_url(r.get("url", "")): (r.get("raw_content") or "") for r in (results or [])}
+    picked = [extract_url(u) for u in urls[:PROFILE_DOCS]]
+    missing = [u for u in picked if len(raw.get(u, "")) < PROFILE_MIN_CHARS]
+    if missing:
         try:
-            clean = extract_url(u)  # ← URL 정리(인자 1개)
-            t = extract_text(clean, api_key)[:max_chars]  # ← 본문 추출
-            if len(t) > 500:  # 최소 분량 보장
-                texts.append(f"[{clean}]\n{t}")
+            raw.update(extract_texts(missing, api_key, timeout=timeout))
         except Exception:
-            continue
-    if not texts:
+            pass
+    texts = [(u, raw.get(u, "")[:max_chars]) for u in picked]
+    return [(u, t) for u, t in texts if len(t) > PROFILE_MIN_CHARS]
+
+# ---------- 기업 개요 요약 (캐시 + map-reduce) ----------
+SUMMARY_CACHE_PATH = os.getenv("DAY1_SUMMARY_CACHE_PATH", "data/cache/summary.sqlite")
+SUMMARY_CACHE_TTL = 7 * 86400.0   # 같은 본문 + 같은 프롬프트 버전이면 LLM 재호출 없이 재사용
+PROMPT_VERSION = "profile-v1"     # 프롬프트 문구를 바꾸면 올려서 기존 요약 무효화
+CHUNK_CHARS = 3000                # map 단계 조각 크기
+# 본문 합이 이보다 길면 조각별 병렬 요약 후 합침 — 한 조각에 들어가는 입력만 한 번에 요약
+MAP_REDUCE_MIN_CHARS = CHUNK_CHARS
+CHUNK_TIMEOUT = 30.0              # map 단계 전체 대기 상한(초), 못 받은 조각은 빼고 합침
+
+PROFILE_PROMPT = (
+    "다음 자료를 근거로 '기업 개요'를 한국어 5~7줄로 요약하세요.\n"
+    "- 핵심 사업/제품, 수익원, 주요 시장/고객, 차별점, 최근 이슈(있으면)\n"
+    "- 과도한 재무 디테일은 피하고, 문장당 20~30자 이내로 간결하게.\n\n"
+)
+CHUNK_PROMPT = (
+    "다음 발췌에서 기업 개요에 필요한 사실(사업/제품, 수익원, 시장/고객, 차별점, 최근 이슈)만 "
+    "한국어 3~5개 항목으로 뽑으세요. 없으면 빈 응답.\n\n"
+)
+
+
+class _EmptySummary(Exception):
+    """요약 실패(빈 응답) — 캐시에 남기지 않기 위해 예외로 전달"""
+
+
+def _digest(*parts: str) -> str:
+    h = hashlib.sha1()
+    for p in parts:
+        h.update(p.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _summary_key(namespace: str, sources: List[str]) -> str:
+    """원문 해시들 + PROMPT_VERSION → 캐시 키"""
+    return make_key(namespace, {"v": PROMPT_VERSION, "src": [_digest(s) for s in sources]})
+
+
+def _cached_summary(key: str, prompt: str, summarizer: Callable[[str], str]) -> str:
+    """key가 캐시에 있으면 그대로, 없으면 summarizer(prompt) 저장 후 반환 (빈 결과는 캐시하지 않음)"""
+    def run() -> str:
+        out = summarizer(prompt)
+        if not out:
+            raise _EmptySummary()
+        return out
+
+    try:
+        return get_cache(SUMMARY_CACHE_PATH).call(key, run, ttl=SUMMARY_CACHE_TTL)
+    except _EmptySummary:
         return ""
-    joined = "\n\n---\n\n".join(texts)
-    prompt = (
-        "다음 자료를 근거로 '기업 개요'를 한국어 5~7줄로 요약하세요.\n"
-        "- 핵심 사업/제품, 수익원, 주요 시장/고객, 차별점, 최근 이슈(있으면)\n"
-        "- 과도한 재무 디테일은 피하고, 문장당 20~30자 이내로 간결하게.\n\n"
-        f"{joined}\n"
-    )
-    return summarizer(prompt)
+
+
+def _chunks(text: str, size: int = CHUNK_CHARS) -> List[str]:
+    """size 이하 조각으로 분할 (가능하면 줄바꿈 경계에서 자름)"""
+    out: List[str] = []
+    while len(text) > size:
+        cut = text.rfind("\n", size // 2, size)
+        cut = cut if cut > 0 else size
+        out.append(text[:cut])
+        text = text[cut:].lstrip()
+    if text:
+        out.append(text)
+    return out
+
+
+def summarize_profile(docs: List[Tuple[str, str]], summarizer: Callable[[str], str]) -> str:
+    """
+    [(URL, 본문)] → 기업 개요 요약
+    - 본문 합이 MAP_REDUCE_MIN_CHARS 이하: 한 번에 요약 (기존 방식)
+    - 그보다 길면: 조각별 사실 추출을 공용 실행기("llm")로 병렬 수행 → 추출 결과만 모아 최종 요약
+      (CHUNK_TIMEOUT 안에 끝나지 않은 조각은 취소하고 제외)
+    - 조각 요약/최종 요약 모두 원문 해시 + PROMPT_VERSION 키로 캐시 → 같은 기업 재조회 시 LLM 호출 0회
+    """
+    if not docs:
+        return ""
+    sources = [f"[{u}]\n{t}" for u, t in docs]
+    key = _summary_key("day1.profile", sources)
+    if sum(len(t) for _, t in docs) <= MAP_REDUCE_MIN_CHARS:
+        joined = "\n\n---\n\n".join(sources)
+        return _cached_summary(key, f"{PROFILE_PROMPT}{joined}\n", summarizer)
+
+    # 최종 요약이 이미 캐시돼 있으면 map 단계도 건너뜀
+    found = get_cache(SUMMARY_CACHE_PATH).get(key)
+    if found is not None and found[1] < SUMMARY_CACHE_TTL:
+        return found[0]
+
+    pieces = [(u, f"[{u}]\n{c}") for u, t in docs for c in _chunks(t)]
+    futures = [submit("llm", _cached_summary, _summary_key("day1.profile.chunk", [p]),
+                      f"{CHUNK_PROMPT}{p}\n", summarizer) for _, p in pieces]
+    notes: List[str] = []
+    deadline = time.monotonic() + CHUNK_TIMEOUT
+    for (u, _), future in zip(pieces, futures):
+        try:
+            note = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except Exception:  # 시간 초과/요약 실패 조각은 제외
+            future.cancel()
+            note = ""
+        if note:
+            notes.append(f"[{u}]\n{note}")
+    if not notes:
+        return ""
+    joined = "\n\n---\n\n".join(notes)
+    return _cached_summary(key, f"{PROFILE_PROMPT}{joined}\n", summarizer)
+
+
+def extract_and_summarize_profile(
+    urls: List[str],
+    api_key: str,
+    summarizer: Callable[[str], str],
+    max_chars: int = PROFILE_MAX_CHARS,
+    results: Optional[List[Dict[str, Any]]] = None,
+    timeout: int = 20,
+) -> str:
+    return summarize_profile(profile_texts(urls, api_key, results, max_chars, timeout), summarizer)
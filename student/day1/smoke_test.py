@@ -39,6 +39,135 @@ from student.day1.impl.web_search import (
     extract_and_summarize_profile,
 )
 
+def _check_resolver() -> bool:
+    """종목 해석기 오프라인 점검 (API 키 불필요) — 일반 단어 오탐 + 점 표기 클래스주"""
+    from student.day1.impl.symbols import resolve_tickers
+    cases = {
+        "메타버스 공모전 추천": [],
+        "파인애플 농장 창업": [],
+        "구글링 하는 법": [],
+        "기아 대책": [],
+        "RFP 작성 AI 도구": [],
+        "BRK.B 주가": ["BRK-B"],
+        "기아 주가": ["000270.KS"],
+        "삼성전자의 실적": ["005930.KS"],
+        "AAPL, MSFT 비교": ["AAPL", "MSFT"],
+    }
+    ok = True
+    for q, want in cases.items():
+        got = resolve_tickers(q)
+        if got != want:
+            print(f"[FAIL] resolve_tickers({q!r}) = {got} (기대 {want})")
+            ok = False
+    if ok:
+        print(f"[OK] 종목 해석 {len(cases)}건 (오탐 없음)")
+    return ok
+
+def _check_quote_cache() -> bool:
+    """시세 캐시 오프라인 점검 — TTL 안 fresh, TTL 직후 stale + 백그라운드 갱신, 유예 지나면 재조회, 오류는 캐시 안 함"""
+    import time
+    from datetime import datetime, timedelta, timezone
+    from student.day1.impl.quote_cache import (QuoteCache, ttl_for, OPEN_TTL, STALE_GRACE, CLOSED_TTL_MAX)
+
+    now = [1000.0]
+    calls = []
+    def fetch(symbols, timeout):
+        calls.append(list(symbols))
+        return [{"symbol": s, "error": "없음"} if s.startswith("ERR") else
+                {"symbol": s, "price": float(len(calls)), "currency": "JPY"} for s in symbols]
+    cache = QuoteCache(fetch, clock=lambda: now[0])
+    sym = "7203.T"   # 세션을 모르는 거래소 → 시각과 무관하게 OPEN_TTL
+
+    problems = []
+    first = cache.get([sym])[0]
+    now[0] += OPEN_TTL / 2
+    if cache.get([sym])[0].get("cached") != "fresh" or len(calls) != 1 or "cached" in first:
+        problems.append("TTL 안 재조회")
+    now[0] += OPEN_TTL
+    if cache.get([sym])[0].get("cached") != "stale":
+        problems.append("TTL 직후 stale 값 미반환")
+    for _ in range(100):   # 백그라운드 갱신 대기
+        if len(calls) == 2 and sym not in cache._refreshing:
+            break
+        time.sleep(0.02)
+    got = cache.get([sym])[0]
+    if len(calls) != 2 or got.get("cached") != "fresh" or got.get("price") != 2.0:
+        problems.append("stale 갱신 결과 미반영")
+    now[0] += OPEN_TTL + STALE_GRACE + 1
+    if "cached" in cache.get([sym])[0] or len(calls) != 3:
+        problems.append("유예 경과 후 동기 재조회 안 함")
+    cache.get(["ERR.T"]); cache.get(["ERR.T"])
+    if calls[-2:] != [["ERR.T"], ["ERR.T"]]:
+        problems.append("오류 항목이 캐시됨")
+
+    kst = timezone(timedelta(hours=9))
+    if ttl_for("005930.KS", datetime(2026, 10, 19, 10, 0, tzinfo=kst).timestamp()) != OPEN_TTL:
+        problems.append("KRX 장중 TTL")
+    if ttl_for("005930.KS", datetime(2026, 10, 24, 12, 0, tzinfo=kst).timestamp()) != CLOSED_TTL_MAX:
+        problems.append("KRX 주말 TTL 상한")
+    if problems:
+        print("[FAIL] QuoteCache:", ", ".join(problems))
+        return False
+    print(f"[OK] 시세 캐시 TTL/stale (fetch {len(calls)}회)")
+    return True
+
+def _check_disk_cache() -> bool:
+    """디스크 캐시 오프라인 점검 — TTL 적중/만료, stale 즉시 반환 + 공용 실행기 갱신, 예외 미저장, 크기 상한"""
+    import time, tempfile, shutil
+    from student.common.disk_cache import DiskCache, make_key
+
+    tmp = tempfile.mkdtemp(prefix="day1_cache_")
+    try:
+        cache = DiskCache(os.path.join(tmp, "c.sqlite"))
+        calls = []
+        def fn():
+            calls.append(1)
+            return {"n": len(calls)}
+
+        problems = []
+        if make_key("t", {"a": 1, "b": [1, 2]}) != make_key("t", {"b": [1, 2], "a": 1}):
+            problems.append("make_key가 키 순서에 의존")
+        if cache.call("k", fn, ttl=60) != {"n": 1} or cache.call("k", fn, ttl=60) != {"n": 1}:
+            problems.append("TTL 안 재호출")
+        time.sleep(0.3)
+        if cache.call("k", fn, ttl=0.2) != {"n": 2}:
+            problems.append("TTL 만료 후 캐시값 반환")
+        time.sleep(0.3)
+        if cache.call("k", fn, ttl=0.2, stale_ttl=60, dest="tavily") != {"n": 2}:
+            problems.append("stale 구간에서 즉시 반환 안 함")
+        for _ in range(100):   # 백그라운드 갱신 대기
+            if (cache.get("k") or [None])[0] == {"n": 3}:
+                break
+            time.sleep(0.02)
+        if (cache.get("k") or [None])[0] != {"n": 3}:
+            problems.append("stale 갱신 결과 미저장")
+        def boom():
+            raise RuntimeError("네트워크 오류")
+        try:
+            cache.call("err", boom, ttl=60)
+        except RuntimeError:
+            pass
+        if cache.get("err") is not None:
+            problems.append("예외가 캐시됨")
+        if cache.call("k", fn, ttl=0) != {"n": len(calls)}:
+            problems.append("ttl=0 인데 캐시 사용")
+        s = cache.stats()
+        if s["hits"] != 1 or s["stale_hits"] != 1 or s["misses"] != 3:
+            problems.append(f"stats {s}")
+
+        small = DiskCache(os.path.join(tmp, "small.sqlite"), max_bytes=400)
+        for i in range(20):
+            small.set(f"k{i}", "x" * 40)
+        if small.stats()["bytes"] > 400 or small.get("k19") is None or small.get("k0") is not None:
+            problems.append("크기 상한 LRU 삭제")
+        if problems:
+            print("[FAIL] DiskCache:", ", ".join(problems))
+            return False
+        print(f"[OK] 디스크 캐시 TTL/stale/LRU (hit_rate={s['hit_rate']})")
+        return True
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
 def _check_keys() -> bool:
     ok = True
     if not os.getenv("TAVILY_API_KEY"):
@@ -72,6 +201,9 @@ def _fake_summarizer(prompt: str) -> str:
     return prompt[-300:] if len(prompt) > 300 else prompt
 
 def main():
+    offline = [_check_resolver(), _check_quote_cache(), _check_disk_cache()]   # 전부 실행 후 판정
+    if not all(offline):
+        sys.exit(1)
     if not _check_keys():
         sys.exit(2)
 
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Day2 이진 양자화 인덱스 (선택 레이아웃)
+- 1단계: 부호 양자화 1비트 벡터(차원당 1bit)를 faiss.IndexBinaryFlat 에 두고 해밍 거리로 넉넉한 후보 풀 검색
+  → float32 IndexFlatIP 대비 1단계 메모리 1/32
+- 2단계: 후보만 mmap float16 행렬에서 꺼내 질의 벡터와 내적 → _gate가 쓰는 코사인 점수로 재정렬
+- 문서/그래프(docs/, related/)는 기본 레이아웃과 동일, faiss.index 대신 아래 두 파일을 기록
+
+디렉토리 구성 (versions/<vid>/):
+  binary.index       # faiss.IndexBinaryFlat (N × ceil(D/8) 바이트)
+  vectors.f16.npy    # float16 (N, D) — 재점수/증분 갱신용, mmap 로드
+  docs/              # DocStore
+"""
+
+from __future__ import annotations
+import os
+from typing import List, Dict, Any, Tuple, Sequence
+
+import numpy as np
+import faiss
+
+from student.day2.impl.docstore import DocStore
+from student.day2.impl.store import FaissStore
+
+BINARY_INDEX = "binary.index"
+VECTORS_NAME = "vectors.f16.npy"
+RESCORE_FACTOR = 10   # 후보 풀 = top_k * RESCORE_FACTOR
+MIN_POOL = 100
+
+
+def sign_pack(vecs: np.ndarray) -> np.ndarray:
+    """(N, D) 실수 벡터 → (N, ceil(D/8)) uint8 부호 비트 (양수=1)"""
+    vecs = np.asarray(vecs)
+    if vecs.ndim == 1:
+        vecs = vecs[None, :]
+    return np.packbits(vecs > 0, axis=1)
+
+
+def is_binary(index_dir: str) -> bool:
+    return os.path.isfile(os.path.join(index_dir, BINARY_INDEX))
+
+
+class BinaryStore(FaissStore):
+    """FaissStore와 같은 질의 인터페이스(search_rows/hit/search/attributes), 검색만 2단계로 수행"""
+
+    def __init__(self, dim: int, index_path: str, docs_path: str):
+        super().__init__(dim, index_path, docs_path)
+        self.index = faiss.IndexBinaryFlat(((dim + 7) // 8) * 8)
+        self.vectors: np.ndarray = np.zeros((0, dim), dtype="float16")
+
+    @classmethod
+    def load(cls, index_dir: str, docs_path: str = ""):
+        vectors = np.load(os.path.join(index_dir, VECTORS_NAME), mmap_mode="r")
+        store = cls(int(vectors.shape[1]), os.path.join(index_dir, BINARY_INDEX),
+                    docs_path or os.path.join(index_dir, "docs"))
+        store.index = faiss.read_index_binary(store.index_path)
+        store.vectors = vectors
+        store.docs = DocStore.open(store.docs_path)
+        return store
+
+    def search_rows(self, query_vec: np.ndarray, top_k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """해밍 후보 풀 → float16 재점수 → (코사인 scores, rows) top_k"""
+        q = np.asarray(query_vec, dtype="float32").reshape(-1)
+        n = int(self.index.ntotal)
+        if n == 0:
+            return np.zeros(0, dtype="float32"), np.zeros(0, dtype="int64")
+        pool = min(n, max(top_k * RESCORE_FACTOR, MIN_POOL))
+        _, I = self.index.search(sign_pack(q), pool)
+        cand = I[0][I[0] >= 0].astype("int64")
+        cand.sort()  # mmap 순차 접근
+        scores = np.asarray(self.vectors[cand], dtype="float32") @ q
+        top = np.argsort(-scores, kind="stable")[:top_k]
+        return scores[top], cand[top]
+
+
+# ---------- BuildConfig.write_index / read_index ----------
+def write_binary(corpus: List[Dict[str, Any]], vecs: np.ndarray, out_dir: str) -> int:
+    """이진 레이아웃 기록 → 저장된 벡터 수"""
+    os.makedirs(out_dir, exist_ok=True)
+    dim = int(vecs.shape[1])
+    index = faiss.IndexBinaryFlat(((dim + 7) // 8) * 8)
+    if len(vecs):
+        index.add(sign_pack(vecs))
+    faiss.write_index_binary(index, os.path.join(out_dir, BINARY_INDEX))
+    np.save(os.path.join(out_dir, VECTORS_NAME), np.asarray(vecs, dtype="float16"))
+    DocStore.write(corpus, os.path.join(out_dir, "docs"))
+    return int(index.ntotal)
+
+
+def read_binary(index_dir: str) -> Tuple[Sequence[Dict[str, Any]], np.ndarray]:
+    """write_binary의 역: (docs, float32 vecs) — float16 왕복이라 증분 갱신 시 재사용 벡터는 근사값"""
+    store = BinaryStore.load(index_dir)
+    return store.docs, np.asarray(store.vectors, dtype="float32")
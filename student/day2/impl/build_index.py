@@ -1,67 +1,51 @@
 # -*- coding: utf-8 -*-
 """
 Day2 인덱싱 엔트리포인트
-- 목표: 코퍼스 생성 → 임베딩 → FAISS 저장 + docs.jsonl 저장
+- 목표: 코퍼스 생성 → 임베딩 → FAISS 저장 + 컬럼형 docs/ 저장
+- 실제 단계(discover → … → persist)와 계측은 student.day2.impl.pipeline 이 담당, 여기서는 설정만 지정
 """
 
-import os, argparse, numpy as np
-from typing import List
+import os, argparse
+from dataclasses import replace
+from typing import List, Dict, Any
 
-from student.day2.impl.ingest import build_corpus, save_docs_jsonl
-from student.day2.impl.embeddings import Embeddings
-from student.day2.impl.store import FaissStore  # 제공됨
+from student.day2.impl.ingest import DOC_PATTERNS, extract_file, chunk_document_parents
+from student.day2.impl.pipeline import BuildConfig, run_build
+from student.day2.impl.related import build_related
+from student.day2.impl.binary import write_binary, read_binary
 
+DAY2_CONFIG = BuildConfig(
+    name="day2",
+    patterns=DOC_PATTERNS,          # txt/md/pdf
+    extract=extract_file,
+    to_items=chunk_document_parents,  # 검색은 400자 자식 청크, 컨텍스트는 2000자 부모 창
+    default_index_dir="indices/day2",
+    post_index=build_related,       # 인접/의미 관련 구절 그래프 (Day2Agent 컨텍스트 확장용)
+)
 
-def build_index(paths: List[str], index_dir: str, model: str | None = None, batch_size: int = 128):
-    """
-    절차:
-      1) corpus = build_corpus(paths)
-         - [{"id":..., "text":..., "meta":{...}}, ...]
-      2) texts = [item["text"] for item in corpus]
-      3) emb = Embeddings(model=model, batch_size=batch_size)
-         vecs = emb.encode(texts)  # (N, D) L2 정규화된 np.ndarray
-      4) index_path = os.path.join(index_dir, "faiss.index")
-         docs_path  = os.path.join(index_dir, "docs.jsonl")
-      5) store = FaissStore(dim=vecs.shape[1], index_path=index_path, docs_path=docs_path)
-         store.add(vecs, corpus); store.save()
-      6) save_docs_jsonl(corpus, docs_path)
-    """
-    # ----------------------------------------------------------------------------
-    # TODO[DAY2-I-01] 구현 지침
-    #  - corpus = build_corpus(paths)
-    #  - texts = [...]
-    #  - emb = Embeddings(model, batch_size)
-    #  - vecs = emb.encode(texts)
-    #  - os.makedirs(index_dir, exist_ok=True)
-    #  - store = FaissStore(...); store.add(...); store.save()
-    #  - save_docs_jsonl(corpus, docs_path)
-    # ----------------------------------------------------------------------------
-    corpus = build_corpus(paths)
-    if len(corpus) == 0:
-      raise ValueError("인덱싱할 문서가 없습니다.")
+# 대용량 코퍼스용: 1비트 해밍 1단계 + float16 mmap 재점수 (binary.py)
+DAY2_BINARY_CONFIG = replace(DAY2_CONFIG, name="day2-binary", write_index=write_binary, read_index=read_binary)
 
-    texts = [item["text"] for item in corpus]
 
-    emb = Embeddings(model=model, batch_size=batch_size)
-    vecs = emb.encode(texts)
-
-    os.makedirs(index_dir, exist_ok=True)
-    index_path = os.path.join(index_dir, "faiss.index")
-    docs_path = os.path.join(index_dir, "docs.jsonl")
-
-    store = FaissStore(dim=vecs.shape[1], index_path=index_path, docs_path=docs_path)
-    store.add(vecs, corpus)
-    store.save()
+def build_index(paths: List[str], index_dir: str, model: str | None = None, batch_size: int = 128,
+                binary: bool = False) -> Dict[str, Any]:
+    """
+    절차(run_build):
+      discover → extract → clean → chunk → dedup(meta.hash) → embed → index → persist
+    반환: 빌드 리포트 dict (<index_dir>/build_report.json 에도 저장)
+    - binary=True: faiss.index 대신 이진 인덱스 + float16 벡터로 기록 (DAY2_BINARY_CONFIG)
+    """
+    config = DAY2_BINARY_CONFIG if binary else DAY2_CONFIG
+    return run_build(paths, index_dir, config, model=model, batch_size=batch_size)
 
-    save_docs_jsonl(corpus, docs_path)
-   
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument("--paths", nargs="+", required=True)
-    ap.add_argument("--index_dir", default="indices/day2")
+    ap.add_argument("--index_dir", default=DAY2_CONFIG.default_index_dir)
     ap.add_argument("--model", default=None)
     ap.add_argument("--batch_size", type=int, default=128)
+    ap.add_argument("--binary", action="store_true", help="1비트 해밍 검색 + float16 재점수 레이아웃")
     args = ap.parse_args()
 
     # ----------------------------------------------------------------------------
@@ -76,6 +60,7 @@ if __name__ == "__main__":
         index_dir=args.index_dir,
         model=args.model,
         batch_size=args.batch_size,
+        binary=args.binary,
     )
 
     print(f"✅ 인덱싱 완료! 저장 경로: {args.index_dir}")
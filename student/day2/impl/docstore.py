@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+컬럼형 문서 저장소 (docs.jsonl 대체)
+- 목표: id/text/meta를 NumPy 배열 컬럼으로 한 번만 쓰고, np.load(mmap_mode="r")로 즉시 로드
+- 행 번호로 임의 접근(store.docs[idx])이 가능한 Sequence 인터페이스 유지
+
+디렉토리 구성 (<index_dir>/docs/):
+  manifest.json                  # 행 수 + 컬럼별 인코딩
+  id.bytes.npy / id.offsets.npy  # "str": utf-8 바이트 blob(uint8) + 경계 offsets(int64)
+  meta.chunk.npy                 # "int": int64 컬럼
+  meta.path.codes.npy            # "dict": 고유값 테이블 참조 코드(int32, -1=없음)
+  meta.path.values.bytes.npy ... # 고유값(JSON 문자열) 테이블 — Day5 meta.fields 같은 반복 레코드는 한 번만 저장
+"""
+
+from __future__ import annotations
+import os, json
+from collections.abc import Sequence
+from typing import List, Dict, Any, Iterable
+
+import numpy as np
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+
+
+# ---------- 인코딩 헬퍼 ----------
+def _pack_strings(values: Iterable[str]):
+    """문자열 리스트 → (uint8 blob, int64 offsets[N+1])"""
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype="int64")
+    if encoded:
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+    blob = np.frombuffer(b"".join(encoded), dtype="uint8")
+    return blob, offsets
+
+
+def _save_strings(root: str, name: str, values: Iterable[str]):
+    blob, offsets = _pack_strings(values)
+    np.save(os.path.join(root, f"{name}.bytes.npy"), blob)
+    np.save(os.path.join(root, f"{name}.offsets.npy"), offsets)
+
+
+def _load_strings(root: str, name: str, mmap: bool):
+    mode = "r" if mmap else None
+    blob = np.load(os.path.join(root, f"{name}.bytes.npy"), mmap_mode=mode)
+    offsets = np.load(os.path.join(root, f"{name}.offsets.npy"), mmap_mode=mode)
+    return blob, offsets
+
+
+def _is_int(v: Any) -> bool:
+    return isinstance(v, (int, np.integer)) and not isinstance(v, bool)
+
+
+def _choose_kind(values: List[Any]) -> str:
+    """
+    meta 키별 인코딩 선택
+    - 모든 행이 정수 → "int"
+    - 모든 행이 문자열이고 대부분 고유(해시 등) → "str"
+    - 그 외(경로/레코드 등 반복 값, 결측 포함) → "dict"
+    """
+    if all(_is_int(v) for v in values):
+        return "int"
+    if all(isinstance(v, str) for v in values) and len(set(values)) * 2 > len(values):
+        return "str"
+    return "dict"
+
+
+_MISSING = object()
+
+
+# ---------- 저장소 ----------
+class DocStore(Sequence):
+    def __init__(self, root: str, manifest: Dict[str, Any], mmap: bool = True):
+        self.root = root
+        self.manifest = manifest
+        self._n = int(manifest["count"])
+        self._cols: Dict[str, Any] = {}
+        self._values: Dict[str, List[Any]] = {}  # dict 컬럼 고유값 디코드 캐시
+        mode = "r" if mmap else None
+        for name, kind in manifest["columns"].items():
+            if kind == "str":
+                self._cols[name] = _load_strings(root, name, mmap)
+            elif kind == "int":
+                self._cols[name] = np.load(os.path.join(root, f"{name}.npy"), mmap_mode=mode)
+            elif kind == "dict":
+                codes = np.load(os.path.join(root, f"{name}.codes.npy"), mmap_mode=mode)
+                self._cols[name] = (codes, _load_strings(root, f"{name}.values", mmap))
+            else:
+                raise ValueError(f"알 수 없는 컬럼 인코딩: {name}={kind}")
+
+    # ---------- Write ----------
+    @staticmethod
+    def write(items: Sequence[Dict[str, Any]], root: str) -> None:
+        """
+        items: [{"id":..., "text":..., "meta":{...}}, ...] → root/ 아래 컬럼 파일 저장(한 번만 씀)
+        """
+        os.makedirs(root, exist_ok=True)
+        columns: Dict[str, str] = {"id": "str", "text": "str"}
+        _save_strings(root, "id", (str(it["id"]) for it in items))
+        _save_strings(root, "text", (it.get("text") or "" for it in items))
+
+        metas = [it.get("meta") or {} for it in items]
+        keys: List[str] = []
+        for m in metas:
+            for k in m:
+                if k not in keys:
+                    keys.append(k)
+
+        for k in keys:
+            name = f"meta.{k}"
+            values = [m.get(k, _MISSING) for m in metas]
+            kind = "dict" if any(v is _MISSING for v in values) else _choose_kind(values)
+            columns[name] = kind
+            if kind == "int":
+                np.save(os.path.join(root, f"{name}.npy"), np.asarray(values, dtype="int64"))
+            elif kind == "str":
+                _save_strings(root, name, values)
+            else:
+                table: Dict[str, int] = {}
+                codes = np.full(len(values), -1, dtype="int32")
+                for i, v in enumerate(values):
+                    if v is _MISSING:
+                        continue
+                    key = json.dumps(v, ensure_ascii=False, sort_keys=True, default=str)
+                    codes[i] = table.setdefault(key, len(table))
+                np.save(os.path.join(root, f"{name}.codes.npy"), codes)
+                _save_strings(root, f"{name}.values", list(table))
+
+        manifest = {"format": FORMAT_VERSION, "count": len(items), "columns": columns}
+        with open(os.path.join(root, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    # ---------- Load ----------
+    @classmethod
+    def open(cls, root: str, mmap: bool = True) -> "DocStore":
+        with open(os.path.join(root, MANIFEST), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 docs 포맷입니다: {manifest.get('format')}")
+        return cls(root, manifest, mmap=mmap)
+
+    @staticmethod
+    def exists(root: str) -> bool:
+        return os.path.isfile(os.path.join(root, MANIFEST))
+
+    # ---------- Access ----------
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self._n))]
+        i = int(idx)
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(idx)
+        meta: Dict[str, Any] = {}
+        for name in self._cols:
+            if not name.startswith("meta."):
+                continue
+            v = self.get(i, name, _MISSING)
+            if v is not _MISSING:
+                meta[name[5:]] = v
+        return {"id": self.get(i, "id"), "text": self.get(i, "text"), "meta": meta}
+
+    def get(self, i: int, name: str, default: Any = None) -> Any:
+        """행 i의 단일 컬럼 값 (예: get(3, "text"), get(3, "meta.path")). 결측이면 default"""
+        kind = self.manifest["columns"].get(name)
+        if kind is None:
+            return default
+        col = self._cols[name]
+        if kind == "str":
+            blob, offsets = col
+            return bytes(blob[offsets[i]:offsets[i + 1]]).decode("utf-8")
+        if kind == "int":
+            return int(col[i])
+        codes, _ = col
+        code = int(codes[i])
+        return default if code < 0 else self._value(name, code)
+
+    def column(self, name: str) -> np.ndarray:
+        """int 컬럼은 값 배열, dict 컬럼은 코드 배열(int32, -1=결측)을 그대로 반환(mmap)"""
+        kind = self.manifest["columns"][name]
+        if kind == "int":
+            return self._cols[name]
+        if kind == "dict":
+            return self._cols[name][0]
+        raise TypeError(f"문자열 컬럼은 배열로 반환하지 않습니다: {name}")
+
+    def _value(self, name: str, code: int) -> Any:
+        cache = self._values.get(name)
+        if cache is None:
+            _, (blob, offsets) = self._cols[name]
+            cache = self._values[name] = [_MISSING] * (len(offsets) - 1)
+        v = cache[code]
+        if v is _MISSING:
+            _, (blob, offsets) = self._cols[name]
+            v = cache[code] = json.loads(bytes(blob[offsets[code]:offsets[code + 1]]).decode("utf-8"))
+        return v
@@ -4,9 +4,11 @@
 """
 
 import re, json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from pathlib import Path
 
+from student.common.dedup import content_hash, group_duplicates
+
 def read_text_file(path: str) -> str:
     """
     안전한 텍스트 로드(utf-8, errors='ignore')
@@ -81,15 +83,98 @@ def chunk_text(text: str, chunk_size: int = 1200, chunk_overlap: int = 200) -> L
     # ----------------------------------------------------------------------------
     # 정답 구현:
     text = clean_text(text)
-    if len(text) <= chunk_size:
-        return [text]
-    chunks: List[str] = []
+    return [text[s:e] for s, e in chunk_spans(len(text), chunk_size, chunk_overlap)]
+
+
+def chunk_spans(n: int, chunk_size: int = 1200, chunk_overlap: int = 200) -> List[Tuple[int, int]]:
+    """
+    길이 n 텍스트의 청크 경계 [(start, end), ...] — chunk_text와 같은 슬라이딩 윈도우
+    (meta.start/end로 저장해 컨텍스트 패킹 시 겹치는 청크를 원문 구간으로 다시 합침)
+    """
+    if n <= chunk_size:
+        return [(0, n)]
+    spans: List[Tuple[int, int]] = []
     start = 0
-    while start < len(text):
-        end = min(len(text), start + chunk_size)
-        chunks.append(text[start:end])
+    while start < n:
+        spans.append((start, min(n, start + chunk_size)))
         start += (chunk_size - chunk_overlap)
-    return chunks
+    return spans
+
+
+DOC_PATTERNS = ("*.txt", "*.md", "*.pdf")
+
+
+def discover_files(paths_or_dir: List[str], patterns: Tuple[str, ...] = DOC_PATTERNS) -> List[str]:
+    """
+    입력 경로(디렉토리/파일) → 파일 경로 리스트
+    - 디렉토리는 patterns로 재귀 탐색, 파일은 그대로 포함
+    """
+    files: List[str] = []
+    for p in paths_or_dir:
+        pp = Path(p)
+        if pp.is_dir():
+            for ext in patterns:
+                files.extend([str(x) for x in pp.rglob(ext)])
+        else:
+            files.append(str(pp))
+    return files
+
+
+def extract_file(fp: str) -> List[Dict[str, Any]]:
+    """
+    파일 1개 → 원문 문서 리스트 [{"path":..., "text":...}] (정제 전)
+    - 지원하지 않는 확장자는 빈 리스트
+    """
+    ext = fp.lower().split(".")[-1]
+    if ext in ("txt", "md"):
+        return [{"path": fp, "text": read_text_file(fp)}]
+    if ext == "pdf":
+        return [{"path": fp, "text": read_pdf_file(fp)}]
+    return []
+
+
+def chunk_document(d: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    정제된 문서 1개 → 코퍼스 아이템 리스트(청크 단위)
+    """
+    text = clean_text(d["text"])
+    items: List[Dict[str, Any]] = []
+    for i, (start, end) in enumerate(chunk_spans(len(text))):
+        ch = text[start:end]
+        cid = f"{d['path']}::chunk_{i:04d}"
+        items.append({"id": cid, "text": ch, "meta": {"path": d["path"], "chunk": i, "hash": content_hash(ch),
+                                                      "start": start, "end": end}})
+    return items
+
+
+PARENT_SIZE = 2000     # 컨텍스트로 돌려줄 부모 창 (겹침 없음)
+CHILD_SIZE = 400       # 검색용 자식 청크
+CHILD_OVERLAP = 80
+
+
+def chunk_document_parents(d: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    정제된 문서 1개 → 자식 청크 아이템 리스트 (부모-자식 검색용)
+    - 문서를 PARENT_SIZE 부모 창으로 나누고, 각 부모 안에서만 CHILD_SIZE 자식 청크를 만듦(자식은 부모를 넘지 않음)
+    - 임베딩/검색은 자식만, meta.parent = {"id","start","end","text"}
+      (docs/ 의 dict 컬럼이라 같은 부모는 한 번만 저장되고 자식은 코드로 참조)
+    """
+    text = clean_text(d["text"])
+    items: List[Dict[str, Any]] = []
+    for p, (ps, pe) in enumerate(chunk_spans(len(text), PARENT_SIZE, 0)):
+        parent = {"id": f"{d['path']}::parent_{p:04d}", "start": ps, "end": pe, "text": text[ps:pe]}
+        last_end = -1
+        for cs, ce in chunk_spans(pe - ps, CHILD_SIZE, CHILD_OVERLAP):
+            start, end = ps + cs, ps + ce
+            if end <= last_end:  # 앞 자식의 겹침 구간에 완전히 포함된 꼬리 조각은 생략
+                continue
+            last_end = end
+            ch = text[start:end]
+            i = len(items)
+            items.append({"id": f"{d['path']}::chunk_{i:04d}", "text": ch,
+                          "meta": {"path": d["path"], "chunk": i, "hash": content_hash(ch),
+                                   "start": start, "end": end, "parent": parent}})
+    return items
 
 
 def load_documents(paths_or_dir: List[str]) -> List[Dict[str, Any]]:
@@ -114,33 +199,18 @@ def load_documents(paths_or_dir: List[str]) -> List[Dict[str, Any]]:
     #  - return docs
     # ----------------------------------------------------------------------------
     # 정답 구현:
-    files: List[str] = []
-    for p in paths_or_dir:
-        pp = Path(p)
-        if pp.is_dir():
-            for ext in ("*.txt", "*.md", "*.pdf"):
-                files.extend([str(x) for x in pp.rglob(ext)])
-        else:
-            files.append(str(pp))
-
     docs: List[Dict[str, Any]] = []
-    for fp in files:
-        ext = fp.lower().split(".")[-1]
-        if ext in ("txt", "md"):
-            raw = read_text_file(fp)
-        elif ext == "pdf":
-            raw = read_pdf_file(fp)
-        else:
-            continue
-        txt = clean_text(raw)
-        docs.append({"path": fp, "text": txt})
+    for fp in discover_files(paths_or_dir):
+        for d in extract_file(fp):
+            docs.append({"path": d["path"], "text": clean_text(d["text"])})
     return docs
 
 
 def build_corpus(paths_or_dir: List[str]) -> List[Dict[str, Any]]:
     """
     문서를 청크 단위로 나눠 코퍼스 생성
-    반환 예: [{"id":"<path>::chunk_0000","text":"...", "meta":{"path":..., "chunk":0}}, ...]
+    반환 예: [{"id":"<path>::chunk_0000","text":"...", "meta":{"path":..., "chunk":0, "hash":"<sha1>", "start":0, "end":1200}}, ...]
+    - meta.hash: content_hash(청크) — build_index에서 동일 텍스트 임베딩을 한 번만 수행
     """
     # ----------------------------------------------------------------------------
     # TODO[DAY2-G-06] 구현 지침
@@ -157,10 +227,7 @@ def build_corpus(paths_or_dir: List[str]) -> List[Dict[str, Any]]:
     docs = load_documents(paths_or_dir)
     corpus: List[Dict[str, Any]] = []
     for d in docs:
-        chunks = chunk_text(d["text"])
-        for i, ch in enumerate(chunks):
-            cid = f"{d['path']}::chunk_{i:04d}"
-            corpus.append({"id": cid, "text": ch, "meta": {"path": d["path"], "chunk": i}})
+        corpus.extend(chunk_document(d))
     return corpus
 
 
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+사전 계산 이웃 테이블 (kNN 그래프)
+- 인덱스의 모든 벡터를 배치 단위 FAISS self-search 한 번으로 top-K 이웃 계산
+- 저장은 (N, K) int32 행 번호 + (N, K) float16 점수 → 행당 K*6 바이트
+- upsert: 이전 테이블과 행 키(id + hash)를 맞춰 바뀐 행만 재검색하고, 나머지 행은 새 행과의 점수만 병합
+
+디렉토리 구성 (<version_dir>/neighbors/ 등):
+  ids.npy      # int32 (N, K), -1 = 없음
+  scores.npy   # float16 (N, K)
+  keys.npy     # 행 키 (다음 upsert 시 행 대응용)
+"""
+
+from __future__ import annotations
+import os
+from typing import List, Dict, Any, Tuple, Optional
+
+import numpy as np
+import faiss
+
+from student.day2.impl.docstore import DocStore
+
+
+class NeighborTable:
+    def __init__(self, ids: np.ndarray, scores: np.ndarray, keys: np.ndarray):
+        self.ids = ids
+        self.scores = scores
+        self.keys = keys
+
+    @property
+    def k(self) -> int:
+        return int(self.ids.shape[1])
+
+    def __len__(self) -> int:
+        return int(self.ids.shape[0])
+
+    def row(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """행 i의 (이웃 행 번호, 점수) — 결측(-1) 제외, 점수 내림차순"""
+        ids, scores = self.ids[i], self.scores[i]
+        keep = ids >= 0
+        return ids[keep].astype("int64"), scores[keep].astype("float32")
+
+    # ---------- Save / Load ----------
+    def save(self, root: str) -> None:
+        os.makedirs(root, exist_ok=True)
+        np.save(os.path.join(root, "ids.npy"), self.ids.astype("int32"))
+        np.save(os.path.join(root, "scores.npy"), self.scores.astype("float16"))
+        np.save(os.path.join(root, "keys.npy"), np.asarray(self.keys, dtype=str))
+
+    @classmethod
+    def load(cls, root: str, mmap: bool = True) -> "NeighborTable":
+        mode = "r" if mmap else None
+        return cls(
+            np.load(os.path.join(root, "ids.npy"), mmap_mode=mode),
+            np.load(os.path.join(root, "scores.npy"), mmap_mode=mode),
+            np.load(os.path.join(root, "keys.npy")),
+        )
+
+    @staticmethod
+    def exists(root: str) -> bool:
+        return os.path.isfile(os.path.join(root, "ids.npy"))
+
+
+def row_keys(docs) -> List[str]:
+    """행 키 = id + meta.hash (같은 키 = 같은 텍스트 = 같은 벡터)"""
+    out = []
+    for i in range(len(docs)):
+        if isinstance(docs, DocStore):  # 필요한 컬럼만 디코드
+            out.append(f"{docs.get(i, 'id')}#{docs.get(i, 'meta.hash', '')}")
+        else:
+            d = docs[i]
+            out.append(f"{d['id']}#{(d.get('meta') or {}).get('hash', '')}")
+    return out
+
+
+def _flat_index(vecs: np.ndarray):
+    index = faiss.IndexFlatIP(vecs.shape[1])
+    index.add(np.ascontiguousarray(vecs, dtype="float32"))
+    return index
+
+
+def _search_excluding_self(index, vecs: np.ndarray, rows: np.ndarray, k: int,
+                           batch_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """rows의 벡터로 index를 k+1개 검색 → 자기 자신을 뺀 (len(rows), k)"""
+    n_all = index.ntotal
+    kk = min(k + 1, n_all)
+    out_i = np.full((len(rows), k), -1, dtype="int64")
+    out_s = np.full((len(rows), k), -np.inf, dtype="float32")
+    for b in range(0, len(rows), batch_size):
+        rb = rows[b:b + batch_size]
+        D, I = index.search(np.ascontiguousarray(vecs[rb], dtype="float32"), kk)
+        self_hit = I == rb[:, None]
+        no_self = ~self_hit.any(axis=1)
+        self_hit[no_self, -1] = True          # 동점 중복 벡터 등으로 자기 자신이 안 보이면 마지막 후보 제거
+        I = I[~self_hit].reshape(len(rb), kk - 1)
+        D = D[~self_hit].reshape(len(rb), kk - 1)
+        m = min(k, kk - 1)
+        out_i[b:b + len(rb), :m] = I[:, :m]
+        out_s[b:b + len(rb), :m] = D[:, :m]
+    out_s[out_i < 0] = -np.inf
+    return out_i, out_s
+
+
+def build_table(vecs: np.ndarray, keys: List[str], k: int = 10, batch_size: int = 1024) -> NeighborTable:
+    """전체 벡터 → 이웃 테이블 (배치 self-search)"""
+    n = len(vecs)
+    index = _flat_index(vecs)
+    ids, scores = _search_excluding_self(index, vecs, np.arange(n, dtype="int64"), k, batch_size)
+    return NeighborTable(ids.astype("int32"), scores.astype("float16"), np.asarray(keys, dtype=str))
+
+
+def upsert_table(prev: Optional[NeighborTable], vecs: np.ndarray, keys: List[str], k: int = 10,
+                 batch_size: int = 1024) -> Tuple[NeighborTable, Dict[str, Any]]:
+    """
+    이전 테이블 + 새 (vecs, keys) → 새 테이블, 통계
+    - 새 행(이전에 없던 키)과 이웃이 삭제된 행만 전체 재검색
+    - 나머지 행은 이전 이웃(행 번호 재매핑) + 새 행과의 내적을 합쳐 top-K 유지 (행렬곱 + 행 단위 정렬)
+    """
+    n = len(vecs)
+    if prev is None or prev.k != k or n == 0:
+        t = build_table(vecs, keys, k, batch_size)
+        return t, {"mode": "full", "rows": n, "recomputed": n}
+
+    old_pos = {key: i for i, key in enumerate(prev.keys.tolist())}
+    new_to_old = np.array([old_pos.get(key, -1) for key in keys], dtype="int64")
+    old_to_new = np.full(len(prev), -1, dtype="int64")
+    matched = new_to_old >= 0
+    old_to_new[new_to_old[matched]] = np.nonzero(matched)[0]
+
+    fresh = np.nonzero(~matched)[0]
+    ids = np.full((n, k), -1, dtype="int64")
+    scores = np.full((n, k), -np.inf, dtype="float32")
+
+    # 이전 이웃 재매핑 (삭제된 이웃이 있으면 dirty → 재검색)
+    carried = np.nonzero(matched)[0]
+    old_ids = np.asarray(prev.ids[new_to_old[carried]], dtype="int64")
+    remapped = np.where(old_ids >= 0, old_to_new[np.maximum(old_ids, 0)], -1)
+    lost = ((old_ids >= 0) & (remapped < 0)).any(axis=1)
+    clean = carried[~lost]
+    ids[clean] = remapped[~lost]
+    scores[clean] = np.asarray(prev.scores[new_to_old[clean]], dtype="float32")
+    scores[ids < 0] = -np.inf
+
+    dirty = np.concatenate([fresh, carried[lost]])
+    index = _flat_index(vecs)
+    if len(dirty):
+        di, ds = _search_excluding_self(index, vecs, dirty, k, batch_size)
+        ids[dirty], scores[dirty] = di, ds
+
+    # clean 행 ← 새 행과의 점수 병합
+    if len(fresh) and len(clean):
+        fv = np.ascontiguousarray(vecs[fresh], dtype="float32")
+        for b in range(0, len(clean), batch_size):
+            cb = clean[b:b + batch_size]
+            sim = np.asarray(vecs[cb], dtype="float32") @ fv.T               # (B, F)
+            cand_i = np.concatenate([ids[cb], np.broadcast_to(fresh, sim.shape)], axis=1)
+            cand_s = np.concatenate([scores[cb], sim], axis=1)
+            top = np.argsort(-cand_s, axis=1, kind="stable")[:, :k]
+            ids[cb] = np.take_along_axis(cand_i, top, axis=1)
+            scores[cb] = np.take_along_axis(cand_s, top, axis=1)
+
+    ids[~np.isfinite(scores)] = -1
+    table = NeighborTable(ids.astype("int32"), scores.astype("float16"), np.asarray(keys, dtype=str))
+    return table, {"mode": "upsert", "rows": n, "recomputed": int(len(dirty)),
+                   "fresh": int(len(fresh)), "removed": int((old_to_new < 0).sum())}
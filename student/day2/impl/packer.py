@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+RAG 초안용 컨텍스트 패킹
+- chunk_text는 200자 겹침 슬라이딩 윈도우라 인접 청크가 함께 검색되면 같은 문장이 반복됨
+- 같은 meta.path에서 겹치거나 맞닿은 청크(meta.start/end)를 원문 구간 하나로 다시 합치고
+- 내용이 같은 구간(content_hash)은 한 번만 남긴 뒤
+- 글자당 점수(구간 점수 합 / 길이) 순으로 max_context 예산을 탐욕적으로 채움
+- meta.start/end가 없는 레거시 청크는 각각 독립 구간으로 취급
+"""
+
+from __future__ import annotations
+from typing import List, Dict, Any
+
+from student.common.dedup import content_hash
+
+MIN_PIECE = 120   # 예산 잔량이 이보다 작으면 잘라 넣지 않음
+
+
+def _spans(contexts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """검색 결과 → 병합된 구간 [{"path","start","end","text","score","rank","members"}]"""
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    loose: List[Dict[str, Any]] = []
+    for rank, c in enumerate(contexts):
+        meta = c.get("meta") or {}
+        piece = {"path": meta.get("path", ""), "start": meta.get("start"), "end": meta.get("end"),
+                 "text": c.get("chunk") or "", "score": float(c.get("score", 0.0)), "rank": rank,
+                 "members": [c.get("doc_id")]}
+        if piece["start"] is None or piece["end"] is None:
+            loose.append(piece)
+        else:
+            groups.setdefault(piece["path"], []).append(piece)
+
+    spans: List[Dict[str, Any]] = list(loose)
+    for pieces in groups.values():
+        pieces.sort(key=lambda p: (p["start"], p["end"]))
+        cur = None
+        for p in pieces:
+            if cur is not None and p["start"] <= cur["end"]:   # 겹침/맞닿음 → 이어붙이기
+                if p["end"] > cur["end"]:
+                    cur["text"] += p["text"][cur["end"] - p["start"]:]
+                    cur["end"] = p["end"]
+                cur["score"] += p["score"]
+                cur["rank"] = min(cur["rank"], p["rank"])
+                cur["members"] += p["members"]
+            else:
+                cur = dict(p, members=list(p["members"]))
+                spans.append(cur)
+    return spans
+
+
+def pack_contexts(contexts: List[Dict[str, Any]], budget: int) -> List[Dict[str, Any]]:
+    """
+    검색 결과 → 예산(budget 글자) 안에 들어가는 구간 리스트 (원래 검색 순위 순으로 반환)
+    각 구간: {"path", "start", "end", "text", "score", "rank", "members"(doc_id 목록), "truncated"}
+    """
+    seen = set()
+    spans = []
+    for s in sorted(_spans(contexts), key=lambda s: -len(s["text"])):
+        h = content_hash(s["text"])
+        if not s["text"].strip() or h in seen:
+            continue
+        if any(s["text"] in t["text"] for t in spans):  # 이미 더 긴 구간에 포함된 텍스트
+            continue
+        seen.add(h)
+        spans.append(s)
+
+    spans.sort(key=lambda s: (-s["score"] / max(len(s["text"]), 1), s["rank"]))
+    picked: List[Dict[str, Any]] = []
+    skipped: List[Dict[str, Any]] = []
+    left = budget
+    for s in spans:
+        if len(s["text"]) <= left:
+            picked.append(dict(s, truncated=False))
+            left -= len(s["text"])
+        else:
+            skipped.append(s)
+    # 남은 예산은 못 들어간 구간 중 밀도 최상위를 잘라서 채움
+    if skipped and (left >= MIN_PIECE or not picked) and left > 0:
+        picked.append(dict(skipped[0], text=skipped[0]["text"][:left], truncated=True))
+    picked.sort(key=lambda s: s["rank"])
+    return picked
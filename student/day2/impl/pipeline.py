@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+공용 인덱스 빌드 파이프라인 (Day2 / Day5 / new 공통)
+- 단계: discover → extract → clean → chunk → dedup → embed → index → (post) → persist
+- 단계별 소요 시간/입출력 개수/처리량을 기록해 <index_dir>/build_report.json 으로 저장
+- 각 Day의 build_index CLI는 BuildConfig(파일 패턴, 추출/청크 함수)만 넘기는 얇은 설정 계층
+- 결과는 <index_dir>/versions/<vid>/ 에 기록한 뒤 CURRENT 포인터 교체로 발행 (versions.py)
+"""
+
+from __future__ import annotations
+import os, json, time, shutil
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import List, Dict, Any, Callable, Tuple, Optional, Sequence
+
+import numpy as np
+
+from student.day2.impl import ingest
+from student.day2.impl.embeddings import Embeddings
+from student.day2.impl.store import FaissStore, PREFIX_DIM, PREFIX_MIN_ROWS
+from student.day2.impl import versions
+from student.day2.impl import binary
+
+REPORT_NAME = "build_report.json"
+SOURCES_NAME = "sources.json"   # 인덱스에 반영된 원본 파일 서명 {path: [mtime_ns, size]}
+EMBEDDING_NAME = "embedding.json"   # 인덱스 벡터를 만든 임베딩 {"model", "dim"} (post_index 후처리가 같은 모델 사용)
+
+
+def file_signature(fp: str) -> List[int]:
+    st = os.stat(fp)
+    return [int(st.st_mtime_ns), int(st.st_size)]
+
+
+def source_signatures(files: List[str]) -> Dict[str, List[int]]:
+    """files → {경로: [mtime_ns, size]} (사라진 파일 제외) — 추출 전에 찍어 두고 write_sources로 기록"""
+    sig = {}
+    for fp in files:
+        try:
+            sig[fp] = file_signature(fp)
+        except OSError:
+            continue
+    return sig
+
+
+def write_sources(index_dir: str, sig: Dict[str, List[int]]) -> None:
+    """인덱싱한 내용의 파일 서명을 기록 (기록 시점에 다시 stat 하지 않음 — 그 사이 수정된 파일은 다음 갱신 대상)"""
+    with open(os.path.join(index_dir, SOURCES_NAME), "w", encoding="utf-8") as f:
+        json.dump(sig, f, ensure_ascii=False, indent=2)
+
+
+def read_sources(index_dir: str) -> Dict[str, List[int]]:
+    try:
+        with open(os.path.join(index_dir, SOURCES_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_embedding(index_dir: str, model: str, dim: int) -> None:
+    with open(os.path.join(index_dir, EMBEDDING_NAME), "w", encoding="utf-8") as f:
+        json.dump({"model": model, "dim": int(dim)}, f, ensure_ascii=False, indent=2)
+
+
+def read_embedding(index_dir: str) -> Dict[str, Any]:
+    """버전 dir의 임베딩 정보 {"model", "dim"} (이전 빌드로 만든 버전이면 빈 dict)"""
+    try:
+        with open(os.path.join(index_dir, EMBEDDING_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_flat(corpus: List[Dict[str, Any]], vecs: np.ndarray, out_dir: str) -> int:
+    """기본 레이아웃: out_dir/faiss.index + out_dir/docs/ 한 벌 → 저장된 벡터 수"""
+    store = FaissStore(
+        dim=vecs.shape[1],
+        index_path=os.path.join(out_dir, "faiss.index"),
+        docs_path=os.path.join(out_dir, "docs"),
+        # 접두 차원 인덱스(prefix.index)는 검색에 쓰이는 크기(PREFIX_MIN_ROWS 이상)일 때만 함께 기록
+        prefix_dim=PREFIX_DIM if vecs.shape[0] >= PREFIX_MIN_ROWS else 0,
+    )
+    store.add(vecs, corpus)
+    store.save()  # faiss.index (+ prefix.index) + docs/ 를 한 번만 기록
+    return int(store.index.ntotal)
+
+
+def read_flat(index_dir: str) -> Tuple[Sequence[Dict[str, Any]], np.ndarray]:
+    """write_flat의 역: (docs, vecs) — 증분 갱신 시 기존 벡터 재사용용"""
+    if binary.is_binary(index_dir):  # 이진 레이아웃 버전도 관련 구절 그래프/증분 갱신에서 읽을 수 있게
+        return binary.read_binary(index_dir)
+    docs_path = os.path.join(index_dir, "docs")
+    if not os.path.isdir(docs_path):  # 레거시 인덱스(docs.jsonl) 호환
+        docs_path = os.path.join(index_dir, "docs.jsonl")
+    store = FaissStore.load(os.path.join(index_dir, "faiss.index"), docs_path)
+    return store.docs, store.index.reconstruct_n(0, store.index.ntotal)
+
+
+@dataclass
+class BuildConfig:
+    name: str                                                     # "day2" | "day5" | "new"
+    patterns: Tuple[str, ...] = ingest.DOC_PATTERNS               # 디렉토리 탐색 패턴
+    extract: Callable[[str], List[Dict[str, Any]]] = ingest.extract_file      # 파일 → [{"path","text"}] (정제 전)
+    clean: Callable[[str], str] = ingest.clean_text
+    to_items: Callable[[Dict[str, Any]], List[Dict[str, Any]]] = ingest.chunk_document  # 문서 → 코퍼스 아이템
+    default_index_dir: str = "indices/day2"
+    write_index: Callable[[List[Dict[str, Any]], np.ndarray, str], int] = write_flat  # (코퍼스, 벡터, 버전 dir) → 저장 벡터 수
+    read_index: Callable[[str], Tuple[Sequence[Dict[str, Any]], np.ndarray]] = read_flat
+    # 발행 전 후처리 (새 버전 dir, 이전 버전 dir|None) → 통계 dict — 예: 이웃 테이블
+    post_index: Optional[Callable[[str, Optional[str]], Dict[str, Any]]] = None
+
+
+class BuildReport:
+    """단계별 계측 기록 (stage() 컨텍스트 안에서 rec["items_out"]을 채운다)"""
+
+    def __init__(self, config: BuildConfig, paths: List[str], index_dir: str, model: Optional[str]):
+        self.data: Dict[str, Any] = {
+            "name": config.name,
+            "paths": list(paths),
+            "index_dir": index_dir,
+            "model": model,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "stages": [],
+            "counts": {},
+        }
+
+    @contextmanager
+    def stage(self, name: str, items_in: int | None = None):
+        rec: Dict[str, Any] = {"stage": name, "items_in": items_in, "items_out": 0}
+        t0 = time.perf_counter()
+        try:
+            yield rec
+        finally:
+            sec = time.perf_counter() - t0
+            rec["seconds"] = round(sec, 4)
+            rec["throughput"] = round(rec["items_out"] / sec, 2) if sec > 0 else None
+            self.data["stages"].append(rec)
+            print(f"  [{name:<8}] {rec['items_out']:>7}개  {sec:9.3f}s  ({rec['throughput'] or '-'} /s)")
+
+    def finish(self) -> Dict[str, Any]:
+        stages = self.data["stages"]
+        total = sum(s["seconds"] for s in stages)
+        self.data["total_seconds"] = round(total, 4)
+        if stages:
+            slowest = max(stages, key=lambda s: s["seconds"])
+            self.data["bottleneck"] = slowest["stage"]
+            for s in stages:
+                s["share"] = round(s["seconds"] / total, 4) if total > 0 else 0.0
+        return self.data
+
+    def save(self, index_dir: str) -> str:
+        path = os.path.join(index_dir, REPORT_NAME)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        return path
+
+
+def run_build(
+    paths: List[str],
+    index_dir: str,
+    config: BuildConfig,
+    model: str | None = None,
+    batch_size: int = 128,
+    keep_versions: int = versions.DEFAULT_KEEP,
+) -> Dict[str, Any]:
+    """
+    paths → 새 버전 디렉토리(FAISS 인덱스 + docs/ + build_report.json) → CURRENT 발행 → 이전 버전 GC
+    반환: 빌드 리포트 dict (단계별 seconds/items_in/items_out/throughput/share, bottleneck)
+    """
+    report = BuildReport(config, paths, index_dir, model)
+    print(f"🚀 [{config.name}] 인덱스 빌드 시작 → {index_dir}")
+
+    with report.stage("discover", len(paths)) as rec:
+        files = ingest.discover_files(paths, config.patterns)
+        sources = source_signatures(files)  # 추출 전 서명 → sources.json
+        rec["items_out"] = len(files)
+
+    with report.stage("extract", len(files)) as rec:
+        docs: List[Dict[str, Any]] = []
+        for fp in files:
+            docs.extend(config.extract(fp))
+        rec["items_out"] = len(docs)
+
+    with report.stage("clean", len(docs)) as rec:
+        docs = [{**d, "text": config.clean(d["text"])} for d in docs]
+        rec["items_out"] = len(docs)
+        rec["chars"] = sum(len(d["text"]) for d in docs)
+
+    with report.stage("chunk", len(docs)) as rec:
+        corpus: List[Dict[str, Any]] = []
+        for d in docs:
+            corpus.extend(config.to_items(d))
+        rec["items_out"] = len(corpus)
+    if not corpus:
+        raise ValueError("인덱싱할 문서가 없습니다.")
+
+    with report.stage("dedup", len(corpus)) as rec:
+        texts, inverse = ingest.group_duplicates(corpus)
+        rec["items_out"] = len(texts)
+        rec["dedup_ratio"] = round(1.0 - len(texts) / len(corpus), 4)
+    print(f"  🧹 중복 제거: 청크 {len(corpus)}개 → 고유 텍스트 {len(texts)}개 (dedup {rec['dedup_ratio']:.1%})")
+
+    with report.stage("embed", len(texts)) as rec:
+        emb = Embeddings(model=model, batch_size=batch_size)
+        vecs = emb.encode(texts)[np.asarray(inverse, dtype="int64")]  # 고유 텍스트만 호출 → fan-out
+        rec["items_out"] = len(texts)
+        rec["vectors"] = int(vecs.shape[0])
+        rec["model"] = emb.model
+        rec["dummy"] = bool(getattr(emb, "_use_dummy", False))
+
+    vid, out_dir = versions.new_version(index_dir)
+    report.data["version"] = vid
+    try:  # 발행 전 실패하면 반쯤 쓴 버전 dir을 남기지 않음 (CURRENT는 이전 버전 그대로)
+        with report.stage("index", int(vecs.shape[0])) as rec:
+            write_embedding(out_dir, emb.model, int(vecs.shape[1]))
+            rec["items_out"] = ntotal = config.write_index(corpus, vecs, out_dir)
+
+        if config.post_index:
+            with report.stage("post", int(ntotal)) as rec:
+                rec.update(config.post_index(out_dir, versions.current_dir(index_dir)))
+                rec["items_out"] = int(rec.get("rows", ntotal))
+
+        with report.stage("persist", len(files)) as rec:
+            write_sources(out_dir, sources)
+            rec["items_out"] = len(files)
+
+        report.data["counts"] = {
+            "files": len(files),
+            "docs": len(docs),
+            "chunks": len(corpus),
+            "unique_texts": len(texts),
+            "vectors": int(vecs.shape[0]),
+            "indexed": int(ntotal),
+            "dim": int(vecs.shape[1]),
+        }
+        data = report.finish()
+        path = report.save(out_dir)
+        versions.publish(index_dir, vid)  # 여기서부터 새 질의는 새 버전을 읽음
+    except Exception:
+        shutil.rmtree(out_dir, ignore_errors=True)
+        raise
+    removed = versions.gc_versions(index_dir, keep=keep_versions)
+    print(f"✅ 빌드 완료: {data['total_seconds']:.2f}s (병목: {data.get('bottleneck')}) — 리포트 {path}")
+    print(f"📌 발행: {index_dir}/CURRENT → {vid}" + (f" (이전 버전 {len(removed)}개 정리)" if removed else ""))
+    return data
@@ -6,19 +6,14 @@ import numpy as np
 
 from student.common.schemas import Day2Plan
 from .embeddings import Embeddings
-from .store import FaissStore
-
-def _idx_paths(index_dir: str):
-    return (
-        os.path.join(index_dir, "faiss.index"),
-        os.path.join(index_dir, "docs.jsonl"),
-    )
+from .store import FaissStore, lift_to_parents
+from . import versions
+from .related import related_graph
+from .packer import pack_contexts
 
 def _load_store(plan: Day2Plan, emb: Embeddings) -> FaissStore:
-    index_path, docs_path = _idx_paths(plan.index_dir)
-    if not (os.path.exists(index_path) and os.path.exists(docs_path)):
-        raise FileNotFoundError(f"FAISS 인덱스가 없습니다. 먼저 ingest를 실행하세요: {plan.index_dir}")
-    store = FaissStore.load(index_path, docs_path)
+    # CURRENT가 가리키는 버전의 스냅샷 — 질의 도중 재빌드/발행이 일어나도 같은 버전을 끝까지 사용
+    store = versions.load_snapshot(plan.index_dir)
     # 차원 체크
     test_dim = emb.encode(["__dim_check__"]).shape[1]
     if store.dim != test_dim:
@@ -35,17 +30,50 @@ def _gate(contexts: List[Dict[str, Any]], plan: Day2Plan) -> Dict[str, Any]:
     return {"status":"insufficient","top_score":top_score,"mean_topk":mean_topk}
 
 def _draft_answer(query: str, contexts: List[Dict[str, Any]], plan: Day2Plan) -> str:
-    buf, budget = [], plan.max_context
-    for c in contexts:
-        t = c["chunk"].strip().replace("\n", " ")
-        if len(t) > budget:
-            t = t[:budget] + "..."
-        buf.append(f"- {t}")
-        budget -= len(t)
-        if budget <= 0:
-            break
+    # 겹치는/인접 청크는 원문 구간으로 합치고 중복 제거 후 글자당 점수 순으로 max_context 채움
+    buf = []
+    for span in pack_contexts(contexts, plan.max_context):
+        t = span["text"].strip().replace("\n", " ")
+        buf.append(f"- {t}..." if span["truncated"] else f"- {t}")
     return f"질의: {query}\n\n핵심 근거 요약:\n" + "\n".join(buf) if buf else ""
 
+def _parent_id(doc: Dict[str, Any]) -> str:
+    """청크 → 부모 창 id (부모 없는 레거시 청크면 자기 id)"""
+    return ((doc.get("meta") or {}).get("parent") or {}).get("id") or doc["id"]
+
+def expand_contexts(store: FaissStore, rows, plan: Day2Plan,
+                    contexts: List[Dict[str, Any]] = ()) -> List[Dict[str, Any]]:
+    """
+    검색 결과 행 → 인접/의미 관련 구절 (사전 계산 그래프 조회만, 그래프 없는 인덱스면 빈 리스트)
+    각 항목: 검색 hit 형식 + relation("prev"|"next"|"semantic") + source_doc_id
+    - 부모-자식 인덱스면 자식 행을 부모 창으로 올려 부모당 1개 (meta.parent 원문은 싣지 않음)
+    - contexts에 이미 있는 부모/청크는 제외
+    """
+    graph = related_graph(store)
+    if graph is None:
+        return []
+    seen = {c["doc_id"] for c in contexts}
+    if seen:  # 부모 top_k 밖으로 밀린 자식 행은 확장 출발점에서 제외
+        rows = [r for r in rows if _parent_id(store.docs[int(r)]) in seen]
+    by_id: Dict[str, Dict[str, Any]] = {}
+    out = []
+    for e in graph.expand(list(rows), adjacent=plan.expand_adjacent, semantic=plan.expand_semantic):
+        h = lift_to_parents([store.hit(e["row"], e["score"] if e["score"] is not None else 0.0)], 1)[0]
+        cur = by_id.get(h["doc_id"])
+        if cur is not None:  # 같은 부모의 다른 자식: 점수/자식 목록만 합침
+            cur["score"] = max(cur["score"], h["score"])
+            cur["meta"]["children"].extend(h["meta"].get("children", []))
+            continue
+        if h["doc_id"] in seen:
+            continue
+        h["relation"] = e["relation"]
+        h["source_doc_id"] = _parent_id(store.docs[e["source"]])
+        if "children" in h["meta"]:
+            by_id[h["doc_id"]] = h
+        seen.add(h["doc_id"])
+        out.append(h)
+    return out
+
 class Day2Agent:
     def __init__(self, plan_defaults: Day2Plan = Day2Plan()):
         self.plan_defaults = plan_defaults
@@ -56,7 +84,8 @@ class Day2Agent:
 
         store = _load_store(plan, emb)
         qv = emb.encode([query])[0]
-        contexts = store.search(qv, top_k=plan.top_k)
+        # 부모-자식 인덱스면 자식으로 찾고 부모 창으로 올려서 반환 (rows = 자식 행, 관련 구절 확장용)
+        contexts, rows = store.search_parents(qv, top_k=plan.top_k, fanout=plan.parent_fanout)
 
         gate = _gate(contexts, plan)
         payload: Dict[str, Any] = {
@@ -68,6 +97,8 @@ class Day2Agent:
             "answer": "",
             "notice": "web_merge_in_day4_only",
         }
+        if plan.expand_adjacent or plan.expand_semantic:
+            payload["related"] = expand_contexts(store, rows, plan, contexts)
         if plan.force_rag_only or (gate["status"] == "enough" and plan.return_draft_when_enough):
             payload["answer"] = _draft_answer(query, contexts, plan)
         return payload
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Day2 관련 구절 그래프
+- 인접 구절: 같은 meta.path 안에서 meta.chunk 순서상 앞/뒤 청크 (정렬 한 번으로 계산)
+- 의미 이웃: 배치 FAISS self-join top-K (neighbors.NeighborTable, 이전 버전 기준 upsert)
+- 빌드 시(BuildConfig.post_index) 버전 dir에 저장 → 질의 시 추가 임베딩/검색 없이 배열 조회로 컨텍스트 확장
+
+디렉토리 구성 (versions/<vid>/related/):
+  adjacent.npy                       # int32 (N, 2) = [앞 청크 행, 뒤 청크 행], -1 = 없음
+  ids.npy / scores.npy / keys.npy    # 의미 이웃 테이블 (neighbors.py)
+"""
+
+from __future__ import annotations
+import os
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from student.day2.impl.docstore import DocStore
+from student.day2.impl.neighbors import NeighborTable, row_keys, upsert_table
+from student.day2.impl.pipeline import read_flat
+
+RELATED_DIR = "related"
+SEMANTIC_K = 8
+
+
+def build_adjacency(docs) -> np.ndarray:
+    """docs → (N, 2) int32 [prev, next] (같은 path에서 chunk 번호 순)"""
+    n = len(docs)
+    if isinstance(docs, DocStore) and docs.manifest["columns"].get("meta.chunk") == "int" \
+            and docs.manifest["columns"].get("meta.path") == "dict":
+        path = np.asarray(docs.column("meta.path"), dtype="int64")
+        chunk = np.asarray(docs.column("meta.chunk"), dtype="int64")
+    else:
+        metas = [(docs[i].get("meta") or {}) for i in range(n)]
+        codes: Dict[str, int] = {}
+        path = np.array([codes.setdefault(str(m.get("path", "")), len(codes)) for m in metas], dtype="int64")
+        chunk = np.array([int(m.get("chunk", 0)) for m in metas], dtype="int64")
+
+    adj = np.full((n, 2), -1, dtype="int32")
+    if n < 2:
+        return adj
+    order = np.lexsort((chunk, path))                # path → chunk 순 정렬
+    same = path[order[1:]] == path[order[:-1]]
+    adj[order[1:][same], 0] = order[:-1][same]      # prev
+    adj[order[:-1][same], 1] = order[1:][same]      # next
+    return adj
+
+
+# ---------- Build (BuildConfig.post_index) ----------
+def build_related(out_dir: str, prev_dir: Optional[str] = None) -> Dict[str, Any]:
+    docs, vecs = read_flat(out_dir)
+    root = os.path.join(out_dir, RELATED_DIR)
+    os.makedirs(root, exist_ok=True)
+    np.save(os.path.join(root, "adjacent.npy"), build_adjacency(docs))
+
+    prev_root = os.path.join(prev_dir, RELATED_DIR) if prev_dir else ""
+    prev = NeighborTable.load(prev_root, mmap=False) if prev_root and NeighborTable.exists(prev_root) else None
+    table, stats = upsert_table(prev, vecs, row_keys(docs), k=SEMANTIC_K)
+    table.save(root)
+    print(f"  🔗 관련 구절 그래프: {stats['rows']}건 (인접 + 의미 K={SEMANTIC_K}, {stats['mode']}, 재계산 {stats['recomputed']}건)")
+    return stats
+
+
+# ---------- Query ----------
+class RelatedGraph:
+    def __init__(self, adjacent: np.ndarray, table: NeighborTable):
+        self.adjacent = adjacent
+        self.table = table
+
+    @classmethod
+    def load(cls, index_dir: str) -> Optional["RelatedGraph"]:
+        root = os.path.join(index_dir, RELATED_DIR)
+        if not (os.path.isfile(os.path.join(root, "adjacent.npy")) and NeighborTable.exists(root)):
+            return None
+        return cls(np.load(os.path.join(root, "adjacent.npy"), mmap_mode="r"), NeighborTable.load(root))
+
+    def expand(self, rows: List[int], adjacent: int = 1, semantic: int = 3) -> List[Dict[str, Any]]:
+        """
+        검색 결과 행들 → 확장 후보 [{"row", "relation", "source", "score"}] (입력 행/중복 제외)
+        - adjacent: 앞뒤로 따라갈 청크 수, semantic: 행당 의미 이웃 수
+        """
+        seen = set(int(r) for r in rows)
+        out: List[Dict[str, Any]] = []
+
+        def add(row: int, relation: str, source: int, score: Optional[float]):
+            if row >= 0 and row not in seen:
+                seen.add(row)
+                out.append({"row": row, "relation": relation, "source": source, "score": score})
+
+        for r in rows:
+            r = int(r)
+            for side, name in ((0, "prev"), (1, "next")):
+                cur = r
+                for _ in range(adjacent):
+                    cur = int(self.adjacent[cur, side])
+                    if cur < 0:
+                        break
+                    add(cur, name, r, None)
+            if semantic:
+                ids, scores = self.table.row(r)
+                for i, s in zip(ids[:semantic], scores[:semantic]):
+                    add(int(i), "semantic", r, float(s))
+        return out
+
+
+def related_graph(store) -> Optional[RelatedGraph]:
+    """스냅샷 store 객체에 캐시된 그래프 (없는 인덱스면 None)"""
+    cached = getattr(store, "_related_graph", None)
+    if cached is None:
+        cached = RelatedGraph.load(os.path.dirname(store.index_path)) or False
+        store._related_graph = cached
+    return cached or None
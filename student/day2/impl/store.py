@@ -4,26 +4,57 @@ from typing import List, Dict, Any, Tuple
 import numpy as np
 import faiss
 
+from student.day2.impl.docstore import DocStore
+
+# Matryoshka 접두 인덱스: text-embedding-3-* 벡터의 앞 PREFIX_DIM 차원(재정규화)으로 후보를 찾고 전체 차원으로 재점수
+PREFIX_DIM = 256
+PREFIX_NAME = "prefix.index"       # faiss.index 옆에 저장
+PREFIX_MIN_ROWS = 20000            # 이보다 작은 인덱스는 전체 차원 검색이 더 빠름
+PREFIX_RESCORE = 8                 # 후보 수 = top_k * PREFIX_RESCORE (최소 PREFIX_MIN_POOL)
+PREFIX_MIN_POOL = 64
+
+
+def prefix_vectors(vecs: np.ndarray, prefix_dim: int = PREFIX_DIM) -> np.ndarray:
+    """(N, D) → (N, prefix_dim) 앞 차원 절단 후 L2 재정규화"""
+    v = np.ascontiguousarray(np.asarray(vecs, dtype="float32")[:, :prefix_dim])
+    norms = np.linalg.norm(v, axis=1, keepdims=True)
+    return v / np.maximum(norms, 1e-12)
+
+
 class FaissStore:
-    def __init__(self, dim: int, index_path: str, docs_path: str):
+    def __init__(self, dim: int, index_path: str, docs_path: str, prefix_dim: int = 0):
         self.dim = dim
         self.index_path = index_path
-        self.docs_path = docs_path
+        self.docs_path = docs_path   # "<index_dir>/docs"(컬럼형) 또는 레거시 "docs.jsonl"
         self.index = faiss.IndexFlatIP(dim)  # 코사인=내적 (임베딩 정규화 가정)
         self.docs: List[Dict[str, Any]] = []
+        # prefix_dim > 0 이고 dim보다 작으면 같은 임베딩의 접두 차원 인덱스를 함께 유지
+        self.prefix_index = faiss.IndexFlatIP(prefix_dim) if 0 < prefix_dim < dim else None
 
     # ---------- Build ----------
     def add(self, embeddings: np.ndarray, items: List[Dict[str, Any]]):
         assert embeddings.shape[1] == self.dim
+        if not isinstance(self.docs, list):  # 로드된 DocStore(읽기 전용) → 리스트로 풀어서 추가
+            self.docs = list(self.docs)
         self.index.add(embeddings.astype("float32"))
+        if self.prefix_index is not None:
+            self.prefix_index.add(prefix_vectors(embeddings, self.prefix_index.d))
         self.docs.extend(items)
 
+    def _prefix_path(self) -> str:
+        return os.path.join(os.path.dirname(self.index_path), PREFIX_NAME)
+
     def save(self):
         os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
         faiss.write_index(self.index, self.index_path)
-        with open(self.docs_path, "w", encoding="utf-8") as f:
-            for it in self.docs:
-                f.write(json.dumps(it, ensure_ascii=False) + "\n")
+        if self.prefix_index is not None:
+            faiss.write_index(self.prefix_index, self._prefix_path())
+        if self.docs_path.endswith(".jsonl"):
+            with open(self.docs_path, "w", encoding="utf-8") as f:
+                for it in self.docs:
+                    f.write(json.dumps(it, ensure_ascii=False) + "\n")
+        else:
+            DocStore.write(self.docs, self.docs_path)
 
     # ---------- Load ----------
     @classmethod
@@ -32,26 +63,109 @@ class FaissStore:
         dim = index.d
         store = cls(dim, index_path, docs_path)
         store.index = index
-        store.docs = []
-        with open(docs_path, "r", encoding="utf-8") as f:
-            for line in f:
-                store.docs.append(json.loads(line))
+        # prefix.index가 없거나 검색에 쓰이지 않는 크기면 접두 인덱스 없음 (메모리에 올리지 않음)
+        if index.ntotal >= PREFIX_MIN_ROWS and os.path.isfile(store._prefix_path()):
+            store.prefix_index = faiss.read_index(store._prefix_path())
+        if os.path.isdir(docs_path):
+            store.docs = DocStore.open(docs_path)  # mmap, 행 번호 임의 접근
+        else:
+            store.docs = []
+            with open(docs_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    store.docs.append(json.loads(line))
         return store
 
     # ---------- Search ----------
-    def search(self, query_vec: np.ndarray, top_k: int = 5) -> List[Dict[str, Any]]:
+    def search_rows(self, query_vec: np.ndarray, top_k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """(scores, rows) 배열만 반환 — 문서 dict를 만들기 전에 행 단위 후처리(재랭킹 등)용"""
         if query_vec.ndim == 1:
             query_vec = query_vec[None, :]
+        if self.prefix_index is not None and self.prefix_index.ntotal >= PREFIX_MIN_ROWS:
+            return self._search_rows_prefix(query_vec.astype("float32"), top_k)
         D, I = self.index.search(query_vec.astype("float32"), top_k)
-        out = []
-        for rank, (score, idx) in enumerate(zip(D[0], I[0])):
-            if idx == -1:
-                continue
-            doc = self.docs[idx]
-            out.append({
-                "doc_id": doc["id"],
-                "chunk": doc["text"],
-                "score": float(score),  # 내적값(정규화 가정 → 코사인)
-                "meta": doc.get("meta", {})
-            })
+        keep = I[0] != -1
+        return D[0][keep], I[0][keep].astype("int64")
+
+    def _search_rows_prefix(self, query_vec: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """접두 차원 인덱스로 후보 top-N → 전체 차원 벡터로 내적 재점수 → top_k"""
+        pool = min(self.prefix_index.ntotal, max(top_k * PREFIX_RESCORE, PREFIX_MIN_POOL))
+        _, I = self.prefix_index.search(prefix_vectors(query_vec, self.prefix_index.d), pool)
+        cand = I[0][I[0] != -1].astype("int64")
+        full = self.index.reconstruct_batch(cand)            # (pool, D) — IndexFlat 저장 벡터 그대로
+        scores = full @ query_vec[0]
+        top = np.argsort(-scores, kind="stable")[:top_k]
+        return scores[top].astype("float32"), cand[top]
+
+    def hit(self, row: int, score: float) -> Dict[str, Any]:
+        doc = self.docs[int(row)]
+        return {
+            "doc_id": doc["id"],
+            "chunk": doc["text"],
+            "score": float(score),  # 내적값(정규화 가정 → 코사인)
+            "meta": doc.get("meta", {})
+        }
+
+    def search(self, query_vec: np.ndarray, top_k: int = 5) -> List[Dict[str, Any]]:
+        scores, rows = self.search_rows(query_vec, top_k)
+        return [self.hit(r, s) for s, r in zip(scores, rows)]
+
+    @property
+    def has_parents(self) -> bool:
+        """부모-자식 청크(ingest.chunk_document_parents)로 만든 인덱스인지"""
+        if isinstance(self.docs, DocStore):
+            return "meta.parent" in self.docs.manifest["columns"]
+        return bool(self.docs) and "parent" in (self.docs[0].get("meta") or {})
+
+    def search_parents(self, query_vec: np.ndarray, top_k: int = 5,
+                       fanout: int = 4) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """
+        자식 청크 top_k*fanout 검색 → 부모 창 top_k (lift_to_parents), 자식 행 번호
+        - 부모가 없는 인덱스는 일반 search와 같음
+        """
+        fetch = top_k * max(1, fanout) if self.has_parents else top_k
+        scores, rows = self.search_rows(query_vec, fetch)
+        hits = [self.hit(r, s) for s, r in zip(scores, rows)]
+        return lift_to_parents(hits, top_k), rows
+
+    def attributes(self, rows: np.ndarray, names: List[str]) -> Dict[str, np.ndarray]:
+        """
+        행 번호 배열 → meta 정수 컬럼 배열들 {name: int64[len(rows)]} (없으면 -1)
+        - 컬럼형 docs/는 mmap 컬럼에서 팬시 인덱싱 한 번, 레거시 JSONL은 meta에서 수집
+        """
+        out: Dict[str, np.ndarray] = {}
+        for name in names:
+            if isinstance(self.docs, DocStore) and self.docs.manifest["columns"].get(f"meta.{name}") == "int":
+                out[name] = np.asarray(self.docs.column(f"meta.{name}"))[rows]
+            else:
+                out[name] = np.array([int((self.docs[int(r)].get("meta") or {}).get(name, -1)) for r in rows],
+                                     dtype="int64")
         return out
+
+
+def lift_to_parents(hits: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+    """
+    자식 청크 hit 리스트(점수 내림차순) → 부모 창 hit 리스트 (부모당 1개, 최대 top_k)
+    - score = 부모에 속한 자식 점수의 최댓값, chunk = 부모 텍스트
+    - meta: path/start/end(부모 구간) + chunk(최고 점수 자식 번호) + children(검색된 자식 id)
+    - meta.parent 가 없는 hit(레거시 청크)은 그대로 유지
+    """
+    out: List[Dict[str, Any]] = []
+    by_parent: Dict[str, Dict[str, Any]] = {}
+    for h in hits:
+        meta = h.get("meta") or {}
+        parent = meta.get("parent")
+        if not parent:
+            out.append(h)
+            continue
+        cur = by_parent.get(parent["id"])
+        if cur is None:
+            cur = by_parent[parent["id"]] = {
+                "doc_id": parent["id"],
+                "chunk": parent["text"],
+                "score": float(h["score"]),
+                "meta": {"path": meta.get("path", ""), "chunk": meta.get("chunk"),
+                         "start": parent["start"], "end": parent["end"], "children": []},
+            }
+            out.append(cur)
+        cur["meta"]["children"].append(h["doc_id"])
+    return out[:top_k]
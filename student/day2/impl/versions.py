@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+버전 디렉토리 기반 인덱스 발행 (무중단 교체)
+- 빌드는 항상 새 버전 디렉토리에만 기록 → 실행 중인 리더가 보는 파일은 절대 덮어쓰지 않음
+- CURRENT 포인터 파일을 임시 파일 + os.replace(원자적 rename)로 교체해 발행
+- 리더는 질의 시작 시 CURRENT를 한 번 읽어 그 버전의 스냅샷(FaissStore)을 질의 끝까지 사용
+- 오래된 버전은 보존 정책(keep)에 따라 GC
+
+디렉토리 구성 (<index_dir>/):
+  CURRENT                         # 현재 버전 id (예: "20261019-101500-123")
+  versions/<vid>/faiss.index
+  versions/<vid>/docs/
+  versions/<vid>/sources.json
+  versions/<vid>/build_report.json
+레거시 레이아웃(<index_dir>/faiss.index 직접 저장)도 읽기는 그대로 지원
+"""
+
+from __future__ import annotations
+import os, time, shutil, threading
+from typing import List, Dict, Any, Tuple, Optional, Callable
+
+POINTER_NAME = "CURRENT"
+VERSIONS_DIR = "versions"
+DEFAULT_KEEP = 3          # CURRENT 외에 남겨둘 이전 버전 수 (롤백/느린 리더 대비)
+STALE_BUILD_SECONDS = 3600   # CURRENT보다 새 버전이 이 시간 동안 수정 없으면 중단된 빌드로 보고 정리
+
+
+def _versions_root(index_dir: str) -> str:
+    return os.path.join(index_dir, VERSIONS_DIR)
+
+
+def version_path(index_dir: str, vid: str) -> str:
+    return os.path.join(_versions_root(index_dir), vid)
+
+
+def new_version(index_dir: str) -> Tuple[str, str]:
+    """
+    새 버전 디렉토리 생성 → (vid, 경로)
+    - vid는 시각 기반이라 정렬 순서 = 생성 순서
+    """
+    root = _versions_root(index_dir)
+    os.makedirs(root, exist_ok=True)
+    while True:
+        now = time.time()
+        vid = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"-{int(now * 1000) % 1000:03d}"
+        path = os.path.join(root, vid)
+        try:
+            os.makedirs(path)
+            return vid, path
+        except FileExistsError:
+            time.sleep(0.001)
+
+
+def read_current(index_dir: str) -> Optional[str]:
+    try:
+        with open(os.path.join(index_dir, POINTER_NAME), "r", encoding="utf-8") as f:
+            vid = f.read().strip()
+    except OSError:
+        return None
+    return vid or None
+
+
+def publish(index_dir: str, vid: str) -> None:
+    """CURRENT → vid 원자적 교체 (같은 디렉토리의 임시 파일을 os.replace)"""
+    if not os.path.isdir(version_path(index_dir, vid)):
+        raise FileNotFoundError(f"발행할 버전이 없습니다: {vid}")
+    tmp = os.path.join(index_dir, f".{POINTER_NAME}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(vid + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, os.path.join(index_dir, POINTER_NAME))
+
+
+def current_dir(index_dir: str) -> Optional[str]:
+    """
+    지금 읽어야 할 인덱스 디렉토리
+    - CURRENT가 가리키는 버전 → 없으면 레거시(<index_dir>/faiss.index) → 둘 다 없으면 None
+    """
+    vid = read_current(index_dir)
+    if vid and os.path.isdir(version_path(index_dir, vid)):
+        return version_path(index_dir, vid)
+    if os.path.exists(os.path.join(index_dir, "faiss.index")):
+        return index_dir
+    return None
+
+
+def list_versions(index_dir: str) -> List[str]:
+    root = _versions_root(index_dir)
+    if not os.path.isdir(root):
+        return []
+    return sorted(d for d in os.listdir(root) if os.path.isdir(os.path.join(root, d)))
+
+
+def gc_versions(index_dir: str, keep: int = DEFAULT_KEEP,
+                stale_after: float = STALE_BUILD_SECONDS) -> List[str]:
+    """
+    보존 정책에 따라 이전 버전 삭제 → 삭제된 vid 목록
+    - CURRENT는 항상 보존
+    - CURRENT 이전 버전은 최근 keep개만 보존 (이미 스냅샷을 잡은 리더가 읽을 여유)
+    - CURRENT보다 새 버전은 빌드 중일 수 있어 보존, 단 stale_after초 넘게 수정이 없으면
+      발행되지 못한 채 남은 빌드(프로세스 강제 종료 등)로 보고 삭제
+    """
+    cur = read_current(index_dir)
+    if not cur:
+        return []
+    vids = list_versions(index_dir)
+    older = [v for v in vids if v < cur]
+    doomed = older[:-keep] if keep > 0 else older
+    now = time.time()
+    for v in vids:
+        if v > cur:
+            try:
+                if now - os.path.getmtime(version_path(index_dir, v)) > stale_after:
+                    doomed.append(v)
+            except OSError:
+                continue
+    for v in doomed:
+        shutil.rmtree(version_path(index_dir, v), ignore_errors=True)
+    return doomed
+
+
+# ---------- 리더 스냅샷 ----------
+_SNAPSHOTS: Dict[str, Tuple[str, object]] = {}
+_LOCK = threading.Lock()
+
+
+def load_flat(d: str):
+    """기본 레이아웃(faiss.index + docs/ 또는 레거시 docs.jsonl) 로더 — 이진 레이아웃(binary.py)도 인식"""
+    from student.day2.impl.store import FaissStore
+    from student.day2.impl.binary import BinaryStore, is_binary
+
+    if is_binary(d):
+        return BinaryStore.load(d)
+    docs_path = os.path.join(d, "docs")
+    if not os.path.isdir(docs_path):  # 레거시 인덱스(docs.jsonl) 호환
+        docs_path = os.path.join(d, "docs.jsonl")
+    return FaissStore.load(os.path.join(d, "faiss.index"), docs_path)
+
+
+def load_snapshot(index_dir: str, loader: Callable[[str], Any] = load_flat):
+    """
+    현재 버전의 store를 반환 (버전이 바뀌지 않았으면 프로세스 내 캐시 재사용)
+    - 반환된 store는 발행/GC와 무관하게 질의가 끝날 때까지 같은 버전을 가리킴
+    - loader: 버전 디렉토리 → store (Day5 파티션 레이아웃 등)
+    """
+    d = current_dir(index_dir)
+    if d is None:
+        raise FileNotFoundError(f"FAISS 인덱스가 없습니다. 먼저 ingest를 실행하세요: {index_dir}")
+    key = os.path.abspath(index_dir)
+    with _LOCK:
+        cached = _SNAPSHOTS.get(key)
+        if cached and cached[0] == d:
+            return cached[1]
+    store = loader(d)
+    with _LOCK:
+        _SNAPSHOTS[key] = (d, store)
+    return store
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+인덱스 자동 갱신 워커 (data/raw 폴링)
+- 주기적으로 원본 파일 서명(mtime, size)을 비교해 변경/추가/삭제 파일을 찾음
+- 쓰기 폭주는 debounce(조용한 구간)가 지날 때까지 모았다가 한 번에 반영
+- 변경된 파일만 extract → clean → chunk → embed 하고, 나머지는 기존 인덱스 벡터를 재사용
+- 새 버전 디렉토리에 빌드한 뒤 CURRENT 포인터 교체로 발행 → 실행 중인 에이전트는 다음 질의부터 새 인덱스 사용
+- 신선도 지연(파일 수정 → 반영 완료)과 갱신 소요 시간을 stats / build_report.json 에 기록
+
+실행 예:
+  python -m student.day2.impl.watcher --config day5 --paths data/raw --index_dir indices/day5
+"""
+
+from __future__ import annotations
+import os, time, argparse, shutil
+from typing import List, Dict, Any, Tuple, Optional
+
+import numpy as np
+
+from student.day2.impl import ingest
+from student.day2.impl.embeddings import Embeddings
+from student.day2.impl import versions
+from student.day2.impl.pipeline import (BuildConfig, BuildReport, file_signature, read_sources, write_sources,
+                                        write_embedding)
+
+
+def _source_file(item: Dict[str, Any]) -> str:
+    """코퍼스 아이템 → 원본 파일 경로 (Day5 CSV 행은 '<fp>::row_<i>')"""
+    return str((item.get("meta") or {}).get("path", "")).split("::")[0]
+
+
+class IndexWatcher:
+    def __init__(
+        self,
+        paths: List[str],
+        index_dir: str,
+        config: BuildConfig,
+        model: str | None = None,
+        batch_size: int = 128,
+        interval: float = 2.0,
+        debounce: float = 3.0,
+    ):
+        self.paths = paths
+        self.index_dir = index_dir
+        self.config = config
+        self.model = model
+        self.interval = float(interval)
+        self.debounce = float(debounce)
+        self._emb = Embeddings(model=model, batch_size=batch_size)
+
+        # 마지막으로 인덱스에 반영된 상태 (파일 단위)
+        self._applied: Dict[str, List[int]] = {}
+        self._items: Dict[str, List[Dict[str, Any]]] = {}
+        self._vecs: Dict[str, np.ndarray] = {}
+
+        self.stats: Dict[str, Any] = {
+            "updates": 0,
+            "last_update_at": None,
+            "last_lag_seconds": None,        # 가장 오래된 미반영 수정 → 반영 완료
+            "last_duration_seconds": None,   # 갱신 1회 소요 시간
+            "last_changed": [],
+            "pending_files": 0,
+        }
+
+    # ---------- 상태 복원 ----------
+    def bootstrap(self) -> None:
+        """
+        기존 인덱스 + sources.json이 있으면 파일별 아이템/벡터 캐시를 복원
+        (서명이 그대로인 파일은 다시 임베딩하지 않음)
+        """
+        cur = versions.current_dir(self.index_dir)
+        if cur is None:
+            return
+        sources = read_sources(cur)
+        if not sources:
+            return
+        docs, vecs = self.config.read_index(cur)
+        rows: Dict[str, List[int]] = {}
+        for i in range(len(docs)):
+            rows.setdefault(_source_file(docs[i]), []).append(i)
+        for fp, sig in sources.items():
+            idx = rows.get(fp, [])
+            self._applied[fp] = list(sig)
+            self._items[fp] = [docs[i] for i in idx]
+            self._vecs[fp] = vecs[idx] if idx else np.zeros((0, vecs.shape[1]), dtype="float32")
+        print(f"♻️  기존 인덱스 복원: 파일 {len(sources)}개, 벡터 {len(vecs)}개")
+
+    # ---------- 변경 감지 ----------
+    def scan(self) -> Dict[str, List[int]]:
+        snap: Dict[str, List[int]] = {}
+        for fp in ingest.discover_files(self.paths, self.config.patterns):
+            try:
+                snap[fp] = file_signature(fp)
+            except OSError:
+                continue  # 쓰는 도중 사라진 파일
+        return snap
+
+    def diff(self, snap: Dict[str, List[int]]) -> Tuple[List[str], List[str]]:
+        changed = [fp for fp, sig in snap.items() if self._applied.get(fp) != sig]
+        removed = [fp for fp in self._applied if fp not in snap]
+        return changed, removed
+
+    # ---------- 증분 갱신 ----------
+    def update(self, snap: Dict[str, List[int]], changed: List[str], removed: List[str],
+               detected_at: float) -> Dict[str, Any]:
+        report = BuildReport(self.config, self.paths, self.index_dir, self.model)
+        t0 = time.time()
+
+        with report.stage("extract", len(changed)) as rec:
+            docs: Dict[str, List[Dict[str, Any]]] = {}
+            for fp in changed:
+                try:
+                    docs[fp] = [{**d, "text": self.config.clean(d["text"])} for d in self.config.extract(fp)]
+                except Exception as e:  # 쓰는 중인 파일 등 → 다음 주기에 재시도
+                    print(f"⚠️ 추출 실패(다음 주기 재시도): {fp} — {e}")
+                    snap.pop(fp, None)
+            rec["items_out"] = sum(len(v) for v in docs.values())
+
+        with report.stage("chunk", rec["items_out"]) as rec:
+            new_items = {fp: [it for d in ds for it in self.config.to_items(d)] for fp, ds in docs.items()}
+            rec["items_out"] = sum(len(v) for v in new_items.values())
+
+        with report.stage("embed", rec["items_out"]) as rec:
+            # 이미 임베딩한 텍스트(meta.hash)는 벡터 재사용 — 바뀐 파일의 이전 청크 포함, 삭제된 파일만 제외
+            known: Dict[str, np.ndarray] = {}
+            for fp, items in self._items.items():
+                if fp in removed or not items:
+                    continue
+                for it, v in zip(items, self._vecs[fp]):
+                    h = (it.get("meta") or {}).get("hash")
+                    if h:
+                        known[h] = v
+            pending = [it for items in new_items.values() for it in items]
+            todo = [it for it in pending if (it.get("meta") or {}).get("hash") not in known]
+            texts, inverse = ingest.group_duplicates(todo)
+            fresh = self._emb.encode(texts) if texts else None
+            for it, j in zip(todo, inverse):
+                known[it["meta"]["hash"]] = fresh[j]
+            for fp, items in new_items.items():
+                self._items[fp] = items
+                self._vecs[fp] = (np.vstack([known[it["meta"]["hash"]] for it in items]).astype("float32")
+                                  if items else None)
+            rec["items_out"] = len(texts)
+            rec["reused"] = len(pending) - len(todo)
+
+        for fp in removed:
+            self._items.pop(fp, None)
+            self._vecs.pop(fp, None)
+
+        files = sorted(fp for fp, items in self._items.items() if items)
+        corpus = [it for fp in files for it in self._items[fp]]
+        if not corpus:
+            raise ValueError("인덱싱할 문서가 없습니다.")
+        vid, out_dir = versions.new_version(self.index_dir)
+        report.data["version"] = vid
+        try:
+            with report.stage("index", len(corpus)) as rec:
+                vecs = np.vstack([self._vecs[fp] for fp in files])
+                write_embedding(out_dir, self._emb.model, int(vecs.shape[1]))
+                rec["items_out"] = ntotal = self.config.write_index(corpus, vecs, out_dir)
+
+            if self.config.post_index:
+                with report.stage("post", ntotal) as rec:
+                    rec.update(self.config.post_index(out_dir, versions.current_dir(self.index_dir)))
+                    rec["items_out"] = int(rec.get("rows", ntotal))
+
+            with report.stage("persist", len(files)) as rec:
+                # scan 시점 서명 기록 (추출 실패로 이전 내용을 유지한 파일은 이전 서명)
+                write_sources(out_dir, {fp: snap.get(fp, self._applied.get(fp)) for fp in self._items})
+                versions.publish(self.index_dir, vid)
+                rec["items_out"] = len(files)
+        except Exception:
+            shutil.rmtree(out_dir, ignore_errors=True)  # 발행 전 실패 → 미완성 버전 제거
+            raise
+
+        # 반영 완료 상태 기록
+        for fp in changed:
+            if fp in snap:
+                self._applied[fp] = snap[fp]
+        for fp in removed:
+            self._applied.pop(fp, None)
+
+        now = time.time()
+        oldest = min([snap[fp][0] / 1e9 for fp in changed if fp in snap] + [detected_at])
+        self.stats.update({
+            "updates": self.stats["updates"] + 1,
+            "last_update_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(now)),
+            "last_lag_seconds": round(now - oldest, 3),
+            "last_duration_seconds": round(now - t0, 3),
+            "last_changed": changed + removed,
+            "pending_files": 0,
+        })
+        report.data["update"] = dict(self.stats)
+        report.data["counts"] = {"files": len(files), "chunks": len(corpus), "vectors": int(vecs.shape[0])}
+        data = report.finish()
+        report.save(out_dir)
+        versions.gc_versions(self.index_dir)
+        print(f"🔄 인덱스 갱신: 변경 {len(changed)} / 삭제 {len(removed)} 파일, "
+              f"{self.stats['last_duration_seconds']}s 소요, 신선도 지연 {self.stats['last_lag_seconds']}s")
+        return data
+
+    # ---------- 메인 루프 ----------
+    def poll_once(self, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        한 주기 처리. state는 호출자가 유지하는 debounce 상태 dict
+        - 변경이 보이면 snapshot을 기억하고, debounce 동안 추가 변경이 없을 때만 update 실행
+        """
+        snap = self.scan()
+        changed, removed = self.diff(snap)
+        self.stats["pending_files"] = len(changed) + len(removed)
+        if not (changed or removed):
+            state.clear()
+            return None
+        now = time.time()
+        if state.get("snap") != snap:
+            state["snap"] = snap
+            state["quiet_since"] = now
+            state.setdefault("detected_at", now)
+            return None
+        if now - state["quiet_since"] < self.debounce:
+            return None
+        detected_at = state.get("detected_at", now)
+        state.clear()
+        return self.update(snap, changed, removed, detected_at)
+
+    def run_forever(self) -> None:
+        self.bootstrap()
+        print(f"👀 감시 시작: {self.paths} → {self.index_dir} (interval={self.interval}s, debounce={self.debounce}s)")
+        state: Dict[str, Any] = {}
+        try:
+            while True:
+                try:
+                    self.poll_once(state)
+                except Exception as e:
+                    print(f"⚠️ 갱신 실패(다음 주기 재시도): {type(e).__name__}: {e}")
+                    state.clear()
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            print("🛑 감시 종료")
+
+
+def _config_by_name(name: str) -> BuildConfig:
+    if name == "day2":
+        from student.day2.impl.build_index import DAY2_CONFIG
+        return DAY2_CONFIG
+    if name == "day2-binary":
+        from student.day2.impl.build_index import DAY2_BINARY_CONFIG
+        return DAY2_BINARY_CONFIG
+    if name == "day5":
+        from student.day5.impl.build_index import DAY5_CONFIG
+        return DAY5_CONFIG
+    if name == "new":
+        from student.new.build_index import NEW_CONFIG
+        return NEW_CONFIG
+    raise ValueError(f"알 수 없는 config: {name}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", choices=["day2", "day2-binary", "day5", "new"], default="day2")
+    ap.add_argument("--paths", nargs="+", default=["data/raw"])
+    ap.add_argument("--index_dir", default=None)
+    ap.add_argument("--model", default=None)
+    ap.add_argument("--batch_size", type=int, default=128)
+    ap.add_argument("--interval", type=float, default=2.0)
+    ap.add_argument("--debounce", type=float, default=3.0)
+    args = ap.parse_args()
+
+    cfg = _config_by_name(args.config)
+    IndexWatcher(
+        paths=args.paths,
+        index_dir=args.index_dir or cfg.default_index_dir,
+        config=cfg,
+        model=args.model,
+        batch_size=args.batch_size,
+        interval=args.interval,
+        debounce=args.debounce,
+    ).run_forever()
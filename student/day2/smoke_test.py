@@ -45,10 +45,227 @@ def _import_all():
 
 Day2Agent, Day2Plan, FaissStore, Embeddings, build_index = _import_all()
 
+# ───────── 1-1) 오프라인 점검 (인덱스/API 키 불필요) ─────────
+def _check_dedup() -> bool:
+    """청크 중복 제거 — 공백/전각/대소문자 차이는 같은 해시, inverse로 원래 순서 복원"""
+    from student.common.dedup import content_hash, group_duplicates
+
+    items = [{"text": "헬스케어  규제 동향"}, {"text": "다른 문단"}, {"text": "헬스케어 규제 동향\n"},
+             {"text": "ＡＩ 정책"}, {"text": "ai 정책"}]
+    texts, inverse = group_duplicates(items)
+    problems = []
+    if texts != ["헬스케어  규제 동향", "다른 문단", "ＡＩ 정책"]:
+        problems.append(f"고유 텍스트 {texts}")
+    if inverse != [0, 1, 0, 2, 2]:
+        problems.append(f"inverse {inverse}")
+    if content_hash("다른 문단") == content_hash("다른 문장"):
+        problems.append("다른 텍스트가 같은 해시")
+    hashed = [{"text": "본문이 달라도", "meta": {"hash": "h1"}}, {"text": "meta.hash가 같으면 묶임", "meta": {"hash": "h1"}}]
+    if group_duplicates(hashed)[1] != [0, 0]:
+        problems.append("meta.hash 우선 사용 안 함")
+    if problems:
+        print("[FAIL] group_duplicates:", ", ".join(problems))
+        return False
+    print(f"[OK] 중복 제거: 청크 {len(items)}개 → 고유 텍스트 {len(texts)}개")
+    return True
+
+def _check_docstore() -> bool:
+    """컬럼형 docs/ 왕복 — 쓰고 다시 열었을 때 id/text/meta가 그대로, 컬럼 인코딩은 값 모양대로"""
+    import tempfile, shutil
+    from student.day2.impl.docstore import DocStore
+
+    items = [
+        {"id": f"doc{i}", "text": ("" if i == 3 else f"{i}번째 청크 본문 — 한글/emoji ✅"),
+         "meta": {"path": f"data/raw/{'a' if i < 4 else 'b'}.md", "chunk": i, "hash": f"h{i:03d}",
+                  "fields": {"공모전명": "같은 레코드", "상금": 100}, **({"parent": {"id": "p0"}} if i % 2 else {})}}
+        for i in range(6)
+    ]
+    tmp = tempfile.mkdtemp(prefix="day2_docstore_")
+    try:
+        DocStore.write(items, tmp)
+        problems = []
+        for mmap in (True, False):
+            docs = DocStore.open(tmp, mmap=mmap)
+            if len(docs) != len(items) or [docs[i] for i in range(len(docs))] != items:
+                problems.append(f"mmap={mmap} 왕복 불일치")
+        docs = DocStore.open(tmp)
+        kinds = docs.manifest["columns"]
+        want = {"meta.chunk": "int", "meta.hash": "str", "meta.path": "dict", "meta.fields": "dict", "meta.parent": "dict"}
+        if any(kinds.get(k) != v for k, v in want.items()):
+            problems.append(f"컬럼 인코딩 {kinds}")
+        if docs[-1] != items[-1] or docs[1:3] != items[1:3]:
+            problems.append("음수 인덱스/슬라이스")
+        if list(docs.column("meta.chunk")) != list(range(6)) or docs.get(0, "meta.parent", "없음") != "없음":
+            problems.append("column()/get() 결측 기본값")
+        if problems:
+            print("[FAIL] DocStore:", ", ".join(problems))
+            return False
+        print(f"[OK] DocStore 왕복: {len(items)}행, 컬럼 {len(kinds)}개")
+        return True
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def _check_watcher() -> bool:
+    """증분 갱신 — 문단 추가 시 바뀐 청크만 임베딩, sources.json은 scan 시점 서명, 삭제 파일은 인덱스에서 빠짐"""
+    import tempfile, shutil
+    from student.day2.impl import versions
+    from student.day2.impl.build_index import DAY2_CONFIG
+    from student.day2.impl.pipeline import read_sources
+    from student.day2.impl.watcher import IndexWatcher, _source_file
+
+    tmp = Path(tempfile.mkdtemp(prefix="day2_watcher_"))
+    try:
+        raw, idx = tmp / "raw", str(tmp / "idx")
+        raw.mkdir()
+        a, b = raw / "a.md", raw / "b.md"
+        a.write_text("\n".join(f"{i:03d}번 문단: 헬스케어 규제 샌드박스 사례 {i * 7 % 13}호." for i in range(120)), encoding="utf-8")
+        b.write_text("\n".join(f"{i:03d}번 항목: 디지털 전환 지원 사업 안내." for i in range(40)), encoding="utf-8")
+        w = IndexWatcher([str(raw)], idx, DAY2_CONFIG)
+
+        def step():
+            snap = w.scan()
+            changed, removed = w.diff(snap)
+            data = w.update(snap, changed, removed, time.time())
+            embed = next(s for s in data["stages"] if s["stage"] == "embed")
+            return snap, embed, data["counts"]["chunks"]
+
+        _, first, total = step()
+        with open(a, "a", encoding="utf-8") as f:
+            f.write("\n추가 문단: 새 가이드라인 발표.")
+        snap, second, _ = step()
+        problems = []
+        if not (0 < second["items_out"] <= 2 and second["reused"] > 0):
+            problems.append(f"문단 추가 후 임베딩 {second['items_out']}개 (재사용 {second.get('reused')}, 전체 {total})")
+        if read_sources(versions.current_dir(idx)) != snap:
+            problems.append("sources.json ≠ scan 서명")
+        b.unlink()
+        step()
+        docs = versions.load_flat(versions.current_dir(idx)).docs
+        if any(_source_file(docs[i]) == str(b) for i in range(len(docs))) or str(b) in read_sources(versions.current_dir(idx)):
+            problems.append("삭제 파일 청크가 남음")
+        if w.diff(w.scan()) != ([], []):
+            problems.append("갱신 후에도 변경 감지")
+        if problems:
+            print("[FAIL] IndexWatcher:", ", ".join(problems))
+            return False
+        print(f"[OK] IndexWatcher: 최초 {first['items_out']}개 → 문단 추가 {second['items_out']}개만 임베딩, 삭제 반영")
+        return True
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def _check_versions() -> bool:
+    """버전 발행 — CURRENT 원자적 교체, keep개 보존 GC, 중단된 빌드 정리, 실패한 빌드는 버전 dir을 남기지 않음"""
+    import tempfile, shutil
+    from dataclasses import replace
+    from student.day2.impl import versions
+    from student.day2.impl.build_index import DAY2_CONFIG
+    from student.day2.impl.pipeline import run_build
+
+    tmp = Path(tempfile.mkdtemp(prefix="day2_versions_"))
+    try:
+        idx = str(tmp / "idx")
+        problems = []
+        if versions.current_dir(idx) is not None:
+            problems.append("빈 디렉토리인데 current_dir 있음")
+        vids = []
+        for _ in range(5):
+            vid, d = versions.new_version(idx)
+            Path(d, "faiss.index").write_bytes(b"")
+            versions.publish(idx, vid)
+            vids.append(vid)
+        if versions.read_current(idx) != vids[-1] or versions.current_dir(idx) != versions.version_path(idx, vids[-1]):
+            problems.append("CURRENT가 마지막 발행 버전이 아님")
+        if any(n.endswith(".tmp") for n in os.listdir(idx)):
+            problems.append("CURRENT 임시 파일 남음")
+
+        building, _ = versions.new_version(idx)   # CURRENT보다 새 버전 = 빌드 중
+        removed = versions.gc_versions(idx, keep=2)
+        if sorted(removed) != vids[:2] or versions.list_versions(idx) != vids[2:] + [building]:
+            problems.append(f"keep=2 GC 결과 {removed} / 남은 버전 {versions.list_versions(idx)}")
+        old = time.time() - versions.STALE_BUILD_SECONDS - 60
+        os.utime(versions.version_path(idx, building), (old, old))
+        if versions.gc_versions(idx, keep=2) != [building]:
+            problems.append("오래 방치된 미발행 버전이 정리되지 않음")
+        try:
+            versions.publish(idx, "no-such-version")
+            problems.append("없는 버전 발행이 성공함")
+        except FileNotFoundError:
+            pass
+
+        raw = tmp / "raw"
+        raw.mkdir()
+        (raw / "a.md").write_text("버전 발행 점검용 문서입니다. " * 20, encoding="utf-8")
+        def boom(corpus, vecs, out_dir):
+            raise RuntimeError("쓰기 실패 주입")
+        before = versions.list_versions(idx)
+        try:
+            run_build([str(raw)], idx, replace(DAY2_CONFIG, write_index=boom, post_index=None))
+            problems.append("write_index 실패가 전파되지 않음")
+        except RuntimeError:
+            pass
+        if versions.list_versions(idx) != before or versions.read_current(idx) != vids[-1]:
+            problems.append("실패한 빌드가 버전 dir/CURRENT를 바꿈")
+        if problems:
+            print("[FAIL] versions:", ", ".join(problems))
+            return False
+        print(f"[OK] 버전 발행/GC: CURRENT={vids[-1]}, 보존 {len(versions.list_versions(idx))}개, 실패 빌드 정리")
+        return True
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def _check_pack() -> bool:
+    """컨텍스트 패킹 — 겹치거나 맞닿은 청크는 원문 구간 하나로, 중복 텍스트는 한 번만, 예산 초과 없음"""
+    from student.day2.impl.packer import pack_contexts
+
+    doc = "".join(f"{i:03d}번 문장은 규제 샌드박스 사례를 설명합니다. " for i in range(40))
+    def ctx(doc_id, path, start, end, score, text=None):
+        return {"doc_id": doc_id, "score": score, "chunk": doc[start:end] if text is None else text,
+                "meta": {"path": path, "start": start, "end": end}}
+    contexts = [
+        ctx("a#1", "a.md", 200, 600, 0.9),
+        ctx("a#0", "a.md", 0, 400, 0.8),                    # 겹침
+        ctx("a#2", "a.md", 600, 900, 0.7),                  # 맞닿음
+        ctx("b#0", "b.md", 0, 400, 0.6, text=doc[0:400]),   # 다른 경로, 같은 텍스트
+        {"doc_id": "legacy", "score": 0.5, "chunk": "start/end 없는 레거시 청크", "meta": {"path": "c.txt"}},
+    ]
+    problems = []
+    packed = pack_contexts(contexts, budget=5000)
+    merged = [p for p in packed if p["path"] == "a.md"]
+    if len(merged) != 1 or merged[0]["text"] != doc[0:900] or sorted(merged[0]["members"]) != ["a#0", "a#1", "a#2"]:
+        problems.append("겹침/맞닿음 병합")
+    if any(p["path"] == "b.md" for p in packed):
+        problems.append("이미 포함된 텍스트 반복")
+    if not any(p["path"] == "c.txt" for p in packed):
+        problems.append("레거시 청크 누락")
+    small = pack_contexts(contexts, budget=300)
+    if sum(len(p["text"]) for p in small) > 300 or not small:
+        problems.append("예산 초과 또는 빈 결과")
+    if problems:
+        print("[FAIL] pack_contexts:", ", ".join(problems))
+        return False
+    print(f"[OK] pack_contexts: 청크 {len(contexts)}개 → 구간 {len(packed)}개 (병합 {len(merged[0]['text'])}자)")
+    return True
+
+OFFLINE_CHECKS = [_check_dedup, _check_docstore, _check_watcher, _check_versions, _check_pack]
+
+def _run_offline_checks() -> bool:
+    results = []
+    for check in OFFLINE_CHECKS:
+        try:
+            results.append(check())
+        except Exception as e:
+            print(f"[FAIL] {check.__name__}: {type(e).__name__}: {e}")
+            results.append(False)
+    return all(results)
+
 # ───────── 2) 유틸 ─────────
 def _idx_paths(index_dir: str):
-    d = Path(index_dir)
-    return d / "faiss.index", d / "docs.jsonl"
+    from student.day2.impl.versions import current_dir
+    d = Path(current_dir(index_dir) or index_dir)  # CURRENT가 가리키는 버전 디렉토리
+    docs = d / "docs"
+    if not docs.is_dir():  # 레거시 인덱스(docs.jsonl)
+        docs = d / "docs.jsonl"
+    return d / "faiss.index", docs
 
 def _file_info(p: Path) -> str:
     try:
@@ -57,6 +274,13 @@ def _file_info(p: Path) -> str:
         return f"{p} (size: ?)"""
 
 def _read_docs_head(docs_path: Path, n: int = 5):
+    if docs_path.is_dir():  # 컬럼형 docs/
+        from student.day2.impl.docstore import DocStore
+        docs = DocStore.open(str(docs_path))
+        head = [docs[i] for i in range(min(n, len(docs)))]
+        empty_cnt = sum(1 for d in head if not d["text"].strip())
+        return len(docs), empty_cnt, [{"i": i, "id": d["id"], "path": d["meta"].get("path"), "len": len(d["text"])}
+                                       for i, d in enumerate(head)]
     lines = docs_path.read_text(encoding="utf-8", errors="ignore").splitlines()
     out = []
     empty_cnt = 0
@@ -111,7 +335,7 @@ def _diagnose(index_dir: str, paths: str, model: str, autobuild: bool, batch_siz
         print("[WARN] faiss.index 없음 →", idx_path)
         ok = False
     if not docs_path.exists():
-        print("[WARN] docs.jsonl 없음  →", docs_path)
+        print("[WARN] docs 없음        →", docs_path)
         ok = False
     if not ok:
         if not autobuild:
@@ -120,17 +344,18 @@ def _diagnose(index_dir: str, paths: str, model: str, autobuild: bool, batch_siz
             return None, None
         print("[INFO] --autobuild 지정 → 인덱스 생성 시작")
         build_index(paths, index_dir, model, batch_size)
+        idx_path, docs_path = _idx_paths(index_dir)
 
     # 파일 정보
     print("[INFO] 인덱스 파일:", _file_info(idx_path))
     print("[INFO] 문서 파일  :", _file_info(docs_path))
     try:
         total, empty_cnt, head = _read_docs_head(docs_path, n=5)
-        print(f"[OK] docs.jsonl 라인수={total}, (빈 텍스트 {empty_cnt})")
+        print(f"[OK] docs 행 수={total}, (빈 텍스트 {empty_cnt})")
         for r in head:
             print("   ", r)
     except Exception as e:
-        print("[WARN] docs.jsonl 파싱 이슈:", e)
+        print("[WARN] docs 파싱 이슈:", e)
 
     # FAISS 로드
     try:
@@ -181,7 +406,8 @@ def _run_search_and_agent(query: str, index_dir: str, model: str, top_k: int):
     # 임베딩/스토어 준비
     emb = Embeddings(model=model, batch_size=4)
     qv = emb.encode([query])[0]
-    store = FaissStore.load(str(Path(index_dir)/"faiss.index"), str(Path(index_dir)/"docs.jsonl"))
+    idx_path, docs_path = _idx_paths(index_dir)
+    store = FaissStore.load(str(idx_path), str(docs_path))
 
     # 로우 검색
     try:
@@ -206,6 +432,36 @@ def _run_search_and_agent(query: str, index_dir: str, model: str, top_k: int):
         print(out["answer"][:400] + ("..." if len(out["answer"]) > 400 else ""))
     return out
 
+# ───────── 4-1) 관련 구절 확장 (부모 중복 검사) ─────────
+def _check_related(query: str, index_dir: str, model: str, top_k: int) -> bool:
+    from student.day2.impl import versions
+    from student.day2.impl.rag import expand_contexts
+    from student.day2.impl.related import related_graph
+
+    store = versions.load_snapshot(index_dir)
+    if related_graph(store) is None:
+        print("[WARN] 관련 구절 그래프 없음 → expand_contexts 검사 생략 (인덱스 재빌드 필요)")
+        return True
+    plan = Day2Plan(index_dir=index_dir, embedding_model=model, top_k=top_k,
+                    expand_adjacent=1, expand_semantic=3)
+    qv = Embeddings(model=model, batch_size=4).encode([query])[0]
+    contexts, rows = store.search_parents(qv, top_k=top_k, fanout=plan.parent_fanout)
+    related = expand_contexts(store, rows, plan, contexts)
+
+    ids = [r["doc_id"] for r in related]
+    problems = []
+    if set(ids) & {c["doc_id"] for c in contexts}:
+        problems.append("이미 반환된 컨텍스트와 중복")
+    if len(ids) != len(set(ids)):
+        problems.append("같은 부모 창 반복")
+    if any("parent" in (r.get("meta") or {}) for r in related):
+        problems.append("meta.parent 원문 포함")
+    if problems:
+        print("[FAIL] expand_contexts:", ", ".join(problems))
+        return False
+    print(f"[OK] expand_contexts: 관련 구절 {len(related)}개 (컨텍스트 {len(contexts)}개와 중복 없음)")
+    return True
+
 # ───────── 5) 리포트 저장 ─────────
 def _save_report(query: str, index_dir: str, model: str, payload: dict):
     out_dir = ROOT / "data" / "processed"
@@ -235,6 +491,8 @@ def parse_args():
 
 def main():
     args = parse_args()
+    if not _run_offline_checks():
+        sys.exit(1)
     print("[INFO] ROOT:", ROOT)
     print("[INFO] .env :", ENV_PATH, "| OPENAI_API_KEY:", bool(os.getenv("OPENAI_API_KEY")))
     print("[INFO] index:", args.index_dir, "| paths:", args.paths, "| model:", args.model)
@@ -245,6 +503,8 @@ def main():
 
     out = _run_search_and_agent(args.query, args.index_dir, args.model, args.top_k)
     _save_report(args.query, args.index_dir, args.model, out)
+    if not _check_related(args.query, args.index_dir, args.model, args.top_k):
+        sys.exit(1)
     print("\n[DONE] Day2 스모크 테스트 완료")
 
 if __name__ == "__main__":
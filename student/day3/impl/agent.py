@@ -7,10 +7,11 @@ Day3Agent: 정부사업 공고 에이전트(Agent-as-a-Tool)
 """
 
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 import os
 from student.common.schemas import Day3Plan
+from student.common.executor import submit
 
 # 수집 → 정규화 → 랭크 모듈
 from . import fetchers          # NIPA, Bizinfo, 일반 Web 수집
@@ -134,13 +135,17 @@ class Day3Agent:
          # 1) plan의 topk 동기화
         plan = _set_source_topk(plan)
 
-        # 2) fetch 단계
-        raw: List[Dict[str, Any]] = []
-        raw += self._safe_fetch_nipa(query, plan.nipa_topk)
-        raw += self._safe_fetch_bizinfo(query, plan.bizinfo_topk)
-
+        # 2) fetch 단계 (소스별 검색을 공용 실행기로 동시에 요청, 결과는 소스 순서대로 누적)
+        futures = [
+            submit("tavily", self._safe_fetch_nipa, query, plan.nipa_topk),
+            submit("tavily", self._safe_fetch_bizinfo, query, plan.bizinfo_topk),
+        ]
         if getattr(plan, "use_web_fallback", False) and plan.web_topk > 0:
-            raw += self._safe_fetch_web(query, plan.web_topk)
+            futures.append(submit("tavily", self._safe_fetch_web, query, plan.web_topk))
+
+        raw: List[Dict[str, Any]] = []
+        for future in futures:
+            raw += future.result()
 
         # 3) normalize 단계
         norm = self._safe_normalize(raw)
@@ -18,9 +18,11 @@ import os
 
 # Day1에서 제작한 Tavily 래퍼를 재사용합니다.
 from student.day1.impl.tavily_client import search_tavily
+from student.common.executor import submit
 
 DEFAULT_TOPK = 7
 DEFAULT_TIMEOUT = 20
+CACHE_TTL = 6 * 3600.0   # 공고 검색 결과 캐시 신선도(초) — 공고는 하루 안에 거의 바뀌지 않음
 
 # 기본 TopK(권장): NIPA 3, Bizinfo 2, Web 2
 NIPA_TOPK = 3
@@ -35,6 +37,7 @@ def fetch_nipa(query: str, topk: int = NIPA_TOPK) -> List[Dict[str, Any]]:
         top_k=topk,
         timeout=DEFAULT_TIMEOUT,
         include_domains=["nipa.kr"],
+        cache_ttl=CACHE_TTL,
     )
 
 def fetch_bizinfo(query: str, topk: int = BIZINFO_TOPK) -> List[Dict[str, Any]]:
@@ -45,6 +48,7 @@ def fetch_bizinfo(query: str, topk: int = BIZINFO_TOPK) -> List[Dict[str, Any]]:
         top_k=topk,
         timeout=DEFAULT_TIMEOUT,
         include_domains=["bizinfo.go.kr"],
+        cache_ttl=CACHE_TTL,
     )
 
 def fetch_web(query: str, topk: int = WEB_TOPK) -> List[Dict[str, Any]]:
@@ -65,7 +69,8 @@ def fetch_web(query: str, topk: int = WEB_TOPK) -> List[Dict[str, Any]]:
         search_query,
         api_key,
         top_k=topk,
-        timeout=DEFAULT_TIMEOUT
+        timeout=DEFAULT_TIMEOUT,
+        cache_ttl=CACHE_TTL,
     )
     return results
     raise NotImplementedError("TODO[DAY3-F-03]: 일반 웹 검색 호출")
@@ -81,21 +86,18 @@ def fetch_all(query: str) -> List[Dict[str, Any]]:
 
     all_results: List[Dict[str, Any]] = [] #빈 리스트(결과 통합용)
 
-    try:
-        all_results.extend(fetch_nipa(query))
-    except Exception as e:
-        print(f"[WARN] Failed to fetch from NIPA: {e}")
-        
-    try:
-        all_results.extend(fetch_bizinfo(query))
-    except Exception as e:
-        print(f"[WARN] Failed to fetch from Bizinfo: {e}")
-        
-    try:
-        all_results.extend(fetch_web(query))
-    except Exception as e:
-        print(f"[WARN] Failed to fetch from Web: {e}")
-        
+    # 세 소스를 공용 실행기("tavily")로 동시에 요청하고, 결과는 소스 순서대로 이어붙임
+    futures = [
+        ("NIPA", submit("tavily", fetch_nipa, query)),
+        ("Bizinfo", submit("tavily", fetch_bizinfo, query)),
+        ("Web", submit("tavily", fetch_web, query)),
+    ]
+    for name, future in futures:
+        try:
+            all_results.extend(future.result())
+        except Exception as e:
+            print(f"[WARN] Failed to fetch from {name}: {e}")
+
     return all_results
 
     raise NotImplementedError("TODO[DAY3-F-04]: 전체 소스 수집")
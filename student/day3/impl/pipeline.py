@@ -18,6 +18,7 @@ from student.common.schemas import GovNotices, GovNoticeItem
 
 # ▶ 추가: PPS OpenAPI
 from student.day3.impl.pps_api import pps_fetch_bids
+from student.common.executor import submit
 
 
 def _merge_and_dedup(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -38,14 +39,16 @@ def find_notices(query: str) -> dict:
     2) (옵션) PPS OpenAPI 수집(pps_fetch_bids) 추가 병합
     3) normalize → rank → GovNotices 스키마 반환
     """
+    # 2) PPS OpenAPI(선택) — Tavily 수집과 겹치도록 먼저 공용 실행기("pps")에 제출
+    use_pps = os.getenv("USE_PPS", "1")  # 기본 1(ON)으로 두는 게 데모에 유리
+    pps_future = submit("pps", pps_fetch_bids, query) if use_pps and use_pps != "0" else None
+
     # 1) 기존 소스 수집
     raw_items = fetch_all(query)  # Day1형 스키마 리스트(title/url/snippet/...)
-    
-    # 2) PPS OpenAPI(선택)
-    use_pps = os.getenv("USE_PPS", "1")  # 기본 1(ON)으로 두는 게 데모에 유리
-    if use_pps and use_pps != "0":
+
+    if pps_future is not None:
         try:
-            pps_items = pps_fetch_bids(query)   # 이미 GovNotice형에 가깝게 매핑됨
+            pps_items = pps_future.result()   # 이미 GovNotice형에 가깝게 매핑됨
             # 정규화 파이프라인에 태우기 위해 Day1형처럼 최소 필드 구성
             # (normalize_all이 기대하는 최소 스키마를 맞추기 위해 변환)
             converted = []
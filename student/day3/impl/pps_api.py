@@ -7,7 +7,7 @@ PPS OpenAPI 호출 유틸
 """
 from __future__ import annotations
 import os, math, time, json
-import requests
+from student.common import http_client as http  # 공용 커넥션 풀 세션
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 
@@ -54,7 +54,7 @@ def _req_params(keyword: Optional[str], page: int, rows: int) -> Dict[str, Any]:
 
 def _call_op(op: str, params: Dict[str, Any], timeout: int = 20) -> Dict[str, Any]:
     url = f"{PPS_BASE}/{op}"
-    r = requests.get(url, params=params, timeout=timeout)
+    r = http.get(url, params=params, timeout=timeout)
     r.raise_for_status()
     return r.json()
 
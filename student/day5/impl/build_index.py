@@ -1,68 +1,46 @@
 # -*- coding: utf-8 -*-
 """
-Day2 인덱싱 엔트리포인트
-- 목표: 코퍼스 생성 → 임베딩 → FAISS 저장 + docs.jsonl 저장
+Day5 인덱싱 엔트리포인트 (공모전 CSV)
+- 목표: CSV 행 → 코퍼스 생성 → 임베딩 → 마감월 파티션별 FAISS + 컬럼형 docs/ 저장
+- 실제 단계와 계측은 student.day2.impl.pipeline 이 담당, 여기서는 설정만 지정
 """
 
-import os, argparse, numpy as np
-from typing import List
-import pandas as pd
-import time
+import os, argparse
+from typing import List, Dict, Any
 
-from ingest import build_corpus, save_docs_jsonl
-from embeddings import Embeddings
-from store import FaissStore
+from student.day5.impl.ingest import DOC_PATTERNS, extract_file, record_to_items
+from student.day2.impl.pipeline import BuildConfig, run_build
+from student.day5.impl.partitions import write_partitioned, read_partitioned
+from student.day5.impl.similar import build_similar
+from student.day5.impl.fields import build_fields
 
+def post_index(out_dir: str, prev_dir: str | None = None) -> Dict[str, Any]:
+    """발행 전 후처리: 유사 공모전 kNN 테이블 + 필드별 벡터 (둘 다 이전 버전 기준 재사용)"""
+    stats = build_similar(out_dir, prev_dir)
+    stats["fields"] = build_fields(out_dir, prev_dir)
+    return stats
 
-def build_index(paths: List[str], index_dir: str, model: str | None = None, batch_size: int = 128):
-    print("🚀 [START] 인덱싱 파이프라인 시작")
 
-    corpus = build_corpus(paths)
-    if len(corpus) == 0:
-        raise ValueError("❌ 인덱싱할 문서가 없습니다.")
+DAY5_CONFIG = BuildConfig(
+    name="day5",
+    patterns=DOC_PATTERNS,          # *.csv
+    extract=extract_file,           # CSV 행 단위 분리
+    to_items=record_to_items,       # 공모전명 + 상세 내용 + 전공 우대, meta.fields 원본 레코드
+    default_index_dir="indices/day5",
+    write_index=write_partitioned,  # 마감월 파티션별 인덱스, 만료분은 발행 시 제외
+    read_index=read_partitioned,
+    post_index=post_index,          # 유사 공모전 kNN 테이블 + 필드별 벡터 (이전 버전 기준 재사용)
+)
 
-    texts = [item["text"] for item in corpus]
-    print(f"📄 총 문서 수: {len(texts)}개")
-
-    emb = Embeddings(model=model, batch_size=batch_size)
-    print(f"🧠 임베딩 모델: {model or '기본값'}")
-
-    # ⚙️ 임베딩 + 내용 확인
-    vecs_list = []
-    for i in range(0, len(texts), batch_size):
-        batch = texts[i:i + batch_size]
-
-        # ✅ 디버그: 각 문서 내용 일부 출력
-        print(f"\n=== 🔹 Batch {i // batch_size + 1} / {len(texts) // batch_size + 1} ===")
-        for j, t in enumerate(batch):
-            # 너무 길면 앞부분만 보기 (100자 제한)
-            snippet = (t[:120] + " ...") if len(t) > 120 else t
-            print(f"📝 [Doc {i + j}] {snippet}")
-
-        vecs_batch = emb.encode(batch)
-        vecs_list.append(vecs_batch)
-        print(f"✅ Batch {i + len(batch)}/{len(texts)} 임베딩 완료")
-
-    vecs = np.vstack(vecs_list)
-    print(f"✅ 전체 임베딩 완료! (shape={vecs.shape})")
-
-    os.makedirs(index_dir, exist_ok=True)
-    index_path = os.path.join(index_dir, "faiss.index")
-    docs_path = os.path.join(index_dir, "docs.jsonl")
-
-    store = FaissStore(dim=vecs.shape[1], index_path=index_path, docs_path=docs_path)
-    store.add(vecs, corpus)
-    store.save()
-
-    save_docs_jsonl(corpus, docs_path)
-    print(f"\n💾 인덱스 및 문서 저장 완료: {index_dir}")
 
+def build_index(paths: List[str], index_dir: str, model: str | None = None, batch_size: int = 128) -> Dict[str, Any]:
+    return run_build(paths, index_dir, DAY5_CONFIG, model=model, batch_size=batch_size)
 
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument("--paths", nargs="+", required=True)
-    ap.add_argument("--index_dir", default="indices/day5")
+    ap.add_argument("--index_dir", default=DAY5_CONFIG.default_index_dir)
     ap.add_argument("--model", default=None)
     ap.add_argument("--batch_size", type=int, default=128)
     args = ap.parse_args()
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+Day5 필드별 벡터 (공모전명 / 상세 내용 / 자격 조건)
+- 본 인덱스는 세 필드를 이어붙인 텍스트 하나를 임베딩 → 짧은 제목 일치가 긴 상세 내용에 묻힘
+- 빌드/발행 직전(BuildConfig.post_index) 필드 텍스트를 공모전(meta.path)당 한 번씩 따로 임베딩
+  (상세 내용이 여러 청크로 나뉜 공모전도 필드 벡터는 1벌 → 검색 결과에 같은 공모전이 반복되지 않음)
+- 마감월 파티션(partitions.py)마다 필드 인덱스를 따로 두고, 질의는 활성 파티션만 검색(경계 파티션은 만료분 제외)
+- 파티션 안에서는 세 필드를 한 FAISS 인덱스에 필드 순서로 쌓아 두고(행 = 필드 * C + 공모전 번호) 질의 1회 검색으로
+  후보를 모은 뒤 후보 공모전의 필드별 내적을 가중합(plan.field_weights)해 정렬 → 공모전의 첫 청크 전역 행 번호로 반환
+- 같은 필드 텍스트(자격 조건 등 반복 값)는 한 번만 임베딩, 이전 버전 벡터는 텍스트 해시로 재사용
+
+디렉토리 구성 (versions/<vid>/fields/):
+  manifest.json            # {"fields", "parts": {파티션 키: 공모전 수}, "contests", "rows", "dim", "model"}
+  <파티션 키>/fields.index  # faiss.IndexFlatIP (len(FIELDS) * C, D), 빈 필드는 0 벡터
+  <파티션 키>/rows.npy      # int64 (C,) 공모전 → 대표(첫 청크) 전역 행 번호
+  <파티션 키>/deadlines.npy # int64 (C,) 공모전 마감일 (경계 파티션 만료분 제외용)
+  <파티션 키>/keys.npy      # 행별 "<field>#<content_hash>" (다음 빌드 재사용용)
+레거시 단일 인덱스(FaissStore)는 파티션 키 "all" 한 벌
+임베딩 모델은 빌드가 버전 dir에 남긴 embedding.json(pipeline.write_embedding)을 따름 → 본 인덱스와 같은 모델/차원
+"""
+
+from __future__ import annotations
+import os, json
+from typing import List, Dict, Any, Tuple, Optional
+
+import numpy as np
+import faiss
+
+from student.common.dedup import content_hash
+from student.day2.impl.docstore import DocStore
+from student.day2.impl.pipeline import read_embedding
+from student.day5.impl.embeddings import Embeddings
+from student.day5.impl.partitions import (PartitionedStore, read_partitioned, today_int,
+                                          is_partitioned, read_manifest)
+
+FIELDS_DIR = "fields"
+ALL_PARTITION = "all"   # 레거시 단일 인덱스
+# 필드 이름 → 레코드 컬럼 (여러 컬럼이면 "컬럼: 값" 형태로 이어붙임)
+FIELDS: Dict[str, Tuple[str, ...]] = {
+    "title": ("공모전명",),
+    "desc": ("상세 내용",),
+    "elig": ("참가 자격", "팀 규모", "전공 우대"),
+}
+
+
+def field_text(record: Dict[str, Any], columns: Tuple[str, ...]) -> str:
+    if len(columns) == 1:
+        return str(record.get(columns[0], "") or "").strip()
+    parts = [f"{c}: {str(record.get(c, '') or '').strip()}" for c in columns if str(record.get(c, "") or "").strip()]
+    return " | ".join(parts)
+
+
+def _meta(docs, i: int, name: str) -> Any:
+    if isinstance(docs, DocStore):
+        return docs.get(i, f"meta.{name}")
+    return (docs[i].get("meta") or {}).get(name)
+
+
+def contest_rows(docs) -> np.ndarray:
+    """공모전(meta.path)별 첫 청크의 행 번호 (등장 순서) — 청크가 여러 개인 공모전도 1행"""
+    first: Dict[str, int] = {}
+    for i in range(len(docs)):
+        first.setdefault(str(_meta(docs, i, "path") or i), i)
+    return np.fromiter(first.values(), dtype="int64", count=len(first))
+
+
+def _partition_starts(out_dir: str) -> Tuple[List[str], np.ndarray]:
+    """(파티션 키 목록, 전역 행 시작 오프셋) — read_partitioned와 같은 키 정렬 순서"""
+    if not is_partitioned(out_dir):
+        return [ALL_PARTITION], np.zeros(1, dtype="int64")
+    parts = read_manifest(out_dir)["partitions"]
+    keys = sorted(parts)
+    counts = [parts[k]["count"] for k in keys]
+    return keys, np.concatenate([[0], np.cumsum(counts)[:-1]]).astype("int64")
+
+
+def _read_manifest(root: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(root, "manifest.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _load_prev(prev_root: str, model: str, dim: int) -> Dict[str, np.ndarray]:
+    """이전 버전 fields/ → {키: 벡터} (모델/차원이 다르면 재사용하지 않음)"""
+    manifest = _read_manifest(prev_root) if prev_root else {}
+    if manifest.get("model") != model or int(manifest.get("dim", -1)) != dim:
+        return {}
+    # 파티션별 레이아웃 이전 버전은 fields/ 바로 아래 한 벌
+    dirs = [os.path.join(prev_root, k) for k in manifest["parts"]] if "parts" in manifest else [prev_root]
+    out: Dict[str, np.ndarray] = {}
+    for d in dirs:
+        index = faiss.read_index(os.path.join(d, "fields.index"))
+        keys = np.load(os.path.join(d, "keys.npy")).tolist()
+        vecs = index.reconstruct_n(0, index.ntotal)
+        out.update((k, vecs[i]) for i, k in enumerate(keys) if k)
+    return out
+
+
+def _write_part(root: str, rows: np.ndarray, deadlines: np.ndarray, keys: List[str],
+                table: Dict[str, np.ndarray], dim: int) -> None:
+    mat = np.zeros((len(keys), dim), dtype="float32")
+    for i, key in enumerate(keys):
+        if key:
+            mat[i] = table[key]
+    index = faiss.IndexFlatIP(dim)
+    index.add(mat)
+    os.makedirs(root, exist_ok=True)
+    faiss.write_index(index, os.path.join(root, "fields.index"))
+    np.save(os.path.join(root, "rows.npy"), rows)
+    np.save(os.path.join(root, "deadlines.npy"), deadlines)
+    np.save(os.path.join(root, "keys.npy"), np.asarray(keys, dtype=str))
+
+
+# ---------- Build (BuildConfig.post_index) ----------
+def build_fields(out_dir: str, prev_dir: Optional[str] = None, model: Optional[str] = None) -> Dict[str, Any]:
+    """
+    새 버전 dir의 전체 행 → 파티션별 fields/<키>/ 저장, 통계 반환
+    - 임베딩 모델: 인자 → 버전 dir의 embedding.json → 이전 버전 fields 모델 → Embeddings 기본값 순
+    """
+    docs, vecs = read_partitioned(out_dir)
+    n, dim = len(docs), int(vecs.shape[1])
+    rows = contest_rows(docs)
+    records = [_meta(docs, int(i), "fields") or {} for i in rows]
+    deadlines = np.asarray([int(_meta(docs, int(i), "deadline") or -1) for i in rows], dtype="int64")
+    part_keys, starts = _partition_starts(out_dir)
+    part_of = np.searchsorted(starts, rows, side="right") - 1   # 공모전 → 파티션 번호 (청크는 같은 파티션)
+
+    prev_root = os.path.join(prev_dir, FIELDS_DIR) if prev_dir else ""
+    emb = Embeddings(model=model or read_embedding(out_dir).get("model") or _read_manifest(prev_root).get("model"))
+    prev = _load_prev(prev_root, emb.model, dim)
+
+    keys: List[List[str]] = []       # 필드별, 공모전 순서
+    texts: Dict[str, str] = {}       # 키 → 텍스트 (새로 임베딩할 것만)
+    for name, columns in FIELDS.items():
+        row: List[str] = []
+        for rec in records:
+            t = field_text(rec, columns)
+            key = f"{name}#{content_hash(t)}" if t else ""
+            row.append(key)
+            if key and key not in prev:
+                texts.setdefault(key, t)
+        keys.append(row)
+
+    new_keys = list(texts)
+    table = dict(prev)
+    if new_keys:
+        enc = emb.encode([texts[k] for k in new_keys])
+        if enc.shape[1] != dim:
+            raise ValueError(f"필드 임베딩 차원이 인덱스와 다릅니다. (index={dim}, embedder={enc.shape[1]})")
+        table.update(zip(new_keys, enc))
+
+    root = os.path.join(out_dir, FIELDS_DIR)
+    parts: Dict[str, int] = {}
+    for p, key in enumerate(part_keys):
+        sel = np.flatnonzero(part_of == p)
+        if not len(sel):
+            continue
+        part_keys_flat = [row[j] for row in keys for j in sel]   # 필드 순서로 쌓기
+        _write_part(os.path.join(root, key), rows[sel], deadlines[sel], part_keys_flat, table, dim)
+        parts[key] = int(len(sel))
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"fields": list(FIELDS), "parts": parts, "contests": len(rows), "rows": n,
+                   "dim": dim, "model": emb.model}, f, ensure_ascii=False, indent=2)
+
+    stats = {"rows": n, "contests": len(rows), "partitions": len(parts), "fields": len(FIELDS),
+             "embedded": len(new_keys), "reused": sum(1 for row in keys for k in row if k and k in prev)}
+    print(f"  🧩 필드별 벡터: 공모전 {len(rows)}건 × {len(FIELDS)}필드, 파티션 {len(parts)}개 "
+          f"(새 임베딩 {stats['embedded']}건, 재사용 {stats['reused']}건)")
+    return stats
+
+
+# ---------- Query ----------
+class FieldPart:
+    """파티션 하나의 필드 인덱스"""
+
+    def __init__(self, root: str, n_fields: int):
+        self.index = faiss.read_index(os.path.join(root, "fields.index"))
+        self.row_ids = np.load(os.path.join(root, "rows.npy"))
+        self.deadlines = np.load(os.path.join(root, "deadlines.npy"))
+        self.n_fields = n_fields
+        self.contests = len(self.row_ids)
+
+    def search_rows(self, q: np.ndarray, top_k: int, w: np.ndarray,
+                    today: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        전 필드 1회 검색(필드당 약 top_k 후보) → 후보 공모전의 필드별 내적 가중 평균 → (scores, 대표 전역 rows) 내림차순
+        - today가 있으면 마감 지난 공모전 제외 (만료 수만큼 더 뽑아 top_k 보장)
+        """
+        if self.contests == 0:
+            return np.zeros(0, dtype="float32"), np.zeros(0, dtype="int64")
+        expired = (self.deadlines >= 0) & (self.deadlines < today) if today else None
+        k = top_k + (int(np.count_nonzero(expired)) if expired is not None else 0)
+        _, I = self.index.search(q, min(self.index.ntotal, k * self.n_fields))
+        cand = np.unique(I[0][I[0] >= 0] % self.contests)
+        if expired is not None:
+            cand = cand[~expired[cand]]
+        # 후보 공모전 × 필드 벡터를 한 번에 꺼내 내적 (F, C)
+        ids = (np.arange(self.n_fields)[:, None] * self.contests + cand[None, :]).reshape(-1)
+        sims = (self.index.reconstruct_batch(ids) @ q[0]).reshape(self.n_fields, len(cand))
+        fused = (w[:, None] * sims).sum(axis=0) / w.sum()
+        order = np.argsort(-fused, kind="stable")[:top_k]
+        return fused[order].astype("float32"), self.row_ids[cand[order]].astype("int64")
+
+
+class FieldIndex:
+    def __init__(self, root: str, manifest: Dict[str, Any]):
+        self.root = root
+        self.fields: List[str] = manifest["fields"]
+        self.dim = int(manifest["dim"])
+        self.parts: Dict[str, int] = manifest["parts"]
+        self._loaded: Dict[str, FieldPart] = {}
+
+    @classmethod
+    def load(cls, root: str) -> Optional["FieldIndex"]:
+        """fields/ 로드 (없거나 파티션별 레이아웃 이전 버전이면 None → 본 인덱스 검색)"""
+        manifest = _read_manifest(root)
+        if "parts" not in manifest:
+            return None
+        return cls(root, manifest)
+
+    def _part(self, key: str) -> FieldPart:
+        part = self._loaded.get(key)
+        if part is None:
+            part = self._loaded[key] = FieldPart(os.path.join(self.root, key), len(self.fields))
+        return part
+
+    def search_rows(self, query_vec: np.ndarray, top_k: int, weights: Dict[str, float],
+                    keys: Optional[List[str]] = None, boundary: Optional[Dict[str, int]] = None
+                    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        keys 파티션만 검색(기본: 전체) → (scores, 대표 전역 rows) 내림차순
+        - boundary: {파티션 키: today} — 만료 공모전이 섞인 경계 파티션
+        - 점수는 가중치 합으로 나눠 코사인과 같은 범위 유지 (_gate 임계값 그대로 사용)
+        """
+        q = np.asarray(query_vec, dtype="float32").reshape(1, -1)
+        w = np.array([float(weights.get(f, 0.0)) for f in self.fields], dtype="float32")
+        keys = [k for k in (self.parts if keys is None else keys) if self.parts.get(k)]
+        if not keys or w.sum() <= 0:
+            return np.zeros(0, dtype="float32"), np.zeros(0, dtype="int64")
+        found = [self._part(k).search_rows(q, top_k, w, (boundary or {}).get(k)) for k in keys]
+        scores = np.concatenate([s for s, _ in found])
+        rows = np.concatenate([r for _, r in found])
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        return scores[order], rows[order]
+
+
+def _root(store) -> str:
+    return store.root if isinstance(store, PartitionedStore) else os.path.dirname(store.index_path)
+
+
+def field_index(store) -> Optional[FieldIndex]:
+    """스냅샷 store 객체에 캐시된 필드 인덱스 (없거나 차원이 다르면 None)"""
+    cached = getattr(store, "_field_index", None)
+    if cached is None:
+        fi = FieldIndex.load(os.path.join(_root(store), FIELDS_DIR))
+        cached = fi if fi is not None and fi.dim == store.dim else False
+        store._field_index = cached
+    return cached or None
+
+
+def search_fields(store, query_vec: np.ndarray, top_k: int, weights: Dict[str, float],
+                  today: Optional[int] = None) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    필드 가중 검색 → (scores, 전역 rows), 필드 인덱스가 없으면 None (호출 측에서 store.search_rows 사용)
+    - store.search_rows와 같은 기준: 활성 파티션만 검색, 경계 파티션은 만료 공모전 제외
+    """
+    fi = field_index(store)
+    if fi is None:
+        return None
+    today = today or today_int()
+    if isinstance(store, PartitionedStore):
+        keys = store.active(today)
+        boundary = {k: today for k in keys if store.manifest[k]["min_deadline"] < today}
+    else:
+        keys, boundary = None, {k: today for k in fi.parts}
+    return fi.search_rows(query_vec, top_k, weights, keys, boundary)
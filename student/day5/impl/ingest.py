@@ -4,10 +4,13 @@
 """
 
 import re, json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from pathlib import Path
 import pandas as pd 
 
+from student.common.dedup import content_hash
+from student.common.fragments import day5_fragments
+
 def read_text_file(path: str) -> str:
     """
     안전한 텍스트 로드(utf-8, errors='ignore')
@@ -93,9 +96,158 @@ def chunk_text(text: str, chunk_size: int = 1200, chunk_overlap: int = 200) -> L
     return chunks
 
 
+DOC_PATTERNS = ("*.csv",)  # 공모전 인덱스는 CSV 행만 사용
+
+OPEN_DEADLINE = 99991231   # 마감일 없음/상시 모집 → 만료되지 않는 것으로 취급
+_DATE_RE = re.compile(r"(\d{4})\s*[-./년]\s*(\d{1,2})\s*[-./월]\s*(\d{1,2})")
+
+
+# 참가 자격 / 전공 우대 → 비트마스크 (재랭킹에서 질의 마스크와 AND 한 번으로 비교)
+ELIGIBILITY_FLAGS: Dict[str, Tuple[str, ...]] = {
+    "고등학생": ("고등학생", "고교", "청소년"),
+    "대학생": ("대학생", "대학교", "학부"),
+    "대학원생": ("대학원",),
+    "일반인": ("일반인", "누구나", "제한없음", "제한 없음", "국민"),
+    "청년": ("청년",),
+    "창업자": ("예비창업", "창업자", "사업자", "스타트업"),
+    "군인": ("군인", "장병"),
+    "외국인": ("외국인", "유학생"),
+}
+MAJOR_FLAGS: Dict[str, Tuple[str, ...]] = {
+    "IT": ("컴퓨터", "소프트웨어", "정보", "인공지능", "데이터", "전산", "IT", "AI"),
+    "공학": ("공학", "공대", "전자", "전기", "기계", "건축"),
+    "경영": ("경영", "경제", "회계", "마케팅", "무역", "상경"),
+    "디자인": ("디자인", "미술", "시각", "영상"),
+    "인문사회": ("인문", "사회", "언어", "법학", "행정", "정치", "교육"),
+    "자연과학": ("자연", "수학", "통계", "물리", "생명", "화학"),
+    "의약": ("의학", "의료", "간호", "약학", "보건", "바이오"),
+}
+
+
+def keyword_mask(text: Any, table: Dict[str, Tuple[str, ...]]) -> int:
+    """text에 키워드가 등장하는 항목의 비트 OR (table 순서 = 비트 순서), 없으면 0"""
+    s = str(text or "")
+    mask = 0
+    for bit, words in enumerate(table.values()):
+        if any(w in s for w in words):
+            mask |= 1 << bit
+    return mask
+
+
+def parse_amount(value: Any) -> int:
+    """'2000', '1,000만원' → 2000 / 1000, 해석 불가 → -1"""
+    m = re.search(r"\d[\d,]*", str(value or ""))
+    return int(m.group().replace(",", "")) if m else -1
+
+
+def parse_team_size(value: Any) -> int:
+    """'5인', '1~3명' → 최대 인원(5 / 3), '개인' → 1, 해석 불가 → -1"""
+    s = str(value or "")
+    nums = [int(x) for x in re.findall(r"\d+", s)]
+    if nums:
+        return max(nums)
+    return 1 if "개인" in s else -1
+
+
+def parse_deadline(value: Any) -> int:
+    """
+    '마감일' 값 → YYYYMMDD 정수 (예: '2025-11-21', '2025.11.21', '2025년 11월 21일')
+    - 해석할 수 없으면 OPEN_DEADLINE
+    """
+    m = _DATE_RE.search(str(value or ""))
+    if not m:
+        return OPEN_DEADLINE
+    y, mo, d = (int(x) for x in m.groups())
+    if not (1 <= mo <= 12 and 1 <= d <= 31):
+        return OPEN_DEADLINE
+    return y * 10000 + mo * 100 + d
+
+
+def discover_files(paths_or_dir: List[str], patterns: Tuple[str, ...] = DOC_PATTERNS) -> List[str]:
+    """
+    입력 경로(디렉토리/파일) → 파일 경로 리스트
+    - 디렉토리는 patterns로 재귀 탐색, 파일은 그대로 포함
+    """
+    files: List[str] = []
+    for p in paths_or_dir:
+        pp = Path(p)
+        if pp.is_dir():
+            for ext in patterns:
+                files.extend([str(x) for x in pp.rglob(ext)])
+        else:
+            files.append(str(pp))
+    return files
+
+
+def read_csv_rows(fp: str) -> List[Dict[str, Any]]:
+    """
+    CSV 파일 → 행 단위 문서 [{"path":"<fp>::row_<idx>", "text":"<행 JSON>"}, ...] (정제 전)
+    """
+    try:
+        df = pd.read_csv(fp, encoding="utf-8")
+    except UnicodeDecodeError:
+        df = pd.read_csv(fp, encoding="cp949")
+
+    # 각 행(row)을 하나의 문서로 취급
+    return [{"path": f"{fp}::row_{idx}", "text": json.dumps(row.to_dict(), ensure_ascii=False)}
+            for idx, row in df.iterrows()]
+
+
+def extract_file(fp: str) -> List[Dict[str, Any]]:
+    """
+    파일 1개 → 원문 문서 리스트 (CSV만 행 단위로 분리, 그 외 확장자는 빈 리스트)
+    """
+    if fp.lower().endswith(".csv"):
+        return read_csv_rows(fp)
+    return []
+
+
+def record_to_items(d: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    CSV 행 문서 1개 → 코퍼스 아이템 리스트
+    - text 필드에는 '공모전명' + '상세 내용' + '전공 우대'를 포함하여 임베딩 품질 향상
+    """
+    try:
+        record = json.loads(d["text"]) if isinstance(d["text"], str) else d["text"]
+    except Exception:
+        record = {"공모전명": d["text"], "상세 내용": "", "전공 우대": ""}
+
+    # ✅ 임베딩 텍스트 구성: 공모전명 + 상세 내용 + 전공 우대
+    title = str(record.get("공모전명", "")).strip()
+    desc = str(record.get("상세 내용", "")).strip()
+    major = str(record.get("전공 우대", "")).strip()
+
+    # 결합 순서: 공모전명 → 상세내용 → 전공우대
+    text_parts = [p for p in [title, desc, f"(전공 우대: {major})" if major else ""] if p]
+    text_for_embedding = ". ".join(text_parts) if text_parts else f"(제목 없음) from {d['path']}"
+
+    # ✅ 청크 분할 (길 경우 여러 청크로)
+    items: List[Dict[str, Any]] = []
+    for i, ch in enumerate(chunk_text(text_for_embedding)):
+        cid = f"{d['path']}::chunk_{i:04d}"
+        items.append({
+            "id": cid,
+            "text": ch,  # ✅ 공모전명 + 상세내용 + 전공우대 포함
+            "meta": {
+                "path": d["path"],
+                "chunk": i,
+                "hash": content_hash(ch),
+                "deadline": parse_deadline(record.get("마감일")),  # YYYYMMDD (파티션/만료 판정용)
+                # 재랭킹용 정수 속성 (docs/ 에 int 컬럼으로 저장)
+                "prize": parse_amount(record.get("상금(단위: 만 원)")),
+                "team_max": parse_team_size(record.get("팀 규모")),
+                "elig": keyword_mask(record.get("참가 자격"), ELIGIBILITY_FLAGS),
+                "major": 0 if "무관" in str(record.get("전공 우대", "")) else keyword_mask(record.get("전공 우대"), MAJOR_FLAGS),
+                "fields": record,  # 원본 필드 전체 저장
+                **day5_fragments(record),  # render_* : 표/상세/초안 마크다운 조각 (질의 시 join만)
+            }
+        })
+    return items
+
+
 def load_documents(paths_or_dir: List[str]) -> List[Dict[str, Any]]:
     """
-    입력 경로(디렉토리/파일)에서 txt/md/pdf 수집 → [{"path":..., "text":...}, ...]
+    입력 경로(디렉토리/파일)에서 CSV 수집 → 행 단위 [{"path":..., "text":...}, ...]
     """
     # ----------------------------------------------------------------------------
     # TODO[DAY2-G-05] 구현 지침
@@ -115,76 +267,23 @@ def load_documents(paths_or_dir: List[str]) -> List[Dict[str, Any]]:
     #  - return docs
     # ----------------------------------------------------------------------------
     # 정답 구현:
-    files: List[str] = []
-    for p in paths_or_dir:
-        pp = Path(p)
-        if pp.is_dir():
-            for ext in ("*.txt", "*.md", "*.pdf", "*.csv"):  # ✅ CSV 확장자 추가
-                files.extend([str(x) for x in pp.rglob(ext)])
-        else:
-            files.append(str(pp))
-
     docs: List[Dict[str, Any]] = []
-    for fp in files:
-        ext = fp.lower().split(".")[-1]
-        if ext in ("txt", "md"):
-            raw = read_text_file(fp)
-        elif ext == "pdf":
-            raw = read_pdf_file(fp)
-        elif ext == "csv":
-            # ✅ CSV 파일은 한 줄(한 행)씩 분리해서 저장
-            try:
-                df = pd.read_csv(fp, encoding="utf-8")
-            except UnicodeDecodeError:
-                df = pd.read_csv(fp, encoding="cp949")
-
-            # 각 행(row)을 하나의 문서로 취급
-            for idx, row in df.iterrows():
-                record_text = clean_text(json.dumps(row.to_dict(), ensure_ascii=False))
-                docs.append({"path": f"{fp}::row_{idx}", "text": record_text})
-        else:
-            continue
+    for fp in discover_files(paths_or_dir):
+        for d in extract_file(fp):
+            docs.append({"path": d["path"], "text": clean_text(d["text"])})
     return docs
 
 
 def build_corpus(paths_or_dir: List[str]) -> List[Dict[str, Any]]:
     """
     CSV/JSON 문서에서 자연어 코퍼스 생성
-    반환: [{"id":..., "text":..., "meta":{"path":..., "chunk":..., "fields":...}}, ...]
+    반환: [{"id":..., "text":..., "meta":{"path":..., "chunk":..., "hash":..., "deadline":..., "fields":...}}, ...]
     - text 필드에는 '공모전명' + '상세 내용' + '전공 우대'를 포함하여 임베딩 품질 향상
     """
     docs = load_documents(paths_or_dir)
     corpus: List[Dict[str, Any]] = []
-
     for d in docs:
-        try:
-            record = json.loads(d["text"]) if isinstance(d["text"], str) else d["text"]
-        except Exception:
-            record = {"공모전명": d["text"], "상세 내용": "", "전공 우대": ""}
-
-        # ✅ 임베딩 텍스트 구성: 공모전명 + 상세 내용 + 전공 우대
-        title = str(record.get("공모전명", "")).strip()
-        desc = str(record.get("상세 내용", "")).strip()
-        major = str(record.get("전공 우대", "")).strip()
-
-        # 결합 순서: 공모전명 → 상세내용 → 전공우대
-        text_parts = [p for p in [title, desc, f"(전공 우대: {major})" if major else ""] if p]
-        text_for_embedding = ". ".join(text_parts) if text_parts else f"(제목 없음) from {d['path']}"
-
-        # ✅ 청크 분할 (길 경우 여러 청크로)
-        chunks = chunk_text(text_for_embedding)
-        for i, ch in enumerate(chunks):
-            cid = f"{d['path']}::chunk_{i:04d}"
-            corpus.append({
-                "id": cid,
-                "text": ch,  # ✅ 공모전명 + 상세내용 + 전공우대 포함
-                "meta": {
-                    "path": d["path"],
-                    "chunk": i,
-                    "fields": record  # 원본 필드 전체 저장
-                }
-            })
-
+        corpus.extend(record_to_items(d))
     return corpus
 
 def save_docs_jsonl(items: List[Dict[str, Any]], out_path: str):
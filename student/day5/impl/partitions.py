@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Day5 공모전 인덱스 마감일 파티션
+- 코퍼스를 마감월(YYYY-MM) 단위 파티션으로 나눠 각각 faiss.index + docs/ 로 저장
+- 질의는 마감일이 오늘 이후인 파티션만 검색하고, 경계 파티션(이번 달)은 행 단위로 만료분 제외
+- 이미 만료된 파티션은 발행(write_partitioned / prune_expired) 시점에 빠짐 → 재임베딩/전체 재빌드 없음
+- 카탈로그가 수년치로 쌓여도 질의 비용은 활성 파티션 크기만 따라감
+
+디렉토리 구성 (versions/<vid>/):
+  partitions.json                   # {"dim": D, "partitions": {"2025-11": {"count", "min_deadline", "max_deadline"}, ..., "open": {...}}}
+  partitions/<YYYY-MM>/faiss.index
+  partitions/<YYYY-MM>/docs/
+
+실행 예 (만료 파티션 정리 후 새 버전 발행):
+  python -m student.day5.impl.partitions --index_dir indices/day5
+"""
+
+from __future__ import annotations
+import os, json, shutil, argparse, datetime
+from typing import List, Dict, Any, Tuple, Optional, Callable
+
+import numpy as np
+
+from student.day2.impl import versions
+from student.day2.impl.store import FaissStore
+from student.day2.impl.pipeline import read_flat, SOURCES_NAME, EMBEDDING_NAME
+from student.day5.impl.ingest import OPEN_DEADLINE
+
+MANIFEST = "partitions.json"
+PARTS_DIR = "partitions"
+OPEN_PARTITION = "open"   # 마감일 없음/상시 모집
+
+
+def today_int(today: Optional[datetime.date] = None) -> int:
+    d = today or datetime.date.today()
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def partition_key(deadline: int) -> str:
+    if deadline >= OPEN_DEADLINE:
+        return OPEN_PARTITION
+    return f"{deadline // 10000:04d}-{deadline // 100 % 100:02d}"
+
+
+def _deadline(item: Dict[str, Any]) -> int:
+    return int((item.get("meta") or {}).get("deadline", OPEN_DEADLINE))
+
+
+def is_partitioned(index_dir: str) -> bool:
+    return os.path.isfile(os.path.join(index_dir, MANIFEST))
+
+
+def read_manifest(index_dir: str) -> Dict[str, Any]:
+    with open(os.path.join(index_dir, MANIFEST), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_manifest(index_dir: str, dim: int, parts: Dict[str, Dict[str, int]]) -> None:
+    with open(os.path.join(index_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump({"dim": int(dim), "partitions": parts}, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+# ---------- Build (BuildConfig.write_index / read_index) ----------
+def write_partitioned(corpus: List[Dict[str, Any]], vecs: np.ndarray, out_dir: str,
+                      today: Optional[int] = None) -> int:
+    """
+    코퍼스 → 마감월 파티션별 FaissStore 저장 → 저장된 벡터 수
+    - 마감일이 today 이전인 행은 발행 대상에서 제외
+    """
+    today = today or today_int()
+    groups: Dict[str, List[int]] = {}
+    for i, it in enumerate(corpus):
+        if _deadline(it) >= today:
+            groups.setdefault(partition_key(_deadline(it)), []).append(i)
+
+    manifest: Dict[str, Dict[str, int]] = {}
+    for key, idx in sorted(groups.items()):
+        part = os.path.join(out_dir, PARTS_DIR, key)
+        store = FaissStore(dim=vecs.shape[1],
+                           index_path=os.path.join(part, "faiss.index"),
+                           docs_path=os.path.join(part, "docs"))
+        store.add(vecs[idx], [corpus[i] for i in idx])
+        store.save()
+        deadlines = [_deadline(corpus[i]) for i in idx]
+        manifest[key] = {"count": len(idx), "min_deadline": min(deadlines), "max_deadline": max(deadlines)}
+    _write_manifest(out_dir, vecs.shape[1], manifest)
+
+    dropped = len(corpus) - sum(m["count"] for m in manifest.values())
+    if dropped:
+        print(f"  🗓 만료 공모전 {dropped}개 제외 (기준일 {today})")
+    return sum(m["count"] for m in manifest.values())
+
+
+def read_partitioned(index_dir: str) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+    """write_partitioned의 역: 모든 파티션의 (docs, vecs) 이어붙이기 — 레거시 단일 인덱스도 지원"""
+    if not is_partitioned(index_dir):
+        docs, vecs = read_flat(index_dir)
+        return list(docs), vecs
+    docs: List[Dict[str, Any]] = []
+    chunks: List[np.ndarray] = []
+    manifest = read_manifest(index_dir)
+    for key in sorted(manifest["partitions"]):
+        d, v = read_flat(os.path.join(index_dir, PARTS_DIR, key))
+        docs.extend(d)
+        chunks.append(v)
+    if not chunks:
+        return docs, np.zeros((0, manifest["dim"]), dtype="float32")
+    return docs, np.vstack(chunks)
+
+
+# ---------- Search ----------
+class PartitionedStore:
+    """
+    FaissStore와 같은 search() 인터페이스
+    - 파티션 FaissStore는 처음 필요할 때 로드, 만료 파티션은 로드하지 않음
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        manifest = read_manifest(root)
+        self.dim = int(manifest["dim"])
+        self.manifest: Dict[str, Dict[str, int]] = manifest["partitions"]
+        self._parts: Dict[str, FaissStore] = {}
+        # 전역 행 번호 = 파티션 시작 오프셋 + 파티션 내 행 번호 (키 정렬 순서)
+        self._keys = sorted(self.manifest)
+        counts = [self.manifest[k]["count"] for k in self._keys]
+        self._offsets = np.concatenate([[0], np.cumsum(counts)]).astype("int64")
+
+    def _part(self, key: str) -> FaissStore:
+        store = self._parts.get(key)
+        if store is None:
+            part = os.path.join(self.root, PARTS_DIR, key)
+            store = self._parts[key] = FaissStore.load(os.path.join(part, "faiss.index"),
+                                                       os.path.join(part, "docs"))
+        return store
+
+    def segments(self) -> List[Tuple[FaissStore, int]]:
+        """[(파티션 FaissStore, 전역 행 시작 오프셋)] — 전체 행 순회용"""
+        return [(self._part(k), int(self._offsets[j])) for j, k in enumerate(self._keys)]
+
+    def active(self, today: Optional[int] = None) -> List[str]:
+        today = today or today_int()
+        return [k for k, m in sorted(self.manifest.items()) if m["max_deadline"] >= today]
+
+    def __len__(self) -> int:
+        return sum(m["count"] for m in self.manifest.values())
+
+    def search_rows(self, query_vec: np.ndarray, top_k: int = 5,
+                    today: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """활성 파티션만 검색 → (scores, 전역 rows) 점수 내림차순"""
+        today = today or today_int()
+        all_scores: List[np.ndarray] = []
+        all_rows: List[np.ndarray] = []
+        for key in self.active(today):
+            store = self._part(key)
+            k = top_k
+            dl = None
+            if self.manifest[key]["min_deadline"] < today:  # 경계 파티션: 만료 행 수만큼 더 뽑아 top_k 보장
+                dl = np.asarray(store.docs.column("meta.deadline"))
+                k += int(np.count_nonzero(dl < today))
+            scores, rows = store.search_rows(query_vec, top_k=k)
+            if dl is not None:
+                live = dl[rows] >= today
+                scores, rows = scores[live], rows[live]
+            all_scores.append(scores)
+            all_rows.append(rows + self._offsets[self._keys.index(key)])
+        if not all_scores:
+            return np.zeros(0, dtype="float32"), np.zeros(0, dtype="int64")
+        scores, rows = np.concatenate(all_scores), np.concatenate(all_rows)
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        return scores[order], rows[order]
+
+    def _locate(self, rows: np.ndarray) -> np.ndarray:
+        """전역 rows → 파티션 번호 배열"""
+        return np.searchsorted(self._offsets, rows, side="right") - 1
+
+    def hit(self, row: int, score: float) -> Dict[str, Any]:
+        p = int(self._locate(np.asarray([row]))[0])
+        return self._part(self._keys[p]).hit(int(row - self._offsets[p]), score)
+
+    def search(self, query_vec: np.ndarray, top_k: int = 5, today: Optional[int] = None) -> List[Dict[str, Any]]:
+        scores, rows = self.search_rows(query_vec, top_k, today)
+        return [self.hit(r, s) for s, r in zip(scores, rows)]
+
+    def attributes(self, rows: np.ndarray, names: List[str]) -> Dict[str, np.ndarray]:
+        """전역 rows → meta 정수 컬럼 배열들 (파티션별로 모아 한 번씩 gather)"""
+        out = {n: np.full(len(rows), -1, dtype="int64") for n in names}
+        parts = self._locate(rows)
+        for p in np.unique(parts):
+            sel = parts == p
+            got = self._part(self._keys[p]).attributes(rows[sel] - self._offsets[p], names)
+            for n in names:
+                out[n][sel] = got[n]
+        return out
+
+
+def load_store(index_dir: str):
+    """versions.load_snapshot용 로더: 파티션 레이아웃이면 PartitionedStore, 아니면 FaissStore"""
+    if is_partitioned(index_dir):
+        return PartitionedStore(index_dir)
+    return versions.load_flat(index_dir)
+
+
+# ---------- Prune ----------
+def prune_expired(index_dir: str, today: Optional[int] = None,
+                  keep: int = versions.DEFAULT_KEEP,
+                  post_index: Optional[Callable[[str, Optional[str]], Dict[str, Any]]] = None) -> Optional[str]:
+    """
+    현재 버전에서 max_deadline < today 인 파티션을 뺀 새 버전을 발행 → 새 vid (정리할 게 없으면 None)
+    - 남는 파티션 파일은 하드링크(불가하면 복사)로 옮겨 재임베딩/재인덱싱 없음
+    - post_index: BuildConfig.post_index 와 같은 후처리 (이웃 테이블 갱신 등)
+    """
+    today = today or today_int()
+    cur = versions.current_dir(index_dir)
+    if cur is None or not is_partitioned(cur):
+        return None
+    head = read_manifest(cur)
+    manifest = head["partitions"]
+    expired = [k for k, m in manifest.items() if m["max_deadline"] < today]
+    if not expired:
+        return None
+
+    vid, out_dir = versions.new_version(index_dir)
+    try:
+        for key in manifest:
+            if key in expired:
+                continue
+            src = os.path.join(cur, PARTS_DIR, key)
+            dst = os.path.join(out_dir, PARTS_DIR, key)
+            try:
+                shutil.copytree(src, dst, copy_function=os.link)
+            except OSError:
+                shutil.rmtree(dst, ignore_errors=True)
+                shutil.copytree(src, dst)
+        _write_manifest(out_dir, head["dim"], {k: m for k, m in manifest.items() if k not in expired})
+        for name in (SOURCES_NAME, EMBEDDING_NAME):
+            if os.path.exists(os.path.join(cur, name)):
+                shutil.copy2(os.path.join(cur, name), os.path.join(out_dir, name))
+        if post_index:
+            post_index(out_dir, cur)
+        versions.publish(index_dir, vid)
+    except Exception:
+        shutil.rmtree(out_dir, ignore_errors=True)
+        raise
+    versions.gc_versions(index_dir, keep=keep)
+    n = sum(manifest[k]["count"] for k in expired)
+    print(f"🗓 만료 파티션 {len(expired)}개({n}건) 정리 → {index_dir}/CURRENT → {vid}")
+    return vid
+
+
+def _parse_day(s: str) -> int:
+    return today_int(datetime.date.fromisoformat(s))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--index_dir", default="indices/day5")
+    ap.add_argument("--today", type=_parse_day, default=None, help="기준일 YYYY-MM-DD (기본: 오늘)")
+    args = ap.parse_args()
+    from student.day5.impl.build_index import DAY5_CONFIG
+    if prune_expired(args.index_dir, today=args.today, post_index=DAY5_CONFIG.post_index) is None:
+        print("정리할 만료 파티션이 없습니다.")
@@ -7,18 +7,15 @@ import numpy as np
 from student.common.schemas import Day5Plan
 from .embeddings import Embeddings
 from .store import FaissStore
-
-def _idx_paths(index_dir: str):
-    return (
-        os.path.join(index_dir, "faiss.index"),
-        os.path.join(index_dir, "docs.jsonl"),
-    )
+from . import partitions
+from .rerank import search_reranked, search_rows
+from .similar import similar_contests
+from student.day2.impl import versions  # 버전 발행/스냅샷은 Day2 파이프라인과 공용
 
 def _load_store(plan: Day5Plan, emb: Embeddings) -> FaissStore:
-    index_path, docs_path = _idx_paths(plan.index_dir)
-    if not (os.path.exists(index_path) and os.path.exists(docs_path)):
-        raise FileNotFoundError(f"FAISS 인덱스가 없습니다. 먼저 ingest를 실행하세요: {plan.index_dir}")
-    store = FaissStore.load(index_path, docs_path)
+    # CURRENT가 가리키는 버전의 스냅샷 — 질의 도중 재빌드/발행이 일어나도 같은 버전을 끝까지 사용
+    # 마감월 파티션 레이아웃이면 활성(미마감) 파티션만 검색하는 PartitionedStore
+    store = versions.load_snapshot(plan.index_dir, loader=partitions.load_store)
     # 차원 체크
     test_dim = emb.encode(["__dim_check__"]).shape[1]
     if store.dim != test_dim:
@@ -28,7 +25,7 @@ def _load_store(plan: Day5Plan, emb: Embeddings) -> FaissStore:
 def _gate(contexts: List[Dict[str, Any]], plan: Day5Plan) -> Dict[str, Any]:
     if not contexts:
         return {"status":"insufficient","top_score":0.0,"mean_topk":0.0}
-    top_score = float(contexts[0]["score"])
+    top_score = max(float(c["score"]) for c in contexts)  # 재랭킹 시 1위가 코사인 최대가 아닐 수 있음
     mean_topk = float(np.mean([c["score"] for c in contexts[:plan.top_k]]))
     if top_score >= plan.min_score and mean_topk >= plan.min_mean_topk:
         return {"status":"enough","top_score":top_score,"mean_topk":mean_topk}
@@ -46,6 +43,10 @@ def _draft_answer(query: str, contexts: List[Dict[str, Any]], plan: Day5Plan) ->
     lines.append("📋 전체 공모전 목록:\n")
 
     for i, c in enumerate(contexts, 1):
+        cached = (c.get("meta") or {}).get("render_draft")
+        if cached:  # 인덱싱 때 만든 초안 블록 재사용
+            lines.append(f"{i}. {cached}\n")
+            continue
         # 메타 필드 가져오기
         f = (c.get("meta", {}).get("fields")) or {}
         if not f and isinstance(c.get("text"), str):
@@ -100,7 +101,11 @@ class Day5Agent:  # Day2Agent → Day5Agent
 
         store = _load_store(plan, emb)
         qv = emb.encode([query])[0]
-        contexts = store.search(qv, top_k=plan.top_k)
+        if plan.rerank:
+            contexts = search_reranked(store, query, qv, plan)  # 코사인 후보 → 속성 가중 재정렬
+        else:
+            scores, rows = search_rows(store, qv, plan.top_k, plan)  # 필드 가중 검색(있으면)
+            contexts = [store.hit(int(r), float(s)) for s, r in zip(scores, rows)]
 
         gate = _gate(contexts, plan)
         
@@ -121,4 +126,19 @@ class Day5Agent:  # Day2Agent → Day5Agent
         if plan.force_rag_only or (gate["status"] == "enough" and plan.return_draft_when_enough):
             payload["answer"] = _draft_answer(query, contexts, plan)
         
-        return payload
\ No newline at end of file
+        return payload
+
+    def similar(self, contest: str, top_k: int = 5, plan: Day5Plan = None) -> Dict[str, Any]:
+        """
+        공모전(doc id 또는 공모전명)과 비슷한 공모전 — 사전 계산 이웃 테이블 조회 (임베딩 호출 없음)
+        """
+        plan = plan or self.plan_defaults
+        store = versions.load_snapshot(plan.index_dir, loader=partitions.load_store)
+        contexts = similar_contests(store, contest, top_k=top_k)
+        return {
+            "type": "similar_contests",
+            "query": contest,
+            "plan": plan.__dict__,
+            "contexts": contexts,
+            "answer": _draft_answer(contest, contexts, plan) if contexts else "",
+        }
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Day5 구조화 재랭킹
+- 코사인 상위 후보(rerank_pool개)의 행 번호로 docs/ 정수 컬럼(마감일/상금/팀 규모/자격/전공)을 한 번에 gather
+- 속성 점수를 NumPy 벡터 연산 한 번으로 계산해 Day5Plan.rerank_weights 로 가중합 → 상위 top_k만 문서 dict로 변환
+- 후보 수가 늘어도 후보별 파이썬 루프나 추가 검색 없음
+"""
+
+from __future__ import annotations
+import re
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from student.common.schemas import Day5Plan
+from student.day5.impl.ingest import ELIGIBILITY_FLAGS, MAJOR_FLAGS, OPEN_DEADLINE, keyword_mask
+from student.day5.impl.partitions import today_int
+from student.day5.impl.fields import search_fields
+
+ATTRS = ["deadline", "prize", "team_max", "elig", "major"]
+
+
+def query_profile(query: str) -> Dict[str, int]:
+    """질의 → 비교용 정수 프로필 (없는 항목은 0 = 조건 없음)"""
+    m = re.search(r"(\d+)\s*(?:명|인)", query or "")
+    team = int(m.group(1)) if m else (1 if re.search(r"혼자|개인|1인", query or "") else 0)
+    return {
+        "team": team,
+        "elig": keyword_mask(query, ELIGIBILITY_FLAGS),
+        "major": keyword_mask(query, MAJOR_FLAGS),
+    }
+
+
+def _to_days(yyyymmdd: np.ndarray) -> np.ndarray:
+    """YYYYMMDD 정수 배열 → epoch 기준 일수 배열 (datetime64 연산, 루프 없음)"""
+    y, m, d = yyyymmdd // 10000, yyyymmdd // 100 % 100, yyyymmdd % 100
+    months = ((y - 1970) * 12 + (m - 1)).astype("datetime64[M]")
+    return (months.astype("datetime64[D]") - np.datetime64("1970-01-01", "D")).astype("int64") + (d - 1)
+
+
+def blend_scores(sim: np.ndarray, attrs: Dict[str, np.ndarray], profile: Dict[str, int],
+                 plan: Day5Plan, today: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    (N,) 코사인 + 속성 컬럼 → (N,) 혼합 점수, 항목별 점수
+    - 모든 항목 점수는 [0, 1] 범위, 해당 정보가 없으면 0(또는 중립 0.5)
+    """
+    w = plan.rerank_weights
+    today = today or today_int()
+
+    deadline = attrs["deadline"]
+    is_open = (deadline >= OPEN_DEADLINE) | (deadline < 0)  # 상시 모집 / 마감일 정보 없음(레거시)
+    days_left = np.where(is_open, plan.rerank_deadline_days,
+                         _to_days(np.where(is_open, today, deadline)) - _to_days(np.asarray([today]))[0])
+    s_deadline = np.clip(days_left / max(plan.rerank_deadline_days, 1), 0.0, 1.0)
+
+    prize = attrs["prize"].astype("float64")
+    top_prize = np.log1p(max(prize.max(initial=0.0), 1.0))
+    s_prize = np.where(prize > 0, np.log1p(np.maximum(prize, 0.0)) / top_prize, 0.0)
+
+    team = attrs["team_max"]
+    if profile["team"] > 0:
+        s_team = np.where(team < 0, 0.5, (team >= profile["team"]).astype("float64"))
+    else:
+        s_team = np.zeros(len(sim))
+
+    elig = attrs["elig"]
+    if profile["elig"]:
+        s_elig = np.where(elig == 0, 0.5, ((elig & profile["elig"]) != 0).astype("float64"))
+    else:
+        s_elig = np.zeros(len(sim))
+
+    major = attrs["major"]
+    if profile["major"]:
+        s_major = ((major == 0) | ((major & profile["major"]) != 0)).astype("float64")  # 0 = 전공무관
+    else:
+        s_major = np.zeros(len(sim))
+
+    parts = {"deadline": s_deadline, "prize": s_prize, "team": s_team, "eligibility": s_elig, "major": s_major}
+    total = w.get("similarity", 1.0) * sim.astype("float64")
+    for name, s in parts.items():
+        total = total + w.get(name, 0.0) * s
+    return total, parts
+
+
+def search_rows(store, query_vec: np.ndarray, top_k: int, plan: Day5Plan,
+                today: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """후보 검색: 필드 인덱스가 있으면 필드 가중 코사인(fields.py), 없으면 본 인덱스 코사인"""
+    if plan.field_search:
+        found = search_fields(store, query_vec, top_k, plan.field_weights, today)
+        if found is not None:
+            return found
+    return store.search_rows(query_vec, top_k=top_k)
+
+
+def search_reranked(store, query: str, query_vec: np.ndarray, plan: Day5Plan,
+                    today: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    store(FaissStore | PartitionedStore) 검색 + 구조화 재랭킹 → 상위 top_k 문서 dict
+    - 각 hit의 "score"는 검색 점수 그대로 유지(게이팅 기준), "rerank_score"에 혼합 점수
+    - 같은 공모전(meta.path)의 여러 청크는 혼합 점수가 가장 높은 하나만 남김
+    """
+    pool = max(plan.rerank_pool, plan.top_k)
+    sim, rows = search_rows(store, query_vec, pool, plan, today)
+    if len(rows) == 0:
+        return []
+    attrs = store.attributes(rows, ATTRS)
+    total, _ = blend_scores(sim, attrs, query_profile(query), plan, today)
+    order = np.argsort(-total, kind="stable")
+    out = []
+    seen = set()
+    for j in order:  # 혼합 점수 내림차순이라 공모전별 첫 hit = 최고 점수
+        h = store.hit(int(rows[j]), float(sim[j]))
+        path = (h.get("meta") or {}).get("path") or h["doc_id"]
+        if path in seen:
+            continue
+        seen.add(path)
+        h["rerank_score"] = round(float(total[j]), 6)
+        out.append(h)
+        if len(out) >= plan.top_k:
+            break
+    return out
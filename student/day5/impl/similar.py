@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Day5 "비슷한 공모전" 사전 계산 그래프
+- 빌드/발행 직전(BuildConfig.post_index) 모든 공모전의 top-K 이웃을 배치 self-search로 계산해 버전 dir에 저장
+- 이전 버전 테이블이 있으면 바뀐 공모전만 재계산(upsert)
+- 질의 시에는 임베딩 호출 없이 행 번호 → 이웃 행 번호 조회만 수행
+- 테이블은 청크 행 기준 → 질의 공모전의 모든 청크 이웃을 모아 자기 자신(같은 meta.path)을 빼고
+  공모전별 최고 점수 하나로 합침 (K는 청크/중복 공모전을 걸러도 top_k가 차도록 여유 있게)
+
+디렉토리 구성 (versions/<vid>/):
+  neighbors/ids.npy, neighbors/scores.npy, neighbors/keys.npy   # 전역 행 번호 기준 (PartitionedStore 순서)
+"""
+
+from __future__ import annotations
+import os
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from student.day2.impl.docstore import DocStore
+from student.day2.impl.neighbors import NeighborTable, row_keys, upsert_table
+from student.day5.impl.partitions import PartitionedStore, read_partitioned, today_int
+
+NEIGHBORS_DIR = "neighbors"
+SIMILAR_K = 30
+
+
+# ---------- Build (BuildConfig.post_index) ----------
+def build_similar(out_dir: str, prev_dir: Optional[str] = None) -> Dict[str, Any]:
+    """새 버전 dir의 전체 공모전 → neighbors/ 저장, 통계 반환"""
+    docs, vecs = read_partitioned(out_dir)
+    prev_root = os.path.join(prev_dir, NEIGHBORS_DIR) if prev_dir else ""
+    prev = NeighborTable.load(prev_root, mmap=False) if prev_root and NeighborTable.exists(prev_root) else None
+    table, stats = upsert_table(prev, vecs, row_keys(docs), k=SIMILAR_K)
+    table.save(os.path.join(out_dir, NEIGHBORS_DIR))
+    print(f"  🧭 유사 공모전 그래프: {stats['rows']}건 × K={SIMILAR_K} ({stats['mode']}, 재계산 {stats['recomputed']}건)")
+    return stats
+
+
+# ---------- Query ----------
+def _root(store) -> str:
+    return store.root if isinstance(store, PartitionedStore) else os.path.dirname(store.index_path)
+
+
+def _segments(store):
+    return store.segments() if isinstance(store, PartitionedStore) else [(store, 0)]
+
+
+def _lookup(store) -> Tuple[Dict[str, int], List[str], Dict[str, List[int]]]:
+    """
+    (doc id / 공모전명 → 전역 행 번호, 행별 공모전 키(meta.path), 공모전 키 → 청크 행 목록)
+    스냅샷 store 객체에 캐시
+    """
+    cached = getattr(store, "_similar_lookup", None)
+    if cached is not None:
+        return cached
+    lookup: Dict[str, int] = {}
+    paths: List[str] = []
+    rows: Dict[str, List[int]] = {}
+    for part, offset in _segments(store):
+        docs = part.docs
+        for i in range(len(docs)):
+            if isinstance(docs, DocStore):
+                did, path, fields = docs.get(i, "id"), docs.get(i, "meta.path"), docs.get(i, "meta.fields") or {}
+            else:
+                meta = docs[i].get("meta") or {}
+                did, path, fields = docs[i]["id"], meta.get("path"), meta.get("fields") or {}
+            path = str(path or did)
+            paths.append(path)
+            rows.setdefault(path, []).append(offset + i)
+            lookup[did] = offset + i
+            title = str(fields.get("공모전명", "")).strip()
+            if title:
+                lookup.setdefault(title, offset + i)
+    store._similar_lookup = cached = (lookup, paths, rows)
+    return cached
+
+
+def _table(store) -> Optional[NeighborTable]:
+    cached = getattr(store, "_similar_table", None)
+    if cached is None:
+        root = os.path.join(_root(store), NEIGHBORS_DIR)
+        cached = NeighborTable.load(root) if NeighborTable.exists(root) else False
+        store._similar_table = cached
+    return cached or None
+
+
+def similar_contests(store, contest: str, top_k: int = 5, today: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    공모전(doc id 또는 공모전명)과 비슷한 공모전 → hit dict 리스트 (score = 코사인)
+    - 임베딩/검색 호출 없음, 마감 지난 이웃은 제외
+    - 이웃 테이블이 없는 인덱스면 FileNotFoundError, 모르는 공모전이면 KeyError
+    """
+    table = _table(store)
+    if table is None:
+        raise FileNotFoundError(f"유사 공모전 테이블이 없습니다. 인덱스를 다시 빌드하세요: {_root(store)}")
+    lookup, paths, contest_rows = _lookup(store)
+    row = lookup.get(contest.strip())
+    if row is None:
+        raise KeyError(f"인덱스에 없는 공모전입니다: {contest}")
+    own = paths[row]
+    best: Dict[str, Tuple[float, int]] = {}   # 공모전 키 → (최고 점수, 그 청크 행)
+    for r in contest_rows[own]:
+        for i, s in zip(*table.row(r)):
+            key = paths[int(i)]
+            if key != own and (key not in best or s > best[key][0]):
+                best[key] = (float(s), int(i))
+    ranked = sorted(best.values(), key=lambda x: -x[0])
+    ids = np.asarray([i for _, i in ranked], dtype="int64")
+    scores = np.asarray([s for s, _ in ranked], dtype="float32")
+    if len(ids):
+        deadline = store.attributes(ids, ["deadline"])["deadline"]
+        live = (deadline < 0) | (deadline >= (today or today_int()))
+        ids, scores = ids[live], scores[live]
+    return [store.hit(int(i), float(s)) for i, s in zip(ids[:top_k], scores[:top_k])]
@@ -5,6 +5,10 @@ Day5 build_index 단독 테스트
 
 import os
 import sys
+import json
+import shutil
+import datetime
+import tempfile
 from pathlib import Path
 
 # 루트 경로 설정
@@ -33,9 +37,9 @@ print("=" * 60)
 
 # 1. 더미 데이터 생성
 print("\n[1/4] 더미 공모전 데이터 생성...")
-from student.day5.impl.build_index import build_corpus
+from student.day5.impl.ingest import build_corpus
 
-corpus = build_corpus()
+corpus = build_corpus([str(ROOT / "data" / "raw")])
 print(f"✅ 생성 완료: {len(corpus)}개 공모전")
 print(f"   예시: {corpus[0]['text'][:100]}...")
 
@@ -107,6 +111,150 @@ try:
 except Exception as e:
     print(f"❌ 로드 실패: {e}")
 
+# 7. 버전 인덱스 (임베딩 모델별 빌드 + 필드 벡터 + 유사 공모전)
+print("\n[버전 인덱스] 임베딩 모델별 빌드 + 유사 공모전...")
+import pandas as pd
+from student.day2.impl import versions
+from student.day2.impl.pipeline import read_embedding
+from student.day5.impl.build_index import build_index
+from student.day5.impl.fields import FIELDS_DIR
+from student.day5.impl.partitions import load_store
+from student.day5.impl.similar import similar_contests
+
+failed = False
+tmp = Path(tempfile.mkdtemp(prefix="day5_smoke_"))
+df = pd.read_csv(ROOT / "data" / "raw" / "test_data.csv")
+base = datetime.date.today()
+df["마감일"] = [(base + datetime.timedelta(days=30 * (i + 1))).isoformat() for i in range(len(df))]  # 만료 제외 방지
+df.loc[0, "상세 내용"] = " ".join([str(df.loc[0, "상세 내용"])] * 80)  # 여러 청크로 나뉘는 공모전
+csv_path = tmp / "contests.csv"
+df.to_csv(csv_path, index=False)
+
+for m in ("text-embedding-3-small", "text-embedding-3-large"):
+    idx = str(tmp / m)
+    try:
+        build_index([str(csv_path)], idx, model=m, batch_size=16)
+        cur = versions.current_dir(idx)
+        info = read_embedding(cur)
+        with open(os.path.join(cur, FIELDS_DIR, "manifest.json"), encoding="utf-8") as f:
+            fm = json.load(f)
+        st = versions.load_snapshot(idx, load_store)
+        if info.get("dim") == fm["dim"] == st.dim and info.get("model") == fm["model"]:
+            print(f"✅ {m}: dim={st.dim}, 필드 벡터 공모전 {fm['contests']}건")
+        else:
+            failed = True
+            print(f"❌ {m}: 모델/차원 불일치 (embedding={info}, fields={fm['model']}/{fm['dim']}, index={st.dim})")
+    except Exception as e:
+        failed = True
+        print(f"❌ {m} 빌드 실패: {e}")
+
+try:
+    st = versions.load_snapshot(str(tmp / "text-embedding-3-small"), load_store)
+    title = str(df.loc[0, "공모전명"]).strip()
+    hits = similar_contests(st, title, top_k=5)
+    names = [(h["meta"].get("fields") or {}).get("공모전명") for h in hits]
+    paths = [h["meta"]["path"] for h in hits]
+    if title in names or len(set(paths)) != len(paths) or len(hits) != min(5, len(df) - 1):
+        failed = True
+        print(f"❌ 유사 공모전: 자기 자신/중복 포함 또는 개수 부족 → {names}")
+    else:
+        print(f"✅ 유사 공모전 {len(hits)}건 (자기 자신/중복 없음)")
+        for i, (h, n) in enumerate(zip(hits, names), 1):
+            print(f"   {i}. [{h['score']:.3f}] {n}")
+except Exception as e:
+    failed = True
+    print(f"❌ 유사 공모전 실패: {e}")
+finally:
+    shutil.rmtree(tmp, ignore_errors=True)
+
+# 8. 마감일 파티션 (만료 경계 + 만료 파티션 정리)
+print("\n[파티션] 마감일 경계 + 만료 파티션 정리...")
+import numpy as np
+from student.day5.impl.ingest import OPEN_DEADLINE
+from student.day5.impl.partitions import (PartitionedStore, write_partitioned, prune_expired,
+                                          read_manifest)
+
+tmp = Path(tempfile.mkdtemp(prefix="day5_parts_"))
+try:
+    idx = str(tmp / "idx")
+    T = 20261015
+    deadlines = [20261001, 20261015, 20261020, 20261110, OPEN_DEADLINE] * 2
+    rng = np.random.default_rng(0)
+    pv = rng.standard_normal((len(deadlines), 8)).astype("float32")
+    pv /= np.linalg.norm(pv, axis=1, keepdims=True)
+    pcorpus = [{"id": f"c{i}", "text": f"공모전 {i}", "meta": {"path": f"p.csv::row_{i}", "deadline": dl}}
+               for i, dl in enumerate(deadlines)]
+    vid, d = versions.new_version(idx)
+    write_partitioned(pcorpus, pv, d, today=T)
+    versions.publish(idx, vid)
+
+    def live(store, today):
+        _, rows = store.search_rows(pv[0], top_k=len(pcorpus), today=today)
+        return sorted(store.attributes(rows, ["deadline"])["deadline"].tolist())
+
+    problems = []
+    st = PartitionedStore(versions.current_dir(idx))
+    if sorted(st.manifest) != ["2026-10", "2026-11", "open"] or len(st) != 8:
+        problems.append(f"빌드 시 만료 제외 실패 {st.manifest}")
+    if live(st, T) != sorted([20261015, 20261020, 20261110, OPEN_DEADLINE] * 2):
+        problems.append("마감 당일 공모전 누락")
+    if live(st, 20261018) != sorted([20261020, 20261110, OPEN_DEADLINE] * 2):
+        problems.append("경계 파티션의 만료 행 노출")
+    if st.active(20261101) != ["2026-11", "open"] or len(live(st, 20261101)) != 4:
+        problems.append(f"만료 파티션 검색 {st.active(20261101)}")
+    if prune_expired(idx, today=20261101) is None:
+        problems.append("만료 파티션 정리 안 됨")
+    elif sorted(read_manifest(versions.current_dir(idx))["partitions"]) != ["2026-11", "open"]:
+        problems.append("정리 후 매니페스트")
+    if prune_expired(idx, today=20261101) is not None:
+        problems.append("정리할 게 없는데 새 버전 발행")
+    if problems:
+        failed = True
+        print("❌ 파티션:", ", ".join(problems))
+    else:
+        print(f"✅ 파티션: 활성 {len(st)}건, 경계일 만료 행 제외, 만료 파티션 정리")
+except Exception as e:
+    failed = True
+    print(f"❌ 파티션 점검 실패: {type(e).__name__}: {e}")
+finally:
+    shutil.rmtree(tmp, ignore_errors=True)
+
+# 9. 이웃 테이블 upsert (전체 재계산과 같은 결과)
+print("\n[이웃 테이블] upsert vs 전체 재계산...")
+from student.day2.impl.neighbors import build_table, upsert_table
+
+try:
+    rng = np.random.default_rng(1)
+    nv = rng.standard_normal((60, 16)).astype("float32")
+    nv /= np.linalg.norm(nv, axis=1, keepdims=True)
+    nkeys = [f"r{i}#h{i}" for i in range(60)]
+    prev = build_table(nv, nkeys, k=5)
+
+    keep = [i for i in range(60) if i not in (3, 7)]             # 2행 삭제
+    extra = rng.standard_normal((3, 16)).astype("float32")        # 3행 추가
+    extra /= np.linalg.norm(extra, axis=1, keepdims=True)
+    nv2 = np.vstack([nv[keep], extra])
+    nkeys2 = [nkeys[i] for i in keep] + [f"new{j}#x{j}" for j in range(3)]
+    nv2[10] = extra[0] * 0.6 + nv2[10] * 0.4                      # 1행 텍스트 변경(키 변경)
+    nv2[10] /= np.linalg.norm(nv2[10])
+    nkeys2[10] = "changed#h"
+
+    table, stats = upsert_table(prev, nv2, nkeys2, k=5)
+    full = build_table(nv2, nkeys2, k=5)
+    same = all(set(table.row(i)[0].tolist()) == set(full.row(i)[0].tolist()) for i in range(len(nv2)))
+    if not same or stats["mode"] != "upsert" or stats["recomputed"] >= len(nv2) or list(table.keys) != nkeys2:
+        failed = True
+        print(f"❌ upsert_table: 전체 재계산과 다름 또는 재계산 과다 ({stats})")
+    else:
+        print(f"✅ upsert_table: {stats['rows']}행 중 {stats['recomputed']}행만 재검색, 전체 재계산과 같은 이웃")
+except Exception as e:
+    failed = True
+    print(f"❌ upsert_table 점검 실패: {type(e).__name__}: {e}")
+
 print("\n" + "=" * 60)
+if failed:
+    print("[FAIL] build_index 테스트 실패 ❌")
+    print("=" * 60)
+    sys.exit(1)
 print("[DONE] build_index 테스트 완료 ✅")
 print("=" * 60)
\ No newline at end of file
@@ -4,10 +4,12 @@
 """
 
 import re, json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from pathlib import Path
 import pandas as pd 
 
+from student.common.dedup import content_hash
+
 def read_text_file(path: str) -> str:
     """
     안전한 텍스트 로드(utf-8, errors='ignore')
@@ -150,7 +152,8 @@ def load_documents(paths_or_dir: List[str]) -> List[Dict[str, Any]]:
 def build_corpus(paths_or_dir: List[str]) -> List[Dict[str, Any]]:
     """
     문서를 청크 단위로 나눠 코퍼스 생성
-    반환 예: [{"id":"<path>::chunk_0000","text":"...", "meta":{"path":..., "chunk":0}}, ...]
+    반환 예: [{"id":"<path>::chunk_0000","text":"...", "meta":{"path":..., "chunk":0, "hash":"<sha1>"}}, ...]
+    - meta.hash: content_hash(청크) — build_index에서 동일 텍스트 임베딩을 한 번만 수행
     """
     # ----------------------------------------------------------------------------
     # TODO[DAY2-G-06] 구현 지침
@@ -170,7 +173,7 @@ def build_corpus(paths_or_dir: List[str]) -> List[Dict[str, Any]]:
         chunks = chunk_text(d["text"]) # 이 부분에서 csv 파일의 한 행씩 읽어올 수 있도록 수정
         for i, ch in enumerate(chunks):
             cid = f"{d['path']}::chunk_{i:04d}"
-            corpus.append({"id": cid, "text": ch, "meta": {"path": d["path"], "chunk": i}})
+            corpus.append({"id": cid, "text": ch, "meta": {"path": d["path"], "chunk": i, "hash": content_hash(ch)}})
     return corpus
 
 